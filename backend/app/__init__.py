@@ -1,15 +1,25 @@
-from flask import Flask, Blueprint
+from flask import Flask, Blueprint, jsonify
 from dotenv import load_dotenv
 import os
 from app.routes.cv_routes import cv_bp
 from app.routes.skills_routes import skills_bp
+from app.routes.metrics_routes import metrics_bp
+from app.routes.health_routes import health_bp
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
+from app.utils.upload import SpooledUploadRequest
+from app.utils.token_cache import start_cert_refresher
+from app.utils import metrics
 
 def create_app():
 
     load_dotenv()
+    start_cert_refresher()
 
     app = Flask(__name__)
+    app.request_class = SpooledUploadRequest
+    # Largest request body accepted, in bytes; larger uploads get a 413 before they are read.
+    app.config["MAX_CONTENT_LENGTH"] = int(os.getenv("FLASK_MAX_CONTENT_LENGTH", str(10 * 1024 * 1024)))
 
     CORS(app, resources={r"/api/*": {"origins": [
          "http://localhost:5173",
@@ -20,6 +30,13 @@ def create_app():
     main_bp = Blueprint('main', __name__, url_prefix='/api')
     main_bp.register_blueprint(cv_bp)
     main_bp.register_blueprint(skills_bp)
+    main_bp.register_blueprint(metrics_bp)
+    main_bp.register_blueprint(health_bp)
     app.register_blueprint(main_bp)
+    metrics.init_app(app)
+
+    @app.errorhandler(RequestEntityTooLarge)
+    def request_too_large(error):
+        return jsonify({"error": "Upload too large.", "max_bytes": app.config["MAX_CONTENT_LENGTH"]}), 413
 
     return app
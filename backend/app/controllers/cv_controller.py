@@ -1,15 +1,28 @@
-from flask import request, jsonify, session, redirect, url_for, Response
-from app.services.cv_service import extract_text_from_pdf, extract_skills, calculate_cv_score, extract_experience, calculate_experience_years, generate_cv_report
+from flask import request, jsonify, session, redirect, url_for, Response, g
+from app.services.cv_service import extract_text_from_pdf, extract_skills, calculate_cv_score, extract_experience, calculate_experience_years, generate_cv_report, get_cv_report_status, score_cv_upload, score_cv_batch, rerank_cvs
+from app.services.storage_service import download_from_google_storage
+from app.services.pdf_service import PDFParseTimeout, is_pdf, count_pdf_pages
+from app.services.firestore_service import refresh_skill_catalog_async, is_firm_account, get_job_applications
+from functools import partial
 import json
+import re
+import uuid
+import os
 from app.utils.auth_decorator import firebase_auth_required
 
-@firebase_auth_required
-def upload_cv():
+BATCH_MAX_CVS = int(os.getenv("FLASK_BATCH_MAX_CVS", "1000"))
+# Batches carry many CVs, so they get their own request body limit (bytes).
+BATCH_MAX_CONTENT_LENGTH = int(os.getenv("FLASK_BATCH_MAX_CONTENT_LENGTH", str(200 * 1024 * 1024)))
+RERANK_MAX_CVS = int(os.getenv("FLASK_RERANK_MAX_CVS", "20000"))
+# Uploads with more pages than this are rejected before any text is extracted.
+CV_MAX_PAGES = int(os.getenv("FLASK_CV_MAX_PAGES", "20"))
+# CV ids are the SHA-256 of the PDF, as returned by upload_cv and batch_score_cv.
+CV_ID_PATTERN = re.compile(r"[0-9a-f]{64}")
+# Stored CVs are named "{folder}/{owner_id}_{timestamp}.pdf". The owner is the
+# user who uploaded the CV, or the job application it was sent with.
+CV_BLOB_PATTERN = re.compile(r"(?:[^/]+/)*(?P<owner_id>[^/]+)_\d+\.pdf")
 
-    file = request.files['file']
-    job_requirements = request.form.get('job_requirements')
-    job_required_experience = request.form.get('job_required_experience')
-    job_title = request.form.get('job_title')
+def parse_job_requirements(job_requirements):
 
     job_requirements = json.loads(job_requirements) if job_requirements else {
         "programming_languages": [],
@@ -18,15 +31,158 @@ def upload_cv():
         "tools": [],
     }
 
-    job_requirements = {
+    return normalize_job_requirements(job_requirements)
+
+def normalize_job_requirements(job_requirements):
+    return {
         key: [item.lower() for item in value]
         for key, value in job_requirements.items()
     }
 
-    if file.filename.endswith('.pdf'):
-        text = extract_text_from_pdf(file)
-    else:
+@firebase_auth_required(prefetch=refresh_skill_catalog_async)
+def upload_cv():
+
+    file = request.files.get('file')
+    if file is None:
+        return jsonify({"error": "No file provided."}), 400
+
+    if not file.filename.endswith('.pdf') or not is_pdf(file.stream.read(1024)):
         return jsonify({"error": "Invalid file format. Only PDF files are allowed."}), 400
 
-    score, message, report_url = calculate_cv_score(text, job_requirements, job_required_experience, job_title)
-    return jsonify({"score": score, "message": message, "cv_report_url": report_url}), 200
+    job_requirements = parse_job_requirements(request.form.get('job_requirements'))
+    job_required_experience = request.form.get('job_required_experience')
+    job_title = request.form.get('job_title')
+
+    # The upload is spooled by Werkzeug; it is read from there instead of being copied into memory.
+    file.stream.seek(0)
+    try:
+        page_count = count_pdf_pages(file.stream)
+    except ValueError:
+        return jsonify({"error": "The PDF file could not be read."}), 400
+    if page_count > CV_MAX_PAGES:
+        return jsonify({"error": f"CVs can have at most {CV_MAX_PAGES} pages."}), 413
+
+    file.stream.seek(0)
+    try:
+        result = score_cv_upload(file.stream, job_requirements, job_required_experience, job_title)
+    except PDFParseTimeout:
+        return jsonify({"error": "The CV took too long to process."}), 422
+    return jsonify(result), 200
+
+@firebase_auth_required
+def get_cv_report(report_job_id):
+
+    try:
+        uuid.UUID(report_job_id)
+    except ValueError:
+        return jsonify({"error": "Invalid report id."}), 400
+
+    job = get_cv_report_status(report_job_id)
+    if job is None:
+        return jsonify({"error": "Report not found."}), 404
+
+    return jsonify({"report_job_id": report_job_id, **job}), 200
+
+
+def readable_cv_blobs(uid, blob_names):
+    """
+    Whether the firm `uid` may read every stored CV in `blob_names`: CVs it
+    uploaded itself, and CVs sent with applications to its job postings.
+    """
+    owners = {}
+    for blob_name in blob_names:
+        match = CV_BLOB_PATTERN.fullmatch(blob_name)
+        if match is None:
+            return False
+        owners[blob_name] = match.group("owner_id")
+
+    application_ids = {owner_id for owner_id in owners.values() if owner_id != uid}
+    applications = get_job_applications(application_ids) if application_ids else {}
+    return all(
+        owner_id == uid or applications.get(owner_id, {}).get("firm_id") == uid
+        for owner_id in owners.values()
+    )
+
+@firebase_auth_required(prefetch=refresh_skill_catalog_async)
+def batch_score_cv():
+
+    uid = g.firebase_user.get("uid")
+    if not uid or not is_firm_account(uid):
+        return jsonify({"error": "Only firm accounts can score CVs in batches."}), 403
+
+    request.max_content_length = BATCH_MAX_CONTENT_LENGTH
+    files = request.files.getlist('files')
+    try:
+        gcs_paths = json.loads(request.form.get('gcs_paths') or "[]")
+    except ValueError:
+        gcs_paths = None
+    job_required_experience = request.form.get('job_required_experience')
+
+    if not isinstance(gcs_paths, list) or not all(isinstance(path, str) for path in gcs_paths):
+        return jsonify({"error": "'gcs_paths' must be a JSON array of strings."}), 400
+
+    try:
+        job_requirements = parse_job_requirements(request.form.get('job_requirements'))
+    except (ValueError, AttributeError, TypeError):
+        return jsonify({"error": "'job_requirements' must map categories to arrays of skills."}), 400
+
+    if not files and not gcs_paths:
+        return jsonify({"error": "No CVs provided."}), 400
+
+    if len(files) + len(gcs_paths) > BATCH_MAX_CVS:
+        return jsonify({"error": f"At most {BATCH_MAX_CVS} CVs can be scored per request."}), 400
+
+    if any(not file.filename.endswith('.pdf') for file in files):
+        return jsonify({"error": "Invalid file format. Only PDF files are allowed."}), 400
+
+    bucket_name = os.getenv("FLASK_FIREBASE_STORAGE_BUCKET")
+    blob_names = []
+    for path in gcs_paths:
+        blob_name = path.removeprefix(f"gs://{bucket_name}/")
+        if blob_name.startswith("gs://"):
+            return jsonify({"error": f"CVs must be stored in the '{bucket_name}' bucket."}), 400
+        blob_names.append(blob_name)
+
+    if not readable_cv_blobs(uid, blob_names):
+        return jsonify({"error": "Only CVs you uploaded or that were sent to your job postings can be scored."}), 403
+
+    cv_sources = [(file.filename, file.read) for file in files]
+    for path, blob_name in zip(gcs_paths, blob_names):
+        cv_sources.append((path, partial(download_from_google_storage, bucket_name, blob_name)))
+
+    results, errors = score_cv_batch(cv_sources, job_requirements, job_required_experience)
+    return jsonify({"results": results, "errors": errors}), 200
+
+@firebase_auth_required(prefetch=refresh_skill_catalog_async)
+def rerank_cv_scores():
+
+    uid = g.firebase_user.get("uid")
+    if not uid or not is_firm_account(uid):
+        return jsonify({"error": "Only firm accounts can rank CVs."}), 403
+
+    body = request.get_json(silent=True) or {}
+    cv_ids = body.get('cv_ids')
+    job_requirements = body.get('job_requirements') or {}
+
+    if not isinstance(cv_ids, list) or not all(isinstance(cv_id, str) for cv_id in cv_ids):
+        return jsonify({"error": "'cv_ids' must be an array of strings."}), 400
+
+    if not all(CV_ID_PATTERN.fullmatch(cv_id) for cv_id in cv_ids):
+        return jsonify({"error": "'cv_ids' must contain CV ids returned by upload_cv or batch_score_cv."}), 400
+
+    if len(cv_ids) > RERANK_MAX_CVS:
+        return jsonify({"error": f"At most {RERANK_MAX_CVS} CVs can be ranked per request."}), 400
+
+    if not isinstance(job_requirements, dict) or not all(
+        isinstance(skills, list) and all(isinstance(skill, str) for skill in skills)
+        for skills in job_requirements.values()
+    ):
+        return jsonify({"error": "'job_requirements' must map categories to arrays of skills."}), 400
+
+    limit = body.get('limit')
+    if limit is not None and (not isinstance(limit, int) or limit < 1):
+        return jsonify({"error": "'limit' must be a positive integer."}), 400
+
+    job_requirements = normalize_job_requirements(job_requirements)
+    results, missing = rerank_cvs(cv_ids, job_requirements, body.get('job_required_experience'), limit)
+    return jsonify({"results": results, "missing": missing}), 200
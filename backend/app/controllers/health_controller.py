@@ -0,0 +1,9 @@
+from flask import jsonify
+from app.services.warmup_service import warm_up
+
+def ready():
+
+    is_ready, steps_ms, errors = warm_up()
+    if not is_ready:
+        return jsonify({"status": "warming_up", "steps_ms": steps_ms, "errors": errors}), 503
+    return jsonify({"status": "ready", "steps_ms": steps_ms}), 200
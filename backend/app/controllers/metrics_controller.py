@@ -0,0 +1,31 @@
+from flask import request, jsonify, Response
+import os
+from app.services.cache_service import cv_result_cache
+from app.services.ranking_service import candidate_store
+from app.services.report_service import get_report_queue_stats
+from app.utils.metrics import process_stats, render_metrics, set_enabled, settings_are_shared
+from app.utils.token_cache import token_cache
+
+def get_metrics():
+
+    stats_sources = {
+        "report_queue": get_report_queue_stats(),
+        "cv_result_cache": cv_result_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "candidate_store": {"size": len(candidate_store), "max_size": candidate_store.max_size},
+        "process": process_stats(),
+    }
+    return Response(render_metrics(stats_sources), mimetype="text/plain; version=0.0.4")
+
+def update_metrics_settings():
+
+    body = request.get_json(silent=True) or {}
+    enabled = body.get("enabled")
+    server_timing = body.get("server_timing")
+
+    if any(value is not None and not isinstance(value, bool) for value in (enabled, server_timing)):
+        return jsonify({"error": "'enabled' and 'server_timing' must be booleans."}), 400
+
+    # "scope" tells whether every worker follows the change or only this one.
+    settings = set_enabled(enabled, server_timing)
+    return jsonify({**settings, "pid": os.getpid(), "scope": "all_workers" if settings_are_shared() else "worker"}), 200
@@ -14,6 +14,20 @@ def validate_skills_structure(skills):
             return False, "Each skill must have 'name' and 'category' keys."
         if not isinstance(skill["name"], str) or not isinstance(skill["category"], str):
             return False, "'name' and 'category' must be strings."
+        aliases = skill.get("aliases", [])
+        if not isinstance(aliases, list) or not all(isinstance(alias, str) and alias.strip() for alias in aliases):
+            return False, "'aliases' must be an array of non-empty strings."
+
+    names = {skill["name"].lower() for skill in skills}
+    alias_owners = {}
+    for skill in skills:
+        for alias in skill.get("aliases", []):
+            alias = alias.lower()
+            if alias in names:
+                return False, f"Alias '{alias}' is also the name of a skill."
+            owner = alias_owners.setdefault(alias, skill["name"].lower())
+            if owner != skill["name"].lower():
+                return False, f"Alias '{alias}' is used by both '{owner}' and '{skill['name'].lower()}'."
 
     return True, None
 
@@ -32,17 +46,15 @@ def upload_skills_endpoint():
 
     try:
         file_content = file.read().decode("utf-8")
-
-        print(file_content)
         skills = json.loads(file_content)
 
         is_valid, error_message = validate_skills_structure(skills)
         if not is_valid:
             return jsonify({"error": error_message}), 400
 
-        upload_skills(file_content)
+        summary = upload_skills(file_content)
 
-        return jsonify({"message": "Skills uploaded successfully"}), 201
+        return jsonify({"message": "Skills uploaded successfully", **summary}), 201
     except json.JSONDecodeError:
         return jsonify({"error": "Invalid JSON file"}), 400
     except Exception as e:
@@ -1,14 +1,73 @@
 import firebase_admin
-from firebase_admin import firestore
+import threading
 import os
 
+_app_lock = threading.Lock()
+
+def get_firebase_app():
+    """
+    The default Firebase app, initialised on first use with the application
+    default credentials.
+    """
+    with _app_lock:
+        if not firebase_admin._apps:
+            firebase_admin.initialize_app()
+        return firebase_admin.get_app()
+
+def reset_firebase_app():
+    """
+    Delete the default Firebase app, and with it the auth client and its HTTP
+    session, so a forked worker initialises its own on first use.
+    """
+    with _app_lock:
+        if firebase_admin._apps:
+            firebase_admin.delete_app(firebase_admin.get_app())
+
 class FirestoreClient:
     _db_client = None
 
     @staticmethod
     def get_instance():
         if FirestoreClient._db_client is None:
-            if not firebase_admin._apps:
-                firebase_admin.initialize_app()
-            FirestoreClient._db_client = firestore.client()
-        return FirestoreClient._db_client
\ No newline at end of file
+            from firebase_admin import firestore
+            FirestoreClient._db_client = firestore.client(get_firebase_app())
+        return FirestoreClient._db_client
+
+    @staticmethod
+    def reset():
+        """
+        Drop the client so the next get_instance creates a new one. gRPC
+        channels do not survive fork, so forked workers must call this.
+        """
+        client, FirestoreClient._db_client = FirestoreClient._db_client, None
+        if client is not None:
+            try:
+                client.close()
+            except Exception as e:
+                print(f"Error closing Firestore client: {e}")
+
+
+class AsyncFirestoreClient:
+    _db_client = None
+
+    @staticmethod
+    def get_instance():
+        """
+        The async Firestore client. Its gRPC channel is bound to the event loop
+        it is first used on, so it must only be used on the I/O loop.
+        """
+        if AsyncFirestoreClient._db_client is None:
+            # Built directly: firestore_async.client caches one client per app,
+            # and a client bound to a stopped loop must not be handed out again.
+            from google.cloud import firestore
+            app = get_firebase_app()
+            if not app.project_id:
+                raise ValueError("Project ID is required to access Firestore.")
+            AsyncFirestoreClient._db_client = firestore.AsyncClient(
+                credentials=app.credential.get_credential(), project=app.project_id
+            )
+        return AsyncFirestoreClient._db_client
+
+    @staticmethod
+    def reset():
+        AsyncFirestoreClient._db_client = None
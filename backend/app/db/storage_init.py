@@ -0,0 +1,42 @@
+from requests.adapters import HTTPAdapter
+import threading
+import os
+
+GCS_POOL_SIZE = int(os.getenv("FLASK_GCS_POOL_SIZE", "16"))
+
+class StorageClient:
+    _client = None
+    _buckets = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_instance():
+        if StorageClient._client is None:
+            with StorageClient._lock:
+                if StorageClient._client is None:
+                    from google.cloud import storage
+                    client = storage.Client()
+                    adapter = HTTPAdapter(pool_connections=GCS_POOL_SIZE, pool_maxsize=GCS_POOL_SIZE)
+                    client._http.mount("https://", adapter)
+                    client._http.mount("http://", adapter)
+                    StorageClient._client = client
+        return StorageClient._client
+
+    @staticmethod
+    def get_bucket(bucket_name):
+        """
+        Return a bucket handle, checking that the bucket exists only the first time.
+        """
+        bucket = StorageClient._buckets.get(bucket_name)
+        if bucket is None:
+            bucket = StorageClient.get_instance().lookup_bucket(bucket_name)
+            if bucket is None:
+                raise ValueError(f"Bucket '{bucket_name}' does not exist.")
+            StorageClient._buckets[bucket_name] = bucket
+        return bucket
+
+    @staticmethod
+    def reset():
+        with StorageClient._lock:
+            StorageClient._client = None
+            StorageClient._buckets = {}
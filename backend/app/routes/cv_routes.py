@@ -1,6 +1,9 @@
 from flask import Blueprint, redirect, url_for
-from app.controllers.cv_controller import upload_cv
+from app.controllers.cv_controller import upload_cv, get_cv_report, batch_score_cv, rerank_cv_scores
 
 cv_bp = Blueprint('cv', __name__)
 
-cv_bp.route("/upload_cv", methods=["POST", "OPTIONS"])(upload_cv)
\ No newline at end of file
+cv_bp.route("/upload_cv", methods=["POST", "OPTIONS"])(upload_cv)
+cv_bp.route("/cv_report/<report_job_id>", methods=["GET", "OPTIONS"])(get_cv_report)
+cv_bp.route("/batch_score_cv", methods=["POST", "OPTIONS"])(batch_score_cv)
+cv_bp.route("/rerank_cvs", methods=["POST", "OPTIONS"])(rerank_cv_scores)
\ No newline at end of file
@@ -0,0 +1,5 @@
+from flask import Blueprint
+from app.controllers.health_controller import ready
+
+health_bp = Blueprint("health", __name__)
+health_bp.route("/ready", methods=["GET"])(ready)
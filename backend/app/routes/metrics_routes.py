@@ -0,0 +1,7 @@
+from flask import Blueprint
+from app.controllers.metrics_controller import get_metrics, update_metrics_settings
+from app.utils.auth_decorator import authenticate
+
+metrics_bp = Blueprint("metrics", __name__)
+metrics_bp.route("/metrics", methods=["GET"])(authenticate(get_metrics))
+metrics_bp.route("/metrics", methods=["POST"])(authenticate(update_metrics_settings))
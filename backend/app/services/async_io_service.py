@@ -0,0 +1,91 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+# Threads for blocking calls awaited on the I/O loop (GCS uploads, token verification).
+IO_THREADS = int(os.getenv("FLASK_IO_THREADS", "8"))
+# Seconds a request thread waits for I/O it handed to the loop.
+IO_TIMEOUT = float(os.getenv("FLASK_IO_TIMEOUT", "60"))
+
+_loop = None
+_thread = None
+_loop_lock = threading.Lock()
+_reset_callbacks = []
+
+def on_loop_reset(callback):
+    """
+    Call `callback()` whenever the I/O loop is stopped or replaced, so clients
+    bound to the old loop are dropped.
+    """
+    _reset_callbacks.append(callback)
+
+def _run_reset_callbacks():
+    for callback in _reset_callbacks:
+        try:
+            callback()
+        except Exception as e:
+            print(f"Error resetting a client of the I/O loop: {e}")
+
+def _run_loop(loop):
+    asyncio.set_event_loop(loop)
+    loop.run_forever()
+
+def get_io_loop():
+    """
+    The event loop all async I/O runs on, started on a daemon thread on first
+    use. Request threads hand it coroutines, so the Firestore reads and writes,
+    uploads and token checks of every in-flight request share one thread
+    instead of each blocking its own.
+    """
+    global _loop, _thread
+    with _loop_lock:
+        if _loop is None or not _thread.is_alive():
+            if _loop is not None:
+                # The loop thread died; clients bound to its loop cannot be reused.
+                print("The I/O loop thread stopped, starting a new one.")
+                _run_reset_callbacks()
+            loop = asyncio.new_event_loop()
+            loop.set_default_executor(ThreadPoolExecutor(max_workers=IO_THREADS, thread_name_prefix="io-blocking"))
+            thread = threading.Thread(target=_run_loop, args=(loop,), name="io-loop", daemon=True)
+            thread.start()
+            _loop, _thread = loop, thread
+        return _loop
+
+def submit_io(coro):
+    """
+    Schedule `coro` on the I/O loop without waiting; returns a
+    concurrent.futures.Future.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_io_loop())
+
+def run_io(coro, timeout=None):
+    """
+    Run `coro` on the I/O loop and return its result to a synchronous caller.
+    """
+    if threading.current_thread() is _thread:
+        coro.close()
+        raise RuntimeError("run_io cannot wait on the I/O loop's own thread.")
+    future = submit_io(coro)
+    try:
+        return future.result(IO_TIMEOUT if timeout is None else timeout)
+    except TimeoutError:
+        future.cancel()
+        raise
+
+def stop_io_loop(timeout=5):
+    """
+    Stop the loop and its threads, e.g. in the gunicorn master before forking,
+    and drop the clients bound to it.
+    """
+    global _loop, _thread
+    with _loop_lock:
+        loop, thread, _loop, _thread = _loop, _thread, None, None
+    if loop is None:
+        return
+    _run_reset_callbacks()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout)
+    if not thread.is_alive():
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from app.services.firestore_service import get_cv_cache_entry, set_cv_cache_entry
+
+CV_CACHE_SIZE = int(os.getenv("FLASK_CV_CACHE_SIZE", "256"))
+# Optional shared tier behind the in-process LRU: "", "disk" or "firestore".
+CV_CACHE_BACKEND = os.getenv("FLASK_CV_CACHE_BACKEND", "")
+CV_CACHE_DIR = os.getenv("FLASK_CV_CACHE_DIR", "cv_cache")
+
+def pdf_digest(pdf):
+    """
+    SHA-256 digest of a PDF given as bytes or a seekable binary file, which is
+    read in chunks and rewound.
+    """
+    if isinstance(pdf, (bytes, bytearray)):
+        return hashlib.sha256(pdf).digest()
+    digest = hashlib.sha256()
+    pdf.seek(0)
+    for chunk in iter(lambda: pdf.read(64 * 1024), b""):
+        digest.update(chunk)
+    pdf.seek(0)
+    return digest.digest()
+
+def cv_content_id(pdf):
+    """
+    Stable id of a CV: the hex SHA-256 of the PDF bytes.
+    """
+    return pdf_digest(pdf).hex()
+
+def cv_cache_key(pdf, job_requirements, job_required_experience, job_title, skills_version):
+    """
+    Key for a CV analysis: the PDF content hash plus everything the score and
+    report depend on. Requirement lists are sorted but keep duplicates, since
+    duplicates count towards the required total.
+    """
+    normalized_requirements = {
+        category: sorted(skill.strip().lower() for skill in skills)
+        for category, skills in job_requirements.items()
+        if skills
+    }
+    job = json.dumps({
+        "requirements": normalized_requirements,
+        "experience": (job_required_experience or "").strip(),
+        "title": (job_title or "").strip(),
+        "skills_version": skills_version,
+    }, sort_keys=True)
+    return hashlib.sha256(pdf_digest(pdf) + job.encode("utf-8")).hexdigest()
+
+class DiskCacheTier:
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        try:
+            with open(self._path(key), "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key, value):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(value, file)
+        os.replace(tmp_path, self._path(key))
+
+class FirestoreCacheTier:
+    def get(self, key):
+        return get_cv_cache_entry(key)
+
+    def set(self, key, value):
+        set_cv_cache_entry(key, value)
+
+class CVResultCache:
+    """
+    Bounded LRU of CV analysis results with an optional shared tier.
+    Errors from the shared tier are logged and treated as misses.
+    """
+
+    def __init__(self, max_size, shared_tier=None):
+        self.max_size = max_size
+        self.shared_tier = shared_tier
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "shared_hits": 0, "misses": 0}
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return dict(value)
+
+        if self.shared_tier is not None:
+            try:
+                value = self.shared_tier.get(key)
+            except Exception as e:
+                print(f"Error reading CV result cache: {e}")
+                value = None
+            if value is not None:
+                self._remember(key, value)
+                with self._lock:
+                    self._stats["shared_hits"] += 1
+                return dict(value)
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def set(self, key, value):
+        self._remember(key, value)
+        if self.shared_tier is not None:
+            try:
+                self.shared_tier.set(key, value)
+            except Exception as e:
+                print(f"Error writing CV result cache: {e}")
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._entries[key] = dict(value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "size": len(self._entries), "max_size": self.max_size}
+
+def _shared_tier_from_env():
+    if CV_CACHE_BACKEND == "disk":
+        return DiskCacheTier(CV_CACHE_DIR)
+    if CV_CACHE_BACKEND == "firestore":
+        return FirestoreCacheTier()
+    return None
+
+cv_result_cache = CVResultCache(CV_CACHE_SIZE, _shared_tier_from_env())
@@ -0,0 +1,130 @@
+import os
+import zlib
+from types import MappingProxyType
+from app.services.experience_parser import extract_experience_periods, merge_periods, total_experience_years
+from app.services.skill_matcher import SKILL_LABELS
+
+# Compressed CV text above this size is left out of the stored features
+# (Firestore documents are capped at 1 MiB); such CVs cannot be re-extracted.
+CV_FEATURES_MAX_TEXT = int(os.getenv("FLASK_CV_FEATURES_MAX_TEXT", str(256 * 1024)))
+
+def _format_month(month):
+    return f"{month[0]:04d}-{month[1]:02d}"
+
+def _read_month(value):
+    year, month = value.split("-")
+    return int(year), int(month)
+
+def extract_candidate_name(text):
+    """
+    First non-empty line of the CV, read without splitting the whole text.
+    """
+    start = 0
+    while True:
+        end = text.find("\n", start)
+        line = (text[start:] if end == -1 else text[start:end]).strip()
+        if line:
+            return line
+        if end == -1:
+            return "Unknown"
+        start = end + 1
+
+class CVAnalysis:
+    """
+    Immutable parse result of one CV: its text, the skills found per category,
+    the experience periods and what is derived from them. Built once per CV and
+    shared by scoring, report rendering and career suggestions.
+    """
+
+    __slots__ = ("text", "skills", "periods", "experience_years", "candidate_name")
+
+    def __init__(self, text, skills, periods, experience_years, candidate_name):
+        set_slot = super().__setattr__
+        set_slot("text", text)
+        set_slot("skills", MappingProxyType({
+            category: frozenset(skills.get(category, ())) for category in SKILL_LABELS
+        }))
+        set_slot("periods", tuple((tuple(start), tuple(end) if end else None) for start, end in periods))
+        set_slot("experience_years", experience_years)
+        set_slot("candidate_name", candidate_name)
+
+    @classmethod
+    def from_text(cls, text, extracted_skills, today=None):
+        periods = extract_experience_periods(text)
+        return cls(text, extracted_skills, periods, total_experience_years(periods, today), extract_candidate_name(text))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CVAnalysis is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("CVAnalysis is immutable")
+
+    def __reduce__(self):
+        return CVAnalysis, (self.text, dict(self.skills), self.periods, self.experience_years, self.candidate_name)
+
+    def __eq__(self, other):
+        if not isinstance(other, CVAnalysis):
+            return NotImplemented
+        return self.__reduce__()[1] == other.__reduce__()[1]
+
+    def __repr__(self):
+        return f"CVAnalysis(candidate_name={self.candidate_name!r}, experience_years={self.experience_years!r})"
+
+    def all_skills(self):
+        return frozenset().union(*self.skills.values())
+
+    def to_dict(self):
+        return {
+            "text": self.text,
+            "skills": {category: sorted(skills) for category, skills in self.skills.items()},
+            "periods": [[list(start), list(end) if end else None] for start, end in self.periods],
+            "experience_years": self.experience_years,
+            "candidate_name": self.candidate_name,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["text"], data["skills"], data["periods"], data["experience_years"], data["candidate_name"])
+
+    def to_features(self, skills_version):
+        """
+        Compact record stored per CV so it can be scored again without its PDF.
+        Periods are merged and stored as maps, since Firestore does not allow
+        nested arrays; the text is kept compressed for re-extracting skills
+        when the vocabulary changes.
+        """
+        features = {
+            "skills": {category: sorted(skills) for category, skills in self.skills.items()},
+            "periods": [
+                {"start": _format_month(start), "end": _format_month(end) if end else None}
+                for start, end in merge_periods(self.periods)
+            ],
+            "candidate_name": self.candidate_name,
+            "skills_version": skills_version,
+        }
+        text = zlib.compress(self.text.encode("utf-8"))
+        if len(text) <= CV_FEATURES_MAX_TEXT:
+            features["text"] = text
+        return features
+
+    @classmethod
+    def from_features(cls, features, extracted_skills=None, today=None):
+        """
+        Rebuild an analysis from a to_features record, with `extracted_skills`
+        replacing the stored skills when given. Experience years are recomputed,
+        so ongoing periods count up to the current month. The text is not
+        restored; see features_text.
+        """
+        periods = [
+            (_read_month(period["start"]), _read_month(period["end"]) if period.get("end") else None)
+            for period in features.get("periods", [])
+        ]
+        skills = features.get("skills", {}) if extracted_skills is None else extracted_skills
+        return cls("", skills, periods, total_experience_years(periods, today), features.get("candidate_name", "Unknown"))
+
+def features_text(features):
+    """
+    CV text stored in a feature record, or None when it was left out.
+    """
+    text = features.get("text")
+    return None if text is None else zlib.decompress(bytes(text)).decode("utf-8")
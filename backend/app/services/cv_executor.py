@@ -0,0 +1,229 @@
+import io
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from app.services.pdf_service import PDFParseTimeout, extract_text_from_pdf
+from app.services.skill_matcher import SkillMatcher, match_skills, match_skills_batch
+from app.services.cv_analysis import CVAnalysis
+from app.utils.metrics import stage
+
+# Worker processes for the CPU-bound part of a CV analysis: PDF text extraction,
+# skill matching and experience parsing. With 0 the work runs on the calling thread;
+# gunicorn.conf.py enables the pool for deployments.
+CV_PROCESSES = int(os.getenv("FLASK_CV_PROCESSES", "0"))
+# Seconds one CV may spend in extraction and matching before it is abandoned; 0 disables.
+CV_PARSE_TIMEOUT = float(os.getenv("FLASK_CV_PARSE_TIMEOUT", "30"))
+# Long texts are matched in chunks of about this many characters, split at line
+# breaks, so the deadline is also checked while matching.
+MATCH_CHUNK_CHARS = int(os.getenv("FLASK_MATCH_CHUNK_CHARS", "20000"))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _init_worker(matcher_mode):
+    SkillMatcher.configure(matcher_mode)
+    if SkillMatcher.uses_spacy():
+        SkillMatcher.get_nlp()
+
+def _warm_worker():
+    return os.getpid()
+
+def _deadline(timeout):
+    return time.monotonic() + timeout if timeout else None
+
+def _remaining(deadline):
+    return None if deadline is None else max(deadline - time.monotonic(), 0)
+
+def _check_deadline(deadline):
+    if deadline is not None and time.monotonic() > deadline:
+        raise PDFParseTimeout("CV analysis timed out")
+
+def _text_chunks(text):
+    start = 0
+    while len(text) - start > MATCH_CHUNK_CHARS:
+        end = text.rfind("\n", start + 1, start + MATCH_CHUNK_CHARS)
+        end = end if end > start else start + MATCH_CHUNK_CHARS
+        yield text[start:end]
+        start = end
+    yield text[start:]
+
+def _match_skills(text, skills_version, load_vocabulary, deadline):
+    extracted = {}
+    for chunk in _text_chunks(text):
+        _check_deadline(deadline)
+        for category, skills in match_skills(chunk, skills_version, load_vocabulary).items():
+            extracted[category] = list(set(extracted.get(category, ())).union(skills))
+    return extracted
+
+def _open_pdf(pdf):
+    if isinstance(pdf, (bytes, bytearray)):
+        return io.BytesIO(pdf)
+    pdf.seek(0)
+    return pdf
+
+def _read_pdf(pdf):
+    if isinstance(pdf, (bytes, bytearray)):
+        return pdf
+    pdf.seek(0)
+    return pdf.read()
+
+def _analyse(pdf, skills_version, load_vocabulary, timeout):
+    # The deadline is checked between pages and between chunks of text, so a
+    # single page or chunk is the longest stretch that cannot be interrupted.
+    deadline = _deadline(timeout)
+    with stage("pdf_text"):
+        text = extract_text_from_pdf(_open_pdf(pdf), deadline=deadline)
+    with stage("skill_match"):
+        extracted_skills = _match_skills(text, skills_version, load_vocabulary, deadline)
+    with stage("experience"):
+        return CVAnalysis.from_text(text, extracted_skills)
+
+def _analyse_in_worker(pdf_bytes, skills_version, vocabulary, timeout):
+    # The vocabulary is only sent when this worker has not compiled the matcher
+    # for `skills_version` yet; returning None asks the caller to resend it.
+    if vocabulary is None and SkillMatcher.get_version() != skills_version:
+        return None
+    return _analyse(pdf_bytes, skills_version, lambda: vocabulary, timeout)
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=CV_PROCESSES,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(SkillMatcher.get_mode(),),
+                )
+    return _pool
+
+def _reset_pool(pool=None, terminate=False):
+    """
+    Drop `pool` (the current one by default) so the next task starts a new one.
+    With `terminate` its workers are killed, including one stuck on a CV.
+    """
+    global _pool
+    with _pool_lock:
+        pool = _pool if pool is None else pool
+        if _pool is pool:
+            _pool = None
+    if pool is None:
+        return
+    if terminate:
+        # ProcessPoolExecutor cannot cancel a running task; killing the processes
+        # breaks the pool, failing the other tasks on it with BrokenProcessPool.
+        for process in list((pool._processes or {}).values()):
+            process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def start_cv_executor():
+    """
+    Spawn the worker processes and load their models ahead of the first request.
+    """
+    if CV_PROCESSES > 0:
+        pool = _get_pool()
+        for future in [pool.submit(_warm_worker) for _ in range(CV_PROCESSES)]:
+            future.result()
+
+def _submit(pool, pdf_bytes, skills_version, load_vocabulary, timeout, vocabulary=None):
+    futures = [pool.submit(_analyse_in_worker, pdf_bytes, skills_version, vocabulary, timeout)]
+
+    def result(deadline=None):
+        # One deadline covers the first task and the resend.
+        try:
+            analysis = futures[-1].result(_remaining(deadline))
+            if analysis is None:
+                futures.append(pool.submit(_analyse_in_worker, pdf_bytes, skills_version, load_vocabulary(), timeout))
+                analysis = futures[-1].result(_remaining(deadline))
+        except TimeoutError:
+            # A queued task is just cancelled; a running one holds its worker
+            # until the worker is killed.
+            if not futures[-1].cancel():
+                _reset_pool(pool, terminate=True)
+            raise PDFParseTimeout("CV analysis timed out")
+        return analysis
+
+    return result
+
+def analyse_pdf(pdf, skills_version, load_vocabulary, timeout=None):
+    """
+    Return the CVAnalysis of a PDF (bytes or a binary file), computed on the
+    process pool if enabled. Raises PDFParseTimeout after `timeout` seconds
+    (CV_PARSE_TIMEOUT by default).
+    """
+    timeout = CV_PARSE_TIMEOUT if timeout is None else timeout
+    with stage("cv_analysis"):
+        if CV_PROCESSES <= 0:
+            return _analyse(pdf, skills_version, load_vocabulary, timeout)
+
+        # The worker enforces the timeout itself; waiting up to twice as long
+        # here also bounds the time spent queued behind other CVs. A worker
+        # still busy at that point is killed. Stages inside the worker process
+        # are not recorded.
+        pdf_bytes = _read_pdf(pdf)
+        deadline = _deadline(2 * timeout)
+        for attempt in range(2):
+            pool = _get_pool()
+            try:
+                return _submit(pool, pdf_bytes, skills_version, load_vocabulary, timeout)(deadline)
+            except (BrokenProcessPool, CancelledError):
+                # The pool may have been killed over another CV; retry once on a new one.
+                _reset_pool(pool)
+                if attempt:
+                    raise
+
+def analyse_pdfs(pdfs, skills_version, load_vocabulary):
+    """
+    Same as analyse_pdf for many PDFs. Returns one CVAnalysis or Exception
+    per PDF, in order.
+    """
+    if CV_PROCESSES <= 0:
+        texts = []
+        for pdf_bytes in pdfs:
+            try:
+                with stage("pdf_text"):
+                    texts.append(extract_text_from_pdf(io.BytesIO(pdf_bytes), deadline=_deadline(CV_PARSE_TIMEOUT)))
+            except Exception as e:
+                texts.append(e)
+        parsed = [text for text in texts if not isinstance(text, Exception)]
+        with stage("skill_match"):
+            extracted = iter(match_skills_batch(parsed, skills_version, load_vocabulary))
+        with stage("experience"):
+            return [text if isinstance(text, Exception) else CVAnalysis.from_text(text, next(extracted)) for text in texts]
+
+    # A task is waited for at most twice the timeout after the previous result
+    # came back: by then it has a worker, which enforces the timeout itself. A
+    # worker still busy after that is killed with its pool; the other CVs lost
+    # with the pool are submitted once more to a new one. Failures are
+    # returned per CV.
+    vocabulary = load_vocabulary()
+    results = [None] * len(pdfs)
+    pending = list(range(len(pdfs)))
+    for attempt in range(2):
+        pool = _get_pool()
+        tasks = []
+        lost = []
+        for n, index in enumerate(pending):
+            # Send the vocabulary with the first wave so fresh workers do not bounce every task.
+            try:
+                tasks.append((index, _submit(pool, pdfs[index], skills_version, load_vocabulary, CV_PARSE_TIMEOUT, vocabulary if n < CV_PROCESSES else None)))
+            except BrokenProcessPool as e:
+                results[index] = e
+                lost.append(index)
+        for index, result in tasks:
+            try:
+                results[index] = result(_deadline(2 * CV_PARSE_TIMEOUT))
+            except (BrokenProcessPool, CancelledError) as e:
+                results[index] = e
+                lost.append(index)
+            except Exception as e:
+                results[index] = e
+        if not lost:
+            break
+        _reset_pool(pool)
+        pending = lost
+    return results
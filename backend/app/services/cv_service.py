@@ -1,106 +1,41 @@
-import spacy
-import pdfplumber
-from app.services.firestore_service import get_programming_languages, get_frameworks, get_tools, get_certifications, get_types_of_skill
+from app.services.firestore_service import get_programming_languages, get_frameworks, get_tools, get_certifications, get_skill_aliases, get_types_of_skill, get_skills_version, get_cv_features_async, set_cv_features_async
+from app.services.skill_matcher import SkillMatcher, SKILL_LABELS, match_skills, match_skills_batch
+from app.services.pdf_service import extract_text_from_pdf
+from app.services.cv_executor import analyse_pdf, analyse_pdfs
+from app.services.experience_parser import extract_experience, calculate_experience_years
+from app.services.cv_analysis import CVAnalysis, extract_candidate_name, features_text
 import re
-from dateutil import parser
-from datetime import datetime
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-from reportlab.graphics.shapes import Drawing
-from reportlab.graphics.charts.barcharts import VerticalBarChart
-from reportlab.graphics.charts.legends import Legend
-from app.services.storage_service import upload_to_google_storage
-import uuid
+from app.services.storage_service import upload_to_google_storage_async, get_public_url_if_exists
+from app.services.async_io_service import run_io, submit_io
+from app.services.report_service import submit_report_job, get_report_job
+from app.services.cache_service import cv_cache_key, cv_content_id, cv_result_cache
+from app.services.suggestion_service import get_suggestion_index
+from app.services.ranking_service import CATEGORY_WEIGHTS, MATCH_MESSAGES, candidate_store
+from app.utils.metrics import stage
 import os
+import io
 import json
+from concurrent.futures import ThreadPoolExecutor
 
-def extract_text_from_pdf(file):
-    with pdfplumber.open(file) as pdf:
-        text = ""
-        for page in pdf.pages:
-            text += page.extract_text()
-    return text
-
-from spacy.matcher import PhraseMatcher
-import spacy
-
-def extract_skills(text):
-    programming_languages = get_programming_languages()
-    frameworks = get_frameworks()
-    tools = get_tools()
-    certifications = get_certifications()
-
-    nlp = spacy.load("en_core_web_sm")
-    doc = nlp(text.lower())  
-
-    matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
-
-    matcher.add("PROGRAMMING_LANGUAGES", [nlp(pl) for pl in programming_languages])
-    matcher.add("FRAMEWORKS", [nlp(fw) for fw in frameworks])
-    matcher.add("TOOLS", [nlp(tl) for tl in tools])
-    matcher.add("CERTIFICATIONS", [nlp(cert) for cert in certifications])
-
-    matches = matcher(doc)
-
-    extracted_programming_languages = set()
-    extracted_frameworks = set()
-    extracted_tools = set()
-    extracted_certifications = set()
-
-    for match_id, start, end in matches:
-        span = doc[start:end]
-        label = nlp.vocab.strings[match_id]
-
-        if label == "PROGRAMMING_LANGUAGES":
-            extracted_programming_languages.add(span.text)
-        elif label == "FRAMEWORKS":
-            extracted_frameworks.add(span.text)
-        elif label == "TOOLS":
-            extracted_tools.add(span.text)
-        elif label == "CERTIFICATIONS":
-            extracted_certifications.add(span.text)
+BATCH_WORKERS = int(os.getenv("FLASK_BATCH_WORKERS", "8"))
 
+def load_skill_vocabulary():
     return {
-        "programming_languages": list(extracted_programming_languages),
-        "frameworks": list(extracted_frameworks),
-        "tools": list(extracted_tools),
-        "certifications": list(extracted_certifications),
+        "programming_languages": get_programming_languages(),
+        "frameworks": get_frameworks(),
+        "tools": get_tools(),
+        "certifications": get_certifications(),
+        "aliases": get_skill_aliases(),
     }
 
-def extract_experience(text):
-    
-    sections = re.split(r'\n(?=\w)', text)
-    work_experience_text = ""
-    capture = False
-    for section in sections:
-        if "work experience" in section.lower() or "experience" in section.lower() or "employment" in section.lower() or "work" in section.lower(): 
-            capture = True
-        elif capture and ("education" in section.lower() or "projects" in section.lower()):
-            break
-        elif capture:
-            work_experience_text += section + "\n"
-
-    month_regex = r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|" \
-                r"Jul(?:y)?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)"
-
-    date_range_pattern = re.compile(
-        fr"{month_regex}\.?\s+\d{{4}}\s+[–-]\s+(?:Present|{month_regex}\.?\s+\d{{4}})",
-        re.IGNORECASE
-    )
-
-    matches = date_range_pattern.findall(work_experience_text)
-    print(matches)
-    return matches
+def extract_skills(text):
+    return match_skills(text, get_skills_version(), load_skill_vocabulary)
 
-def extract_candidate_name(text):
-    lines = text.strip().split('\n')
-    for line in lines:
-        clean_line = line.strip()
-        if clean_line:
-            return clean_line
-    return "Unknown"
+def extract_skills_batch(texts):
+    """
+    Same as extract_skills for many texts, batching the tokenization with nlp.pipe.
+    """
+    return match_skills_batch(texts, get_skills_version(), load_skill_vocabulary)
 
 def parse_experience_range(text):
     match = re.match(r"^\s*(\d+)(?:\s*[-–]\s*(\d+))?", text)
@@ -110,92 +45,43 @@ def parse_experience_range(text):
         return min_years, max_years
     return None, None
 
-def calculate_experience_years(date_ranges):
-    parsed_periods = []
-
-    for period in date_ranges:
-        parts = re.split(r"\s+[–-]\s+", period)
-        if len(parts) != 2:
-            continue 
-
-        start_str, end_str = parts
-        try:
-            start_date = parser.parse(start_str, fuzzy=True)
-        except Exception:
-            continue  
-
-        if "present" in end_str.lower():
-            end_date = datetime.today()
-        else:
-            try:
-                end_date = parser.parse(end_str, fuzzy=True)
-            except Exception:
-                continue 
-
-        if end_date < start_date:
-            continue
-
-        parsed_periods.append((start_date, end_date))
-
-    parsed_periods.sort()
-    merged_periods = []
-    for start, end in parsed_periods:
-        if not merged_periods:
-            merged_periods.append((start, end))
-        else:
-            last_start, last_end = merged_periods[-1]
-            if start <= last_end:
-                merged_periods[-1] = (last_start, max(last_end, end))
-            else:
-                merged_periods.append((start, end))
-
-    total_months = 0
-    for start, end in merged_periods:
-        months = (end.year - start.year) * 12 + (end.month - start.month)
-        total_months += months
-
-    total_years = round(total_months / 12, 2)
-    return total_years
-
-def calculate_cv_score(cv, job_requirements, job_required_experience, job_title):
-    extracted_skills = extract_skills(cv)
-    extracted_experience_years = calculate_experience_years(extract_experience(cv))
-
-    min_required_years, max_required_years = parse_experience_range(job_required_experience)
-    min_required_years = min_required_years or 0
-
-    category_weights = {
-        "certifications": 4,
-        "programming_languages": 3,
-        "frameworks": 2,
-        "tools": 1,
-    }
+class JobProfile:
+    """
+    Scoring inputs derived from a job posting, computed once and reused for
+    every CV scored against that job.
+    """
 
-    total_weighted_required_skills = 0
+    def __init__(self, job_requirements, job_required_experience):
+        self.job_requirements = job_requirements
+        self.required_skills = {
+            category: set(required_skills)
+            for category, required_skills in job_requirements.items()
+            if category in SKILL_LABELS
+        }
+        self.total_weighted_required_skills = sum(
+            len(job_requirements[category]) * CATEGORY_WEIGHTS.get(category, 1)
+            for category in self.required_skills
+        )
+
+        min_required_years, max_required_years = parse_experience_range(job_required_experience or "")
+        self.min_required_years = min_required_years or 0
+        self.max_required_years = max_required_years
+
+def score_skills(extracted_skills, extracted_experience_years, job_profile):
     total_weighted_matched_skills = 0
-    for category, required_skills in job_requirements.items():
-        if category in extracted_skills:
-            category_weight = category_weights.get(category, 1)
-            total_required_skills = len(required_skills)
-            matched_skills = len(set(extracted_skills[category]) & set(required_skills))
-            total_weighted_required_skills += total_required_skills * category_weight
-            total_weighted_matched_skills += matched_skills * category_weight
-
-    if total_weighted_required_skills == 0:
+    for category, required_skills in job_profile.required_skills.items():
+        matched_skills = len(required_skills.intersection(extracted_skills[category]))
+        total_weighted_matched_skills += matched_skills * CATEGORY_WEIGHTS.get(category, 1)
+
+    if job_profile.total_weighted_required_skills == 0:
         skill_score = 100
     else:
-        skill_score = (total_weighted_matched_skills / total_weighted_required_skills) * 100
+        skill_score = (total_weighted_matched_skills / job_profile.total_weighted_required_skills) * 100
 
-    message = ""
+    message = next((message for threshold, message in MATCH_MESSAGES if skill_score >= threshold), "")
 
-    if skill_score >= 80:
-        message = "Excellent match"
-    elif skill_score >= 60:
-        message = "Good match"
-    elif skill_score >= 40:
-        message = "Average match"
-    elif skill_score >= 20:
-        message = "Below average match"
+    min_required_years = job_profile.min_required_years
+    max_required_years = job_profile.max_required_years
 
     experience_multiplier = 1.0
     if extracted_experience_years is not None:
@@ -209,21 +95,221 @@ def calculate_cv_score(cv, job_requirements, job_required_experience, job_title)
     if experience_multiplier <= 0.5:
         message += ", but insufficient experience!"
 
-    final_score = round(skill_score * experience_multiplier, 2)
+    return round(skill_score * experience_multiplier, 2), message
+
+def calculate_cv_score(analysis, job_requirements, job_required_experience, job_title):
+    job_profile = JobProfile(job_requirements, job_required_experience)
+
+    final_score, message = score_skills(analysis.skills, analysis.experience_years, job_profile)
     if final_score <= 75:
+        report_job_id = submit_report_job(
+            generate_and_upload_cv_report,
+            final_score, job_title, analysis, job_requirements,
+            job_profile.min_required_years, job_profile.max_required_years
+        )
+        return final_score, message, report_job_id
+
+    return final_score, message, None
+
+def score_cv_upload(pdf, job_requirements, job_required_experience, job_title):
+    """
+    Score an uploaded CV (bytes or a seekable binary file), reusing the stored
+    result when the same PDF was already scored against the same job and skill
+    vocabulary.
+    """
+    cv_id = cv_content_id(pdf)
+    cache_key = cv_cache_key(pdf, job_requirements, job_required_experience, job_title, get_skills_version())
+    with stage("result_cache"):
+        cached = cv_result_cache.get(cache_key)
+    if cached is not None:
+        if cached.get("report_job_id") is None or cached.get("cv_report_url"):
+            return {**cached, "cv_id": cv_id}
+        # The report may have been finished or lost by any worker, so its status
+        # is resolved here; an entry without a report is computed again.
+        try:
+            job = get_cv_report_status(cached["report_job_id"])
+        except Exception as e:
+            print(f"Error resolving cached CV report: {e}")
+            job = None
+        if job is not None and job["status"] == "ready":
+            cached = {**cached, "cv_report_url": job["cv_report_url"]}
+            cv_result_cache.set(cache_key, cached)
+        if job is not None and job["status"] != "failed":
+            return {**cached, "cv_id": cv_id}
+        cv_result_cache.discard(cache_key)
+
+    skills_version = get_skills_version()
+    analysis = load_current_analysis(cv_id, skills_version)
+    if analysis is None:
+        analysis = analyse_pdf(pdf, skills_version, load_skill_vocabulary)
+        save_cv_features({cv_id: analysis.to_features(skills_version)})
+    candidate_store.add(cv_id, analysis, skills_version)
+    score, message, report_job_id = calculate_cv_score(analysis, job_requirements, job_required_experience, job_title)
+    result = {"score": score, "message": message, "cv_report_url": None, "report_job_id": report_job_id, "cv_id": cv_id}
+
+    # A low score without a report job means the report queue was full; retry next time.
+    if score > 75 or report_job_id is not None:
+        cv_result_cache.set(cache_key, result)
+    return result
+
+def score_cv_batch(cv_sources, job_requirements, job_required_experience):
+    """
+    Score many CVs against one job and return them ranked by score.
+    `cv_sources` is a list of (cv_id, load_pdf) pairs where load_pdf() returns
+    the PDF bytes. Downloads run on a thread pool, text and skill extraction go
+    through the CV executor, and the job is preprocessed once. No reports are
+    generated.
+    """
+    job_profile = JobProfile(job_requirements, job_required_experience)
 
+    def load_pdf(source):
+        cv_id, load = source
         try:
-            generate_cv_report(final_score, job_title, extract_candidate_name(cv), extracted_skills, job_requirements, extracted_experience_years, min_required_years, max_required_years)
-            unique_id = str(uuid.uuid4())
-            bucket_name = os.getenv("FLASK_FIREBASE_STORAGE_BUCKET")
-            folder_name = os.getenv("FLASK_FIREBASE_STORAGE_REPORTS_FOLDER", "cv_reports")
-            blob_name = f"{folder_name}/{unique_id}.pdf"
-            url = upload_to_google_storage("cv_report.pdf", bucket_name, blob_name)
-            return final_score, message, url
+            return cv_id, load(), None
         except Exception as e:
-            print(f"Error uploading CV report to GCS: {e}")
+            return cv_id, None, str(e)
 
-    return final_score, message, None
+    with ThreadPoolExecutor(max_workers=BATCH_WORKERS) as executor:
+        loaded = list(executor.map(load_pdf, cv_sources))
+
+    downloaded = [(cv_id, pdf_bytes) for cv_id, pdf_bytes, error in loaded if error is None]
+    errors = [{"id": cv_id, "error": error} for cv_id, _, error in loaded if error is not None]
+    skills_version = get_skills_version()
+    analyses = analyse_pdfs([pdf_bytes for _, pdf_bytes in downloaded], skills_version, load_skill_vocabulary)
+
+    results = []
+    features = {}
+    for (cv_id, pdf_bytes), analysis in zip(downloaded, analyses):
+        if isinstance(analysis, Exception):
+            errors.append({"id": cv_id, "error": str(analysis)})
+            continue
+        content_id = cv_content_id(pdf_bytes)
+        candidate_store.add(content_id, analysis, skills_version)
+        features[content_id] = analysis.to_features(skills_version)
+        score, message = score_skills(analysis.skills, analysis.experience_years, job_profile)
+        results.append({
+            "id": cv_id,
+            "cv_id": content_id,
+            "candidate_name": analysis.candidate_name,
+            "score": score,
+            "message": message,
+            "experience_years": analysis.experience_years,
+        })
+
+    save_cv_features(features)
+
+    results.sort(key=lambda result: result["score"], reverse=True)
+    for rank, result in enumerate(results, start=1):
+        result["rank"] = rank
+
+    return results, errors
+
+def rerank_cvs(cv_ids, job_requirements, job_required_experience, limit=None):
+    """
+    Rank already analysed CVs against new job requirements without parsing
+    any PDF. CVs missing from the in-memory store, or stored with an older skill
+    vocabulary, are loaded from their stored features first.
+    Returns (ranked results, ids of CVs that were never analysed).
+    """
+    skills_version = get_skills_version()
+    outdated = candidate_store.outdated(cv_ids, skills_version)
+    if outdated:
+        for cv_id, (analysis, version) in load_stored_analyses(outdated, skills_version).items():
+            candidate_store.add(cv_id, analysis, version)
+    with stage("rank"):
+        return candidate_store.rank(JobProfile(job_requirements, job_required_experience), cv_ids, limit)
+
+def save_cv_features(features_by_id):
+    """
+    Store the feature records of analysed CVs. A failed write only costs a
+    PDF parse later, so it is logged and not raised.
+    """
+    if not features_by_id:
+        return
+    try:
+        with stage("features_store"):
+            run_io(set_cv_features_async(features_by_id))
+    except Exception as e:
+        print(f"Error storing CV features: {e}")
+
+def load_stored_analyses(cv_ids, skills_version):
+    """
+    Analyses rebuilt from stored features, as {cv_id: (analysis, skills version)}.
+    Features matched against another vocabulary version are re-extracted from
+    their stored text and written back; without stored text they are used as
+    they are. Ids without stored features are left out.
+    """
+    with stage("features_load"):
+        stored = run_io(get_cv_features_async(cv_ids))
+
+    texts = {}
+    for cv_id, features in stored.items():
+        if features.get("skills_version") != skills_version:
+            text = features_text(features)
+            if text is not None:
+                texts[cv_id] = text
+    extracted = {}
+    if texts:
+        with stage("skill_match"):
+            extracted = dict(zip(texts, match_skills_batch(list(texts.values()), skills_version, load_skill_vocabulary)))
+
+    analyses = {}
+    refreshed = {}
+    for cv_id, features in stored.items():
+        if cv_id in extracted:
+            analysis = CVAnalysis.from_features(features, extracted[cv_id])
+            refreshed[cv_id] = {
+                **features,
+                "skills": {category: sorted(skills) for category, skills in analysis.skills.items()},
+                "skills_version": skills_version,
+            }
+            analyses[cv_id] = (analysis, skills_version)
+        else:
+            analyses[cv_id] = (CVAnalysis.from_features(features), features.get("skills_version"))
+
+    save_cv_features(refreshed)
+    return analyses
+
+def load_current_analysis(cv_id, skills_version):
+    """
+    Analysis of a previously uploaded CV from its stored features, or None when
+    the PDF has to be parsed. Lookup errors fall back to parsing.
+    """
+    try:
+        analysis, version = load_stored_analyses([cv_id], skills_version).get(cv_id, (None, None))
+    except Exception as e:
+        print(f"Error loading CV features: {e}")
+        return None
+    return analysis if version == skills_version else None
+
+def report_blob_name(report_job_id):
+    folder_name = os.getenv("FLASK_FIREBASE_STORAGE_REPORTS_FOLDER", "cv_reports")
+    return f"{folder_name}/{report_job_id}.pdf"
+
+def generate_and_upload_cv_report(report_job_id, *report_args):
+    """
+    Render the report on the calling report thread and hand the upload to the
+    I/O loop. Returns a future of the report URL.
+    """
+    with stage("report_render"):
+        report = render_cv_report(*report_args)
+    return submit_io(upload_cv_report(report, report_job_id))
+
+async def upload_cv_report(report, report_job_id):
+    bucket_name = os.getenv("FLASK_FIREBASE_STORAGE_BUCKET")
+    with stage("report_upload"):
+        return await upload_to_google_storage_async(report, bucket_name, report_blob_name(report_job_id))
+
+def get_cv_report_status(report_job_id):
+    job = get_report_job(report_job_id)
+    if job is not None:
+        return job
+
+    # The job may have run in another worker; the report exists once it is uploaded.
+    url = get_public_url_if_exists(os.getenv("FLASK_FIREBASE_STORAGE_BUCKET"), report_blob_name(report_job_id))
+    if url:
+        return {"status": "ready", "cv_report_url": url}
+    return None
 
 def draw_wrapped_text(canvas, text, x, y, max_width, line_height=16):
     """
@@ -248,8 +334,29 @@ def draw_wrapped_text(canvas, text, x, y, max_width, line_height=16):
     return y
 
 def generate_cv_report(score, job_title, candidate_name, extracted_skills, job_requirements, extracted_years=None, min_required_years=None, max_required_years=None):
+    """
+    Render the CV analysis report from loose values and return the PDF as bytes.
+    """
+    analysis = CVAnalysis("", extracted_skills, (), extracted_years, candidate_name)
+    return render_cv_report(score, job_title, analysis, job_requirements, min_required_years, max_required_years)
 
-    c = canvas.Canvas("cv_report.pdf", pagesize=A4)
+def render_cv_report(score, job_title, analysis, job_requirements, min_required_years=None, max_required_years=None):
+    """
+    Render the CV analysis report and return the PDF as bytes.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+    from reportlab.lib import colors
+    from reportlab.graphics.shapes import Drawing
+    from reportlab.graphics.charts.barcharts import VerticalBarChart
+    from reportlab.graphics.charts.legends import Legend
+
+    candidate_name = analysis.candidate_name
+    extracted_skills = analysis.skills
+    extracted_years = analysis.experience_years
+
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
     width, height = A4
 
     c.setFont("Helvetica-Bold", 20)
@@ -267,15 +374,21 @@ def generate_cv_report(score, job_title, candidate_name, extracted_skills, job_r
     required = []
     matched = []
     missing_skills_text = []
+    matched_skills = set()
 
     for category, required_skills in job_requirements.items():
+        required_set = set(required_skills)
+        category_skills = extracted_skills.get(category, frozenset())
+        matched_in_category = required_set & category_skills
+        matched_skills |= matched_in_category
+
         required_count = len(required_skills)
-        matched_count = len(set(required_skills) & set(extracted_skills.get(category, [])))
+        matched_count = len(matched_in_category)
         if required_count > 0 or matched_count > 0:
             categories.append(category.replace("_", " ").title())
             required.append(required_count)
             matched.append(matched_count)
-            missing = set(required_skills) - set(extracted_skills.get(category, []))
+            missing = required_set - category_skills
             if missing:
                 missing_skills_text.append(f"❌ Missing {category.replace('_', ' ').title()}: {', '.join(missing)}")
 
@@ -298,7 +411,6 @@ def generate_cv_report(score, job_title, candidate_name, extracted_skills, job_r
 
     chart.valueAxis.valueMin = 0
     all_values = required + matched
-    all_values = required + matched
     chart.valueAxis.valueMax = (max(all_values) + 1) if all_values else 1
     chart.valueAxis.valueStep = 1
 
@@ -339,10 +451,6 @@ def generate_cv_report(score, job_title, candidate_name, extracted_skills, job_r
     y_skills_text -= 20
 
     c.setFont("Helvetica", 12)
-    matched_skills = set()
-    for category, skills in extracted_skills.items():
-        matched_skills.update(set(skills) & set(job_requirements.get(category, [])))
-
     if len(matched_skills) != 0:
         capitalized_matched_skills = [skill.title() for skill in matched_skills]
         chunk_size = 6
@@ -424,15 +532,20 @@ def generate_cv_report(score, job_title, candidate_name, extracted_skills, job_r
     c.setFont("Helvetica", 13)
     y = y - 30
 
-    career_paths = suggest_career_paths(extracted_skills, extracted_years)
+    career_paths = suggest_career_paths(analysis)
 
     for suggestion in career_paths:
         y = draw_wrapped_text(c, f"• {suggestion}", 100, y, max_width=400)
         y -= 10
 
     c.save()
+    return buffer.getvalue()
 
 def draw_experience_comparison(c, extracted_years, min_required_years, max_required_years, y_offset=80, chart_height=150):
+    from reportlab.lib import colors
+    from reportlab.graphics.shapes import Drawing
+    from reportlab.graphics.charts.barcharts import VerticalBarChart
+    from reportlab.graphics.charts.legends import Legend
     from reportlab.graphics.charts.textlabels import Label
 
     # Prepare data
@@ -505,37 +618,16 @@ def format_career_path_message(career_paths):
 
     return message
 
-import json
-
-def suggest_career_paths(extracted_skills, extracted_years):
-    file_path = (
-        "skills/career_paths_suggestions.json"
-        if extracted_years <= 2
-        else "skills/improvement_suggestions.json"
-    )
-
-    with open(file_path, "r") as file:
-        suggestions_data = json.load(file)
+def suggest_career_paths(analysis):
+    index = get_suggestion_index("career_paths" if analysis.experience_years <= 2 else "improvement")
 
     type_counts = {}
-    for category in extracted_skills:
-        for skill in extracted_skills[category]:
-            types_of_skill = get_types_of_skill(skill)
-            for skill_type in types_of_skill:
+    for skills in analysis.skills.values():
+        for skill in skills:
+            for skill_type in get_types_of_skill(skill):
                 type_counts[skill_type] = type_counts.get(skill_type, 0) + 1
 
-    suggestions = []
-    for suggestion_title, info in suggestions_data.items():
-        required_types = info.get("types", [])
-        message = info.get("message", "")
-        match_score = sum(type_counts.get(skill_type, 0) for skill_type in required_types)
-        if match_score > 0 or "any" in required_types:
-            explanation = (
-                f"Match Score: {match_score} (we found {match_score} relevant signals in your CV). "
-                f"{message}"
-            )
-            suggestions.append((suggestion_title, match_score, explanation))
-
-    suggestions.sort(key=lambda x: x[1], reverse=True)
-    top_suggestions = [f"{title}: {explanation}" for title, _, explanation in suggestions[:3]]
-    return top_suggestions
+    return [
+        f"{title}: Match Score: {match_score} (we found {match_score} relevant signals in your CV). {message}"
+        for title, match_score, message in index.top(type_counts, 3)
+    ]
@@ -0,0 +1,139 @@
+import re
+from datetime import datetime
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+MONTH_REGEX = r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|" \
+              r"Jul(?:y)?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)"
+
+DATE_RANGE_PATTERN = re.compile(
+    fr"({MONTH_REGEX})\.?\s+(\d{{4}})\s+[–-]\s+(?:(Present)|({MONTH_REGEX})\.?\s+(\d{{4}}))",
+    re.IGNORECASE
+)
+MONTH_YEAR_PATTERN = re.compile(fr"^\s*({MONTH_REGEX})\.?\s+(\d{{4}})\s*$", re.IGNORECASE)
+SECTION_START_PATTERN = re.compile(r"\n(?=\w)")
+RANGE_SEPARATOR_PATTERN = re.compile(r"\s+[–-]\s+")
+
+def _sections(text):
+    start = 0
+    for match in SECTION_START_PATTERN.finditer(text):
+        yield start, match.start()
+        start = match.end()
+    yield start, len(text)
+
+def _is_heading(section):
+    return "experience" in section or "employment" in section or "work" in section
+
+def _is_section_end(section):
+    return "education" in section or "projects" in section
+
+def find_experience_section(text):
+    """
+    Text of the sections between the first experience heading and the next
+    education/projects heading. Heading sections themselves are left out.
+    """
+    # Lower-case once and slice; a few characters change length when
+    # lower-cased, in which case sections are lower-cased one at a time.
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        lowered = None
+
+    captured = []
+    capture = False
+    for start, end in _sections(text):
+        section = lowered[start:end] if lowered is not None else text[start:end].lower()
+        if _is_heading(section):
+            capture = True
+        elif capture:
+            if _is_section_end(section):
+                break
+            captured.append(text[start:end])
+    return "\n".join(captured)
+
+def extract_experience(text):
+    """
+    Date ranges such as "Jan 2020 - Present" found in the work experience section.
+    """
+    return [match.group(0) for match in DATE_RANGE_PATTERN.finditer(find_experience_section(text))]
+
+def _month(name, year):
+    year = int(year)
+    return (year, MONTHS[name[:3].lower()]) if year >= 1 else None
+
+def extract_experience_periods(text):
+    """
+    Same as extract_experience, as ((year, month), (year, month)) periods.
+    The end is None for ongoing positions.
+    """
+    periods = []
+    for match in DATE_RANGE_PATTERN.finditer(find_experience_section(text)):
+        start_month, start_year, present, end_month, end_year = match.groups()
+        start = _month(start_month, start_year)
+        end = None if present else _month(end_month, end_year)
+        if start is not None and (present or end is not None):
+            periods.append((start, end))
+    return periods
+
+def _parse_month(value):
+    match = MONTH_YEAR_PATTERN.match(value)
+    if match:
+        return _month(*match.groups())
+    from dateutil import parser
+
+    try:
+        date = parser.parse(value, fuzzy=True)
+    except Exception:
+        return None
+    return date.year, date.month
+
+def parse_date_range(date_range):
+    """
+    Parse a "<start> - <end>" string into a period, or None if it cannot be read.
+    Unusual formats fall back to dateutil's fuzzy parser.
+    """
+    parts = RANGE_SEPARATOR_PATTERN.split(date_range)
+    if len(parts) != 2:
+        return None
+
+    start_str, end_str = parts
+    start = _parse_month(start_str)
+    if start is None:
+        return None
+    if "present" in end_str.lower():
+        return start, None
+    end = _parse_month(end_str)
+    return (start, end) if end is not None else None
+
+def merge_periods(periods):
+    """
+    Compact form of the periods with the same total_experience_years on any
+    day: valid closed periods merged into their union, followed by the
+    distinct ongoing ones (end None), which depend on the current month.
+    """
+    merged_periods = []
+    for start, end in sorted((start, end) for start, end in periods if end is not None and end >= start):
+        if merged_periods and start <= merged_periods[-1][1]:
+            last_start, last_end = merged_periods[-1]
+            merged_periods[-1] = (last_start, max(last_end, end))
+        else:
+            merged_periods.append((start, end))
+    ongoing = sorted({start for start, end in periods if end is None})
+    return merged_periods + [(start, None) for start in ongoing]
+
+def total_experience_years(periods, today=None):
+    """
+    Years covered by the periods, counting overlapping periods once.
+    """
+    today = today or datetime.today()
+    current = (today.year, today.month)
+
+    merged_periods = merge_periods([(start, end or current) for start, end in periods])
+    total_months = sum((end[0] - start[0]) * 12 + (end[1] - start[1]) for start, end in merged_periods)
+    return round(total_months / 12, 2)
+
+def calculate_experience_years(date_ranges, today=None):
+    periods = [period for period in map(parse_date_range, date_ranges) if period is not None]
+    return total_experience_years(periods, today)
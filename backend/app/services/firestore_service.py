@@ -1,102 +1,345 @@
+import asyncio
 import json
-import firebase_admin
-from firebase_admin import credentials, firestore
-from app.db.firebase_init import FirestoreClient
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.db.firebase_init import AsyncFirestoreClient, FirestoreClient, get_firebase_app
+from app.services.async_io_service import on_loop_reset, run_io
+from app.utils.metrics import stage
 import os
 
-_cached_skills = None
-db = FirestoreClient.get_instance()
+# Created on first use so importing the app neither loads the Firestore client
+# nor connects; tests replace it with a fake.
+db = None
+# The async client, used only on the I/O loop (async_io_service).
+async_db = None
 FIRESTORE_SKILLS_COLLECTION = os.getenv("FIRESTORE_SKILLS_COLLECTION", "skills")
+FIRESTORE_CV_CACHE_COLLECTION = os.getenv("FIRESTORE_CV_CACHE_COLLECTION", "cv_analysis_cache")
+FIRESTORE_CV_FEATURES_COLLECTION = os.getenv("FIRESTORE_CV_FEATURES_COLLECTION", "cv_features")
+FIRESTORE_FIRM_COLLECTION = os.getenv("FIRESTORE_FIRM_COLLECTION", "firms")
+FIRESTORE_APPLICATIONS_COLLECTION = os.getenv("FIRESTORE_APPLICATIONS_COLLECTION", "job_applications")
+SKILLS_CACHE_TTL = float(os.getenv("FLASK_SKILLS_CACHE_TTL", "300"))
+FIRESTORE_REST_URL = "https://firestore.googleapis.com/v1/projects/{project}/databases/(default)/documents/{collection}"
+# Firestore caps a batched write at 500 operations.
+FIRESTORE_BATCH_SIZE = 500
+FIRESTORE_WRITE_CONCURRENCY = int(os.getenv("FLASK_FIRESTORE_WRITE_CONCURRENCY", "4"))
+FIRESTORE_READ_CONCURRENCY = int(os.getenv("FLASK_FIRESTORE_READ_CONCURRENCY", "8"))
+
+SKILL_CATEGORIES = {
+    "programming_language": "programming_languages",
+    "framework": "frameworks",
+    "tool": "tools",
+    "certification": "certifications",
+}
+
+def get_db():
+    global db
+    if db is None:
+        db = FirestoreClient.get_instance()
+    return db
+
+def get_async_db():
+    global async_db
+    if async_db is None:
+        async_db = AsyncFirestoreClient.get_instance()
+    return async_db
+
+def reset_async_db():
+    global async_db
+    async_db = None
+    AsyncFirestoreClient.reset()
+
+on_loop_reset(reset_async_db)
+
+def reset_db():
+    global db
+    db = None
+    FirestoreClient.reset()
+    reset_async_db()
+
+async def _gather_limited(coros, limit):
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(run(coro) for coro in coros))
+
+# Replaced only on the I/O loop thread (see refresh_skill_catalog_async), so
+# reloads and invalidations are ordered without a lock.
+_catalog = None
+
+class SkillCatalog:
+    """
+    Snapshot of the skills collection, indexed by category and by name.
+    `version` is a hash of the contents, so every worker that loaded the same
+    skills agrees on it.
+    """
+
+    def __init__(self, skills, loaded_at):
+        self.by_category = {category: [] for category in SKILL_CATEGORIES.values()}
+        self.by_name = {}
+        # Lowercased alias -> canonical skill name. A skill's own name always wins
+        # over another skill's alias, and an alias claimed twice goes to the first
+        # skill by name.
+        self.aliases = {}
+
+        for skill in skills:
+            skill_name = skill.get("name", "").lower()
+            category = SKILL_CATEGORIES.get(skill.get("category"))
+            if category is not None:
+                self.by_category[category].append(skill_name)
+            self.by_name[skill_name] = skill.get("type", [])
+
+        for skill in sorted(skills, key=lambda s: s.get("name", "").lower()):
+            skill_name = skill.get("name", "").lower()
+            for alias in skill.get("aliases") or []:
+                alias = alias.lower()
+                if alias in self.by_name:
+                    continue
+                if self.aliases.setdefault(alias, skill_name) != skill_name:
+                    print(f"Alias '{alias}' of '{skill_name}' already belongs to '{self.aliases[alias]}', ignoring it.")
+
+        self.version = hashlib.sha1(
+            json.dumps(sorted(skills, key=lambda s: s.get("name", "")), sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        self.loaded_at = loaded_at
+
+    def is_fresh(self):
+        return time.monotonic() - self.loaded_at < SKILLS_CACHE_TTL
+
+async def load_skill_catalog_async():
+    with stage("skill_catalog"):
+        docs = get_async_db().collection(FIRESTORE_SKILLS_COLLECTION).stream()
+        return SkillCatalog([doc.to_dict() async for doc in docs], time.monotonic())
+
+def _from_rest_value(value):
+    if "mapValue" in value:
+        return {key: _from_rest_value(item) for key, item in value["mapValue"].get("fields", {}).items()}
+    if "arrayValue" in value:
+        return [_from_rest_value(item) for item in value["arrayValue"].get("values", [])]
+    if "integerValue" in value:
+        return int(value["integerValue"])
+    for key in ("stringValue", "booleanValue", "doubleValue", "timestampValue", "referenceValue"):
+        if key in value:
+            return value[key]
+    return None
+
+def load_skill_catalog_over_http():
+    """
+    The skill catalog read through Firestore's REST API, for the gunicorn
+    master: a gRPC client used before fork leaves state the workers cannot
+    use, while this HTTP session is simply closed.
+    """
+    from google.auth.transport.requests import AuthorizedSession
+
+    app = get_firebase_app()
+    if not app.project_id:
+        raise ValueError("Project ID is required to access Firestore.")
+    url = FIRESTORE_REST_URL.format(project=app.project_id, collection=FIRESTORE_SKILLS_COLLECTION)
+    session = AuthorizedSession(app.credential.get_credential())
+    skills = []
+    params = {"pageSize": 1000}
+    try:
+        with stage("skill_catalog"):
+            while True:
+                response = session.get(url, params=params, timeout=30)
+                response.raise_for_status()
+                body = response.json()
+                skills.extend(_from_rest_value({"mapValue": document}) for document in body.get("documents", []))
+                if not body.get("nextPageToken"):
+                    break
+                params["pageToken"] = body["nextPageToken"]
+    finally:
+        session.close()
+    return SkillCatalog(skills, time.monotonic())
+
+def preload_skill_catalog():
+    """
+    Install the catalog read over HTTP. Only for the gunicorn master before
+    fork, when no I/O loop runs that could replace it concurrently.
+    """
+    global _catalog
+    _catalog = load_skill_catalog_over_http()
+
+_catalog_task = None
+# Bumped by invalidate_skills_cache, so a reload that started before an upload is not installed.
+_catalog_generation = 0
+
+async def _reload_catalog():
+    global _catalog, _catalog_task
+    generation = _catalog_generation
+    try:
+        catalog = await load_skill_catalog_async()
+        if generation == _catalog_generation:
+            _catalog = catalog
+        return catalog
+    finally:
+        _catalog_task = None
+
+async def refresh_skill_catalog_async():
+    """
+    get_skill_catalog for the I/O loop. A stale catalog is reloaded through the
+    async client once, however many requests are waiting for it; a failed
+    reload keeps serving the cached catalog.
+    """
+    global _catalog_task
+    catalog = _catalog
+    if catalog is not None and catalog.is_fresh():
+        return catalog
+
+    if _catalog_task is None:
+        _catalog_task = asyncio.ensure_future(_reload_catalog())
+    try:
+        return await asyncio.shield(_catalog_task)
+    except Exception as e:
+        if _catalog is None:
+            raise
+        print(f"Error refreshing skill catalog, serving cached version: {e}")
+        return _catalog
+
+def get_skill_catalog():
+    catalog = _catalog
+    if catalog is not None and catalog.is_fresh():
+        return catalog
+    # A stale catalog is reloaded on the I/O loop, so the request joins the
+    # reload its auth prefetch already started instead of reading it again.
+    return run_io(refresh_skill_catalog_async())
+
+async def _invalidate_catalog():
+    global _catalog, _catalog_generation
+    _catalog = None
+    _catalog_generation += 1
+
+def invalidate_skills_cache():
+    run_io(_invalidate_catalog())
+
+def get_skills_version():
+    return get_skill_catalog().version
 
 def upload_skills(file):
+    """
+    Insert the uploaded skills that are not stored yet. A stored skill is only
+    updated when the upload brings aliases it does not have; they are added to
+    its existing ones.
+    """
     skills = json.loads(file)
+    collection_ref = get_db().collection(FIRESTORE_SKILLS_COLLECTION)
+
+    new_skills = {}
+    skipped = 0
     for skill in skills:
-        skill_name = skill['name']
-        doc_ref = db.collection(FIRESTORE_SKILLS_COLLECTION).document(skill_name)
-        
-        if doc_ref.get().exists:
-            print(f"Skill '{skill_name}' already exists, skipping.")
+        if skill['name'] in new_skills:
+            skipped += 1
         else:
-            doc_ref.set(skill)
-            print(f"Added skill: {skill_name}")
+            new_skills[skill['name']] = skill
+
+    alias_updates = {}
+    names = list(new_skills)
+    for i in range(0, len(names), FIRESTORE_BATCH_SIZE):
+        refs = [collection_ref.document(name) for name in names[i:i + FIRESTORE_BATCH_SIZE]]
+        for snapshot in get_db().get_all(refs):
+            if snapshot.exists:
+                stored_aliases = snapshot.to_dict().get("aliases") or []
+                added = [alias for alias in new_skills[snapshot.id].get("aliases") or [] if alias not in stored_aliases]
+                if added:
+                    alias_updates[snapshot.id] = {"aliases": stored_aliases + added}
+                else:
+                    skipped += 1
+                del new_skills[snapshot.id]
+
+    skills_to_insert = list(new_skills.values())
+    writes = [(skill['name'], skill, False) for skill in skills_to_insert]
+    writes += [(name, update, True) for name, update in alias_updates.items()]
+    batches = []
+    for i in range(0, len(writes), FIRESTORE_BATCH_SIZE):
+        batch = get_db().batch()
+        for name, data, merge in writes[i:i + FIRESTORE_BATCH_SIZE]:
+            batch.set(collection_ref.document(name), data, merge=merge)
+        batches.append(batch)
+
+    with ThreadPoolExecutor(max_workers=FIRESTORE_WRITE_CONCURRENCY) as executor:
+        list(executor.map(lambda batch: batch.commit(), batches))
+
+    print(f"Skills upload finished: {len(skills_to_insert)} added, {len(alias_updates)} given new aliases, {skipped} skipped.")
+    invalidate_skills_cache()
+
+    return {"inserted": len(skills_to_insert), "aliases_updated": len(alias_updates), "skipped": skipped}
 
 def get_programming_languages():
-    programming_languages = []
-    skills_ref = db.collection(FIRESTORE_SKILLS_COLLECTION)
-    docs = skills_ref.where("category", "==", "programming_language").get()
-    
-    for doc in docs:
-        programming_language = doc.to_dict()
-        programming_languages.append(programming_language.get("name", "").lower())
-    
-    return programming_languages
+    return list(get_skill_catalog().by_category["programming_languages"])
 
 def get_frameworks():
-    frameworks = []
-    skills_ref = db.collection(FIRESTORE_SKILLS_COLLECTION)
-    docs = skills_ref.where("category", "==", "framework").get()
-    
-    for doc in docs:
-        framework = doc.to_dict()
-        frameworks.append(framework.get("name", "").lower())
-    
-    return frameworks
+    return list(get_skill_catalog().by_category["frameworks"])
 
 def get_tools():
-    tools = []
-    skills_ref = db.collection(FIRESTORE_SKILLS_COLLECTION)
-    docs = skills_ref.where("category", "==", "tool").get()
-    
-    for doc in docs:
-        tool = doc.to_dict()
-        tools.append(tool.get("name", "").lower())
-    
-    return tools
+    return list(get_skill_catalog().by_category["tools"])
 
 def get_certifications():
-    certifications = []
-    skills_ref = db.collection(FIRESTORE_SKILLS_COLLECTION)
-    docs = skills_ref.where("category", "==", "certification").get()
-    
-    for doc in docs:
-        certification = doc.to_dict()
-        certifications.append(certification.get("name", "").lower())
-    
-    return certifications
+    return list(get_skill_catalog().by_category["certifications"])
 
 def get_all_skills():
+    return get_skill_catalog().by_name
 
-    skills = {}
-    skills_ref = db.collection(FIRESTORE_SKILLS_COLLECTION)
-    docs = skills_ref.stream() 
+def get_skill_aliases():
+    return dict(get_skill_catalog().aliases)
 
-    for doc in docs:
-        skill = doc.to_dict()
-        skill_name = skill.get("name", "").lower() 
-        skill_types = skill.get("type", []) 
-        skills[skill_name] = skill_types
+def get_types_of_skill(skill_name):
+    return get_skill_catalog().by_name.get(skill_name, [])
 
-    return skills
+def is_firm_account(uid):
+    snapshot = get_db().collection(FIRESTORE_FIRM_COLLECTION).document(uid).get()
+    return snapshot.exists and snapshot.to_dict().get("is_firm") is True
 
-def get_all_skills():
-    skills = {}
-    skills_ref = db.collection(FIRESTORE_SKILLS_COLLECTION)
-    docs = skills_ref.stream() 
+def get_job_applications(application_ids):
+    """
+    Job application documents for the given ids, as {application_id: document}.
+    Ids without a document are left out.
+    """
+    collection_ref = get_db().collection(FIRESTORE_APPLICATIONS_COLLECTION)
+    application_ids = list(dict.fromkeys(application_ids))
+    applications = {}
+    for i in range(0, len(application_ids), FIRESTORE_BATCH_SIZE):
+        refs = [collection_ref.document(application_id) for application_id in application_ids[i:i + FIRESTORE_BATCH_SIZE]]
+        for snapshot in get_db().get_all(refs):
+            if snapshot.exists:
+                applications[snapshot.id] = snapshot.to_dict()
+    return applications
 
-    for doc in docs:
-        skill = doc.to_dict()
-        skill_name = skill.get("name", "").lower()
-        skill_types = skill.get("type", [])  
-        skills[skill_name] = skill_types
+def get_cv_cache_entry(key):
+    snapshot = get_db().collection(FIRESTORE_CV_CACHE_COLLECTION).document(key).get()
+    return snapshot.to_dict() if snapshot.exists else None
 
-    return skills
+def set_cv_cache_entry(key, value):
+    get_db().collection(FIRESTORE_CV_CACHE_COLLECTION).document(key).set(value)
 
-def get_all_skills_cached():
-    global _cached_skills
-    if _cached_skills is None:
-        _cached_skills = get_all_skills()
-    return _cached_skills
+async def get_cv_features_async(cv_ids):
+    """
+    Stored feature records for the given CV ids, as {cv_id: record}. Chunks of
+    FIRESTORE_BATCH_SIZE ids are read concurrently. Ids without a record are
+    left out.
+    """
+    collection_ref = get_async_db().collection(FIRESTORE_CV_FEATURES_COLLECTION)
+    cv_ids = list(dict.fromkeys(cv_ids))
 
-def get_types_of_skill(skill_name):
-    all_skills = get_all_skills_cached()
-    return all_skills.get(skill_name, [])
\ No newline at end of file
+    async def read_chunk(chunk):
+        refs = [collection_ref.document(cv_id) for cv_id in chunk]
+        return [snapshot async for snapshot in get_async_db().get_all(refs)]
+
+    chunks = await _gather_limited(
+        (read_chunk(cv_ids[i:i + FIRESTORE_BATCH_SIZE]) for i in range(0, len(cv_ids), FIRESTORE_BATCH_SIZE)),
+        FIRESTORE_READ_CONCURRENCY,
+    )
+    return {snapshot.id: snapshot.to_dict() for chunk in chunks for snapshot in chunk if snapshot.exists}
+
+async def set_cv_features_async(features_by_id):
+    collection_ref = get_async_db().collection(FIRESTORE_CV_FEATURES_COLLECTION)
+    items = list(features_by_id.items())
+    batches = []
+    for i in range(0, len(items), FIRESTORE_BATCH_SIZE):
+        batch = get_async_db().batch()
+        for cv_id, features in items[i:i + FIRESTORE_BATCH_SIZE]:
+            batch.set(collection_ref.document(cv_id), features)
+        batches.append(batch)
+    await _gather_limited((batch.commit() for batch in batches), FIRESTORE_WRITE_CONCURRENCY)
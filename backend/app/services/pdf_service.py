@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+
+PDF_BACKENDS = ("pdfplumber", "pdfium")
+# "pdfplumber" runs layout analysis on every page; "pdfium" reads the text layer directly and is much faster.
+PDF_BACKEND = os.getenv("FLASK_PDF_BACKEND", "pdfplumber")
+# Extraction stops after this many pages or once this many characters have been read.
+PDF_MAX_PAGES = int(os.getenv("FLASK_PDF_MAX_PAGES", "30"))
+PDF_MAX_CHARS = int(os.getenv("FLASK_PDF_MAX_CHARS", "200000"))
+
+# The PDF header may be preceded by up to this many bytes of junk.
+PDF_HEADER_WINDOW = 1024
+
+class PDFParseTimeout(Exception):
+    pass
+
+# PDFium is not thread-safe, so calls into it are serialised within a process.
+_pdfium_lock = threading.Lock()
+
+def load_pdf_backends():
+    """
+    Import the PDF libraries, which are otherwise loaded on first use.
+    """
+    import pdfplumber
+    import pypdfium2
+
+def _pdfplumber_pages(file, max_pages):
+    import pdfplumber
+
+    with pdfplumber.open(file, pages=range(1, max_pages + 1) if max_pages else None) as pdf:
+        for page in pdf.pages:
+            yield page.extract_text()
+            page.close()
+
+def _pdfium_pages(file, max_pages):
+    import pypdfium2
+
+    with _pdfium_lock:
+        pdf = pypdfium2.PdfDocument(file)
+    try:
+        page_count = min(len(pdf), max_pages) if max_pages else len(pdf)
+        for index in range(page_count):
+            with _pdfium_lock:
+                page = pdf[index]
+                textpage = page.get_textpage()
+                text = textpage.get_text_range(force_this=True)
+                textpage.close()
+                page.close()
+            yield text.replace("\r\n", "\n").replace("\r", "\n")
+    finally:
+        with _pdfium_lock:
+            pdf.close()
+
+def is_pdf(head):
+    """
+    Cheap check on the first bytes of an upload, before any parsing.
+    """
+    return b"%PDF-" in head[:PDF_HEADER_WINDOW]
+
+def count_pdf_pages(file):
+    """
+    Page count from the document catalog without parsing any page content.
+    `file` is the PDF bytes or a seekable binary file, which is left open.
+    Raises ValueError for files PDFium cannot open.
+    """
+    import pypdfium2
+
+    with _pdfium_lock:
+        try:
+            pdf = pypdfium2.PdfDocument(file)
+        except pypdfium2.PdfiumError as e:
+            raise ValueError(f"Invalid PDF: {e}") from e
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+def iter_pdf_pages(file, backend=None, max_pages=None):
+    """
+    Yield the text of each page in order. Pages without a text layer
+    (scanned images) yield an empty string.
+    """
+    backend = backend or PDF_BACKEND
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend '{backend}', expected one of {PDF_BACKENDS}")
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+
+    pages = _pdfium_pages(file, max_pages) if backend == "pdfium" else _pdfplumber_pages(file, max_pages)
+    try:
+        for text in pages:
+            yield text or ""
+    finally:
+        pages.close()
+
+def extract_text_from_pdf(file, backend=None, max_pages=None, max_chars=None, deadline=None):
+    """
+    Return the text of the PDF with pages separated by newlines, reading at most
+    `max_pages` pages and `max_chars` characters (0 disables a cap). Raises
+    PDFParseTimeout once `time.monotonic()` passes `deadline`, checked between pages.
+    """
+    max_chars = PDF_MAX_CHARS if max_chars is None else max_chars
+    parts = []
+    length = 0
+    pages = iter_pdf_pages(file, backend, max_pages)
+    try:
+        for text in pages:
+            if deadline is not None and time.monotonic() > deadline:
+                raise PDFParseTimeout("PDF text extraction timed out")
+            parts.append(text)
+            length += len(text) + 1
+            if max_chars and length >= max_chars:
+                break
+    finally:
+        pages.close()
+
+    text = "\n".join(parts)
+    return text[:max_chars] if max_chars else text
@@ -0,0 +1,214 @@
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+
+# Analysed CVs kept in memory for re-ranking; the oldest are evicted beyond this.
+CANDIDATE_STORE_SIZE = int(os.getenv("FLASK_CANDIDATE_STORE_SIZE", "20000"))
+
+# Weight of a matched skill per category, shared with cv_service.score_skills.
+CATEGORY_WEIGHTS = {
+    "certifications": 4,
+    "programming_languages": 3,
+    "frameworks": 2,
+    "tools": 1,
+}
+
+# Score thresholds for the match message, highest first.
+MATCH_MESSAGES = (
+    (80, "Excellent match"),
+    (60, "Good match"),
+    (40, "Average match"),
+    (20, "Below average match"),
+)
+
+class CandidateMatrix:
+    """
+    Analysed CVs stored as rows of a bitset over (category, skill) ids, so a
+    job can be scored against every stored candidate with a few NumPy array
+    operations. Scores are identical to cv_service.score_skills.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._skill_ids = {}
+        self._rows = OrderedDict()
+        self._ids = []
+        self._names = []
+        self._versions = []
+        self._bits = np.zeros((0, 1), dtype=np.uint64)
+        self._years = np.zeros(0, dtype=np.float64)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, cv_id):
+        return cv_id in self._rows
+
+    def _skill_id(self, category, skill):
+        # Called with self._lock held: ids are bit positions shared by every row.
+        key = (category, skill)
+        skill_id = self._skill_ids.get(key)
+        if skill_id is None:
+            skill_id = self._skill_ids[key] = len(self._skill_ids)
+        return skill_id
+
+    def _ensure_capacity(self, rows, words):
+        capacity, width = self._bits.shape
+        if rows <= capacity and words <= width:
+            return
+        # Rows and words grow independently, each doubling only when it is short.
+        new_capacity = capacity if rows <= capacity else max(rows, capacity * 2, 64)
+        new_width = width if words <= width else max(words, width * 2)
+        grown = np.zeros((new_capacity, new_width), dtype=np.uint64)
+        grown[:capacity, :width] = self._bits
+        self._bits = grown
+        years = np.zeros(grown.shape[0], dtype=np.float64)
+        years[:capacity] = self._years
+        self._years = years
+
+    def add(self, cv_id, analysis, skills_version=None):
+        with self._lock:
+            skill_ids = [
+                self._skill_id(category, skill)
+                for category, skills in analysis.skills.items()
+                for skill in skills
+            ]
+            row_bits = np.zeros(max(skill_ids, default=0) // 64 + 1, dtype=np.uint64)
+            for skill_id in skill_ids:
+                row_bits[skill_id // 64] |= np.uint64(1 << (skill_id % 64))
+
+            row = self._rows.get(cv_id)
+            if row is None:
+                if len(self._rows) >= self.max_size:
+                    row = self._evict_oldest()
+                else:
+                    row = len(self._rows)
+                self._ensure_capacity(row + 1, len(row_bits))
+                if row == len(self._ids):
+                    self._ids.append(cv_id)
+                    self._names.append(analysis.candidate_name)
+                    self._versions.append(skills_version)
+                else:
+                    self._ids[row] = cv_id
+                    self._names[row] = analysis.candidate_name
+                    self._versions[row] = skills_version
+            else:
+                self._ensure_capacity(row + 1, len(row_bits))
+                self._names[row] = analysis.candidate_name
+                self._versions[row] = skills_version
+                self._rows.move_to_end(cv_id)
+            self._rows[cv_id] = row
+
+            self._bits[row] = 0
+            self._bits[row, :len(row_bits)] = row_bits
+            years = analysis.experience_years
+            self._years[row] = np.nan if years is None else years
+
+    def outdated(self, cv_ids, skills_version):
+        """
+        The ids among `cv_ids` that are not stored, or were stored with skills
+        matched against another vocabulary version.
+        """
+        with self._lock:
+            return [
+                cv_id for cv_id in dict.fromkeys(cv_ids)
+                if cv_id not in self._rows or self._versions[self._rows[cv_id]] != skills_version
+            ]
+
+    def _evict_oldest(self):
+        # The freed row is reused by the caller for the new candidate.
+        _, row = self._rows.popitem(last=False)
+        return row
+
+    def _job_masks(self, job_profile):
+        width = self._bits.shape[1]
+        masks = []
+        for category, required_skills in job_profile.required_skills.items():
+            mask = np.zeros(width, dtype=np.uint64)
+            for skill in required_skills:
+                skill_id = self._skill_ids.get((category, skill))
+                if skill_id is not None:
+                    mask[skill_id // 64] |= np.uint64(1 << (skill_id % 64))
+            if mask.any():
+                masks.append((CATEGORY_WEIGHTS.get(category, 1), mask))
+        return masks
+
+    def rank(self, job_profile, cv_ids=None, limit=None):
+        """
+        Score the stored candidates (or only `cv_ids`) against a JobProfile.
+        Returns (the `limit` best results ordered by score, ids that are not stored).
+        """
+        with self._lock:
+            if cv_ids is None:
+                ids = list(self._rows)
+                missing = []
+            else:
+                ids = [cv_id for cv_id in dict.fromkeys(cv_ids) if cv_id in self._rows]
+                missing = [cv_id for cv_id in dict.fromkeys(cv_ids) if cv_id not in self._rows]
+            rows = np.fromiter((self._rows[cv_id] for cv_id in ids), dtype=np.intp, count=len(ids))
+            bits = self._bits[rows]
+            years = self._years[rows]
+            names = self._names[:]
+            masks = self._job_masks(job_profile)
+
+        scores, message_codes = score_matrix(bits, years, masks, job_profile)
+        scores = round_scores(scores)
+        order = np.argsort(-scores, kind="stable")[:limit]
+
+        rows, years, scores, message_codes = rows.tolist(), years.tolist(), scores.tolist(), message_codes.tolist()
+        results = [
+            {
+                "cv_id": ids[i],
+                "candidate_name": names[rows[i]],
+                "score": scores[i],
+                "message": MESSAGES[message_codes[i]],
+                "experience_years": None if years[i] != years[i] else years[i],
+                "rank": rank,
+            }
+            for rank, i in enumerate(order.tolist(), start=1)
+        ]
+        return results, missing
+
+# Every combination of match message and experience warning, indexed by the codes from score_matrix.
+MESSAGES = [message for _, message in MATCH_MESSAGES] + [""]
+MESSAGES += [message + ", but insufficient experience!" for message in MESSAGES]
+
+def round_scores(scores):
+    """
+    Python's round(score, 2) for every score. np.round can differ in the last
+    digit, so the distinct values are rounded in Python and scattered back.
+    """
+    unique, inverse = np.unique(scores, return_inverse=True)
+    return np.array([round(score, 2) for score in unique.tolist()], dtype=np.float64)[inverse]
+
+def score_matrix(bits, years, masks, job_profile):
+    """
+    Unrounded final scores and message codes (indices into MESSAGES) for every
+    row, following score_skills: the same float operations in the same order.
+    """
+    matched = np.zeros(len(bits), dtype=np.int64)
+    for weight, mask in masks:
+        matched += weight * np.bitwise_count(bits & mask).sum(axis=1, dtype=np.int64)
+
+    total = job_profile.total_weighted_required_skills
+    if total == 0:
+        skill_scores = np.full(len(bits), 100.0)
+    else:
+        skill_scores = (matched / total) * 100
+
+    min_required_years = job_profile.min_required_years
+    multipliers = np.ones(len(bits))
+    short = ~np.isnan(years) & (years < min_required_years)
+    if short.any():
+        multipliers[short] = np.maximum(0.5, years[short] / min_required_years)
+
+    message_codes = np.full(len(bits), len(MATCH_MESSAGES), dtype=np.intp)
+    for code in range(len(MATCH_MESSAGES) - 1, -1, -1):
+        message_codes[skill_scores >= MATCH_MESSAGES[code][0]] = code
+    message_codes[multipliers <= 0.5] += len(MATCH_MESSAGES) + 1
+
+    return skill_scores * multipliers, message_codes
+
+candidate_store = CandidateMatrix(CANDIDATE_STORE_SIZE)
@@ -0,0 +1,109 @@
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+
+REPORT_WORKERS = int(os.getenv("FLASK_REPORT_WORKERS", "2"))
+# Reports waiting or rendering at once; submissions beyond this are rejected.
+REPORT_QUEUE_SIZE = int(os.getenv("FLASK_REPORT_QUEUE_SIZE", "32"))
+# Finished jobs kept in memory for the status endpoint.
+REPORT_JOBS_RETAINED = int(os.getenv("FLASK_REPORT_JOBS_RETAINED", "1000"))
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(REPORT_QUEUE_SIZE)
+_jobs = OrderedDict()
+_jobs_lock = threading.Lock()
+_stats = {"submitted": 0, "rejected": 0, "completed": 0, "failed": 0, "in_flight": 0}
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=REPORT_WORKERS, thread_name_prefix="cv-report")
+    return _executor
+
+def _set_job(job_id, job):
+    with _jobs_lock:
+        _jobs[job_id] = job
+        _jobs.move_to_end(job_id)
+        while len(_jobs) > REPORT_JOBS_RETAINED:
+            _jobs.popitem(last=False)
+
+def _finish_job(job_id, url=None, error=None):
+    try:
+        if error is None:
+            _set_job(job_id, {"status": "ready", "cv_report_url": url})
+            outcome = "completed"
+        else:
+            print(f"Error generating CV report {job_id}: {error}")
+            _set_job(job_id, {"status": "failed", "cv_report_url": None})
+            outcome = "failed"
+    finally:
+        _slots.release()
+
+    with _jobs_lock:
+        _stats[outcome] += 1
+        _stats["in_flight"] -= 1
+
+def _finish_future(job_id, future):
+    try:
+        url = future.result()
+    except BaseException as e:
+        _finish_job(job_id, error=e)
+        return
+    _finish_job(job_id, url)
+
+def _run_job(job_id, task, args):
+    try:
+        result = task(job_id, *args)
+    except Exception as e:
+        _finish_job(job_id, error=e)
+        return
+
+    if isinstance(result, Future):
+        # The upload was handed to the I/O loop; the job keeps its queue slot
+        # until it completes, but this thread can render the next report.
+        result.add_done_callback(partial(_finish_future, job_id))
+    else:
+        _finish_job(job_id, result)
+
+def submit_report_job(task, *args):
+    """
+    Run `task(job_id, *args)` on the report executor and return the job id,
+    or None if the queue is full. `task` must return the report URL, or a
+    concurrent.futures.Future of it.
+    """
+    if not _slots.acquire(blocking=False):
+        with _jobs_lock:
+            _stats["rejected"] += 1
+        print("CV report queue is full, skipping report generation.")
+        return None
+
+    job_id = str(uuid.uuid4())
+    _set_job(job_id, {"status": "pending", "cv_report_url": None})
+    with _jobs_lock:
+        _stats["submitted"] += 1
+        _stats["in_flight"] += 1
+
+    try:
+        _get_executor().submit(_run_job, job_id, task, args)
+    except Exception:
+        _slots.release()
+        with _jobs_lock:
+            _stats["in_flight"] -= 1
+        _set_job(job_id, {"status": "failed", "cv_report_url": None})
+        raise
+    return job_id
+
+def get_report_job(job_id):
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        return dict(job) if job else None
+
+def get_report_queue_stats():
+    with _jobs_lock:
+        return {**_stats, "capacity": REPORT_QUEUE_SIZE, "workers": REPORT_WORKERS}
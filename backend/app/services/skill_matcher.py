@@ -0,0 +1,247 @@
+import os
+import re
+import threading
+
+SPACY_MODEL = os.getenv("FLASK_SPACY_MODEL", "en_core_web_sm")
+
+# "pipeline" runs every component of SPACY_MODEL (the original behaviour),
+# "tokenizer" loads SPACY_MODEL but only tokenizes, "blank" uses spacy.blank("en").
+# The matcher only compares LOWER, so all three produce the same matches.
+# "trie" needs no spaCy model: see TrieSkillMatcher.
+MATCHER_MODES = ("pipeline", "tokenizer", "blank", "trie")
+MATCHER_MODE = os.getenv("FLASK_SKILL_MATCHER_MODE", "tokenizer")
+
+SKILL_LABELS = {
+    "programming_languages": "PROGRAMMING_LANGUAGES",
+    "frameworks": "FRAMEWORKS",
+    "tools": "TOOLS",
+    "certifications": "CERTIFICATIONS",
+}
+
+# Tokens for the "trie" mode: a word that may contain inner dots ("node.js", "3.5"), start
+# with a dot (".net") and end in "+" or "#" ("c++", "c#"). Any other non-space character
+# is a token of its own, so "ci/cd" and "full-stack" split the way spaCy splits them.
+TOKEN_PATTERN = re.compile(r"\.?\w+(?:\.\w+)*[+#]*|\S")
+# Ends every token in trie keys, so a key can only match whole tokens.
+TOKEN_SEPARATOR = "\x1f"
+
+class TrieSkillMatcher:
+    """
+    The skill vocabulary compiled into a marisa-trie of lowercased token
+    sequences. A text is tokenized with TOKEN_PATTERN and scanned once: at every
+    token the trie yields each skill that starts there and ends on a token
+    boundary. Building it tokenizes skills with a regex instead of spaCy, and
+    matches are reported with the skill's name from the vocabulary.
+    """
+
+    def __init__(self, vocabulary):
+        import marisa_trie
+
+        entries = {}
+        for category in SKILL_LABELS:
+            for skill in vocabulary.get(category, []):
+                key = self.make_key(skill)
+                if key:
+                    name, categories = entries.setdefault(key, (skill.lower(), set()))
+                    categories.add(category)
+
+        # An alias is one more key for its canonical skill, so it costs nothing per text.
+        canonical_entries = {name: categories for name, categories in entries.values()}
+        for alias, canonical in vocabulary.get("aliases", {}).items():
+            key = self.make_key(alias)
+            if key and key not in entries and canonical in canonical_entries:
+                entries[key] = (canonical, canonical_entries[canonical])
+
+        self._trie = marisa_trie.Trie(entries)
+        self._entries = [None] * len(self._trie)
+        for key, key_id in self._trie.items():
+            name, categories = entries[key]
+            self._entries[key_id] = (name, tuple(categories))
+        self._max_key_length = max(map(len, entries), default=0)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(text):
+        return "".join(token + TOKEN_SEPARATOR for token in TOKEN_PATTERN.findall(text.lower()))
+
+    def match(self, text):
+        extracted = {category: set() for category in SKILL_LABELS}
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        key = TOKEN_SEPARATOR.join(tokens) + TOKEN_SEPARATOR
+        iter_prefixes = self._trie.iter_prefixes_with_ids
+        entries = self._entries
+        max_length = self._max_key_length
+
+        start = 0
+        for token in tokens:
+            for _, key_id in iter_prefixes(key[start:start + max_length]):
+                name, categories = entries[key_id]
+                for category in categories:
+                    extracted[category].add(name)
+            start += len(token) + 1
+
+        return {category: list(skills) for category, skills in extracted.items()}
+
+class SkillMatcher:
+    """
+    Process-wide spaCy pipeline and compiled PhraseMatcher (a TrieSkillMatcher
+    in "trie" mode).
+    The model is loaded once per worker; the matcher is rebuilt only when
+    the skill vocabulary version changes.
+    """
+    _mode = MATCHER_MODE
+    _nlp = None
+    _matcher = None
+    _version = None
+    _lock = threading.RLock()
+
+    @staticmethod
+    def configure(mode):
+        if mode not in MATCHER_MODES:
+            raise ValueError(f"Unknown skill matcher mode '{mode}', expected one of {MATCHER_MODES}.")
+        with SkillMatcher._lock:
+            SkillMatcher._mode = mode
+            SkillMatcher._nlp = None
+            SkillMatcher._matcher = None
+            SkillMatcher._version = None
+
+    @staticmethod
+    def get_mode():
+        return SkillMatcher._mode
+
+    @staticmethod
+    def uses_spacy():
+        return SkillMatcher._mode != "trie"
+
+    @staticmethod
+    def get_nlp():
+        if SkillMatcher._nlp is None:
+            with SkillMatcher._lock:
+                if SkillMatcher._nlp is None:
+                    # spaCy takes a large share of the app's import time, so it is loaded here.
+                    import spacy
+                    if SkillMatcher._mode == "blank":
+                        SkillMatcher._nlp = spacy.blank("en")
+                    else:
+                        SkillMatcher._nlp = spacy.load(SPACY_MODEL)
+        return SkillMatcher._nlp
+
+    @staticmethod
+    def make_doc(text):
+        nlp = SkillMatcher.get_nlp()
+        if SkillMatcher._mode == "pipeline":
+            return nlp(text)
+        return nlp.make_doc(text)
+
+    @staticmethod
+    def make_docs(texts, batch_size=64):
+        nlp = SkillMatcher.get_nlp()
+        if SkillMatcher._mode == "pipeline":
+            return nlp.pipe(texts, batch_size=batch_size)
+        return nlp.tokenizer.pipe(texts, batch_size=batch_size)
+
+    @staticmethod
+    def make_patterns(skills):
+        nlp = SkillMatcher.get_nlp()
+        if SkillMatcher._mode == "pipeline":
+            return [nlp(skill) for skill in skills]
+        return list(nlp.tokenizer.pipe(skills))
+
+    @staticmethod
+    def add_alias_patterns(matcher, vocabulary):
+        """
+        Add the aliases in `vocabulary["aliases"]` (alias -> canonical name) to
+        the PhraseMatcher under "<LABEL>|<canonical name>", which collect_skills
+        reports as the canonical skill.
+        """
+        aliases_by_skill = {}
+        for alias, canonical in vocabulary.get("aliases", {}).items():
+            aliases_by_skill.setdefault(canonical, []).append(alias)
+        for category, label in SKILL_LABELS.items():
+            for skill in vocabulary.get(category, []):
+                aliases = aliases_by_skill.get(skill.lower())
+                if aliases:
+                    matcher.add(f"{label}|{skill.lower()}", SkillMatcher.make_patterns(aliases))
+
+    @staticmethod
+    def get_matcher(version, load_vocabulary):
+        """
+        Return the matcher compiled for `version`, building it with
+        `load_vocabulary()` (a dict of category -> skill names) if needed.
+        """
+        matcher = SkillMatcher._matcher
+        if matcher is not None and SkillMatcher._version == version:
+            return matcher
+
+        with SkillMatcher._lock:
+            if SkillMatcher._matcher is None or SkillMatcher._version != version:
+                vocabulary = load_vocabulary()
+                if SkillMatcher._mode == "trie":
+                    matcher = TrieSkillMatcher(vocabulary)
+                else:
+                    from spacy.matcher import PhraseMatcher
+                    matcher = PhraseMatcher(SkillMatcher.get_nlp().vocab, attr="LOWER")
+                    for category, label in SKILL_LABELS.items():
+                        matcher.add(label, SkillMatcher.make_patterns(vocabulary.get(category, [])))
+                    SkillMatcher.add_alias_patterns(matcher, vocabulary)
+                SkillMatcher._matcher = matcher
+                SkillMatcher._version = version
+            return SkillMatcher._matcher
+
+    @staticmethod
+    def get_version():
+        return SkillMatcher._version if SkillMatcher._matcher is not None else None
+
+    @staticmethod
+    def invalidate():
+        with SkillMatcher._lock:
+            SkillMatcher._matcher = None
+            SkillMatcher._version = None
+
+def collect_skills(doc, matches):
+    labels = SkillMatcher.get_nlp().vocab.strings
+
+    extracted_programming_languages = set()
+    extracted_frameworks = set()
+    extracted_tools = set()
+    extracted_certifications = set()
+
+    for match_id, start, end in matches:
+        label, _, canonical = labels[match_id].partition("|")
+        skill = canonical or doc[start:end].text
+
+        if label == "PROGRAMMING_LANGUAGES":
+            extracted_programming_languages.add(skill)
+        elif label == "FRAMEWORKS":
+            extracted_frameworks.add(skill)
+        elif label == "TOOLS":
+            extracted_tools.add(skill)
+        elif label == "CERTIFICATIONS":
+            extracted_certifications.add(skill)
+
+    return {
+        "programming_languages": list(extracted_programming_languages),
+        "frameworks": list(extracted_frameworks),
+        "tools": list(extracted_tools),
+        "certifications": list(extracted_certifications),
+    }
+
+def match_skills(text, version, load_vocabulary):
+    matcher = SkillMatcher.get_matcher(version, load_vocabulary)
+    if isinstance(matcher, TrieSkillMatcher):
+        return matcher.match(text)
+
+    doc = SkillMatcher.make_doc(text.lower())
+
+    return collect_skills(doc, matcher(doc))
+
+def match_skills_batch(texts, version, load_vocabulary):
+    matcher = SkillMatcher.get_matcher(version, load_vocabulary)
+    if isinstance(matcher, TrieSkillMatcher):
+        return [matcher.match(text) for text in texts]
+
+    docs = SkillMatcher.make_docs(text.lower() for text in texts)
+
+    return [collect_skills(doc, matcher(doc)) for doc in docs]
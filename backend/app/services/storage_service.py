@@ -1,23 +1,35 @@
-from google.cloud import storage
-# Nu mai importăm FIREBASE_KEY_PATH
+from app.db.storage_init import StorageClient
+import asyncio
+import os
 
-def upload_to_google_storage(file_path: str, bucket_name: str, destination_blob_name: str):
-    try:
-        storage_client = storage.Client()
-
-        bucket = storage_client.bucket(bucket_name)
+# "publicRead" makes the report public as part of the upload request. Set it to an
+# empty string for buckets with uniform bucket-level access that are public via IAM.
+GCS_PREDEFINED_ACL = os.getenv("FLASK_GCS_PREDEFINED_ACL", "publicRead") or None
 
-        if not bucket.exists():
-            raise ValueError(f"Bucket '{bucket_name}' does not exist.")
+def upload_to_google_storage(data: bytes, bucket_name: str, destination_blob_name: str, content_type: str = "application/pdf"):
+    try:
+        bucket = StorageClient.get_bucket(bucket_name)
 
         blob = bucket.blob(destination_blob_name)
 
-        blob.upload_from_filename(file_path)
-
-        blob.make_public()
+        blob.upload_from_string(data, content_type=content_type, predefined_acl=GCS_PREDEFINED_ACL)
 
-        print(f"File {file_path} uploaded to {destination_blob_name} in bucket {bucket_name}.")
+        print(f"File uploaded to {destination_blob_name} in bucket {bucket_name}.")
         return blob.public_url
     except Exception as e:
         print(f"Error uploading file to Google Cloud Storage: {e}")
-        raise
\ No newline at end of file
+        raise
+
+async def upload_to_google_storage_async(data: bytes, bucket_name: str, destination_blob_name: str, content_type: str = "application/pdf"):
+    """
+    upload_to_google_storage for the I/O loop. google-cloud-storage has no async
+    API, so the upload runs on the loop's thread pool.
+    """
+    return await asyncio.to_thread(upload_to_google_storage, data, bucket_name, destination_blob_name, content_type)
+
+def get_public_url_if_exists(bucket_name: str, blob_name: str):
+    blob = StorageClient.get_bucket(bucket_name).blob(blob_name)
+    return blob.public_url if blob.exists() else None
+
+def download_from_google_storage(bucket_name: str, blob_name: str):
+    return StorageClient.get_bucket(bucket_name).blob(blob_name).download_as_bytes()
@@ -0,0 +1,86 @@
+import heapq
+import json
+import os
+import threading
+
+SUGGESTIONS_DIR = os.getenv("FLASK_SUGGESTIONS_DIR", "skills")
+SUGGESTION_FILES = {
+    "career_paths": "career_paths_suggestions.json",
+    "improvement": "improvement_suggestions.json",
+}
+
+class SuggestionIndex:
+    """
+    Suggestions from one JSON file, indexed by skill type. Each entry of the
+    file is `{"<title>": {"types": [...], "message": "..."}}`; entries whose
+    types include "any" are offered even without a matching type.
+    """
+
+    def __init__(self, suggestions):
+        self.entries = []
+        self.by_type = {}
+        self.always = []
+        for title, info in suggestions.items():
+            index = len(self.entries)
+            required_types = info.get("types", [])
+            self.entries.append((title, info.get("message", "")))
+            for skill_type in set(required_types):
+                self.by_type.setdefault(skill_type, []).append((index, required_types.count(skill_type)))
+            if "any" in required_types:
+                self.always.append(index)
+
+    def top(self, type_counts, k):
+        """
+        The `k` best (title, match_score, message) by score, in file order on ties.
+        Only suggestions sharing a type with the candidate are scored.
+        """
+        scores = {}
+        for skill_type, count in type_counts.items():
+            for index, weight in self.by_type.get(skill_type, ()):
+                scores[index] = scores.get(index, 0) + count * weight
+        for index in self.always:
+            scores.setdefault(index, 0)
+
+        best = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(self.entries[index][0], score, self.entries[index][1]) for index, score in best]
+
+_indexes = {}
+_index_lock = threading.Lock()
+
+def _file_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def get_suggestion_index(kind):
+    """
+    Index for one suggestion file, rebuilt when the file changes on disk.
+    A missing or invalid file gives an empty index.
+    """
+    path = os.path.join(SUGGESTIONS_DIR, SUGGESTION_FILES[kind])
+    signature = _file_signature(path)
+    cached = _indexes.get(kind)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with _index_lock:
+        cached = _indexes.get(kind)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        try:
+            with open(path, "r") as file:
+                index = SuggestionIndex(json.load(file))
+        except (OSError, ValueError) as e:
+            print(f"Error loading suggestions from {path}: {e}")
+            index = SuggestionIndex({})
+        _indexes[kind] = (signature, index)
+        return index
+
+def load_suggestions():
+    """
+    Build every suggestion index ahead of the first report.
+    """
+    for kind in SUGGESTION_FILES:
+        get_suggestion_index(kind)
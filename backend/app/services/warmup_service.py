@@ -0,0 +1,58 @@
+import os
+import threading
+import time
+from app.db.storage_init import StorageClient
+from app.services.cv_executor import start_cv_executor
+from app.services.cv_service import load_skill_vocabulary
+from app.services.firestore_service import get_db, get_skill_catalog, get_skills_version
+from app.services.pdf_service import load_pdf_backends
+from app.services.skill_matcher import SkillMatcher
+from app.services.suggestion_service import load_suggestions
+
+_lock = threading.Lock()
+_completed = {}
+
+def _load_report_bucket():
+    bucket_name = os.getenv("FLASK_FIREBASE_STORAGE_BUCKET")
+    if bucket_name:
+        StorageClient.get_bucket(bucket_name)
+
+# Run in order; the matcher needs the catalog and the model.
+WARMUP_STEPS = [
+    ("firestore", get_db),
+    ("skill_catalog", get_skill_catalog),
+    ("spacy_model", lambda: SkillMatcher.uses_spacy() and SkillMatcher.get_nlp()),
+    ("skill_matcher", lambda: SkillMatcher.get_matcher(get_skills_version(), load_skill_vocabulary)),
+    ("pdf_backends", load_pdf_backends),
+    ("report_bucket", _load_report_bucket),
+    ("cv_executor", start_cv_executor),
+    ("suggestions", load_suggestions),
+]
+
+# Steps whose results can be shared with forked workers: plain data and models,
+# no threads, processes or open connections (see gunicorn.conf.py). The master
+# loads the catalog with firestore_service.preload_skill_catalog instead of the
+# gRPC client, so the matcher step finds it there.
+PRELOAD_STEPS = ("spacy_model", "skill_matcher", "pdf_backends", "suggestions")
+
+def warm_up(only=None):
+    """
+    Load everything the first request would otherwise pay for, or only the
+    steps named in `only`. Steps that succeeded are not run again; failed ones
+    are retried on the next call.
+    Returns (ready, {step: milliseconds}, {step: error}).
+    """
+    with _lock:
+        errors = {}
+        for name, step in WARMUP_STEPS:
+            if name in _completed or (only is not None and name not in only):
+                continue
+            start = time.perf_counter()
+            try:
+                step()
+            except Exception as e:
+                print(f"Warm-up step {name} failed: {e}")
+                errors[name] = str(e)
+                continue
+            _completed[name] = round((time.perf_counter() - start) * 1000, 1)
+        return not errors, dict(_completed), errors
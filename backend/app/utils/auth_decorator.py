@@ -1,8 +1,42 @@
-from functools import wraps
+import os
+from functools import partial, wraps
 from flask import request, jsonify, g
-from firebase_admin import auth
+from firebase_admin import auth, exceptions
+from app.services.async_io_service import submit_io
+from app.utils.token_cache import verify_id_token
+
+ADMIN_USERNAME = os.getenv("FLASK_ADMIN_USERNAME")
+ADMIN_PASSWORD = os.getenv("FLASK_ADMIN_PASSWORD")
+
+# What auth.verify_id_token raises for a token that is malformed, expired,
+# revoked or of a disabled user. Anything else, such as a failed certificate
+# fetch, is the backend's problem and must not log the user out.
+TOKEN_ERRORS = (ValueError, exceptions.InvalidArgumentError)
+
+def _log_prefetch_error(future):
+    if not future.cancelled() and future.exception() is not None:
+        print(f"Error prefetching for request: {future.exception()}")
+
+def start_prefetch(prefetch):
+    """
+    Start `prefetch()` on the I/O loop without waiting for it, so it runs
+    while the token is verified. Errors are only logged; the view loads what
+    it needs itself.
+    """
+    try:
+        submit_io(prefetch()).add_done_callback(_log_prefetch_error)
+    except Exception as e:
+        print(f"Error starting prefetch for request: {e}")
+
+def firebase_auth_required(f=None, *, prefetch=None):
+    """
+    Require a valid Firebase ID token. `prefetch` is an optional coroutine
+    function with I/O the view needs anyway, such as refreshing the skill
+    catalog; it is started before the token is verified and never waited for.
+    """
+    if f is None:
+        return partial(firebase_auth_required, prefetch=prefetch)
 
-def firebase_auth_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         if request.method == "OPTIONS":
@@ -15,12 +49,26 @@ def firebase_auth_required(f):
 
         id_token = auth_header.split("Bearer ")[1]
 
+        if prefetch is not None:
+            start_prefetch(prefetch)
+
         try:
-            decoded_token = auth.verify_id_token(id_token)
-            g.firebase_user = decoded_token
-        except Exception as e:
+            g.firebase_user = verify_id_token(id_token)
+        except TOKEN_ERRORS as e:
             return jsonify({"error": "Invalid or expired token", "details": str(e)}), 401
+        except Exception as e:
+            print(f"Error verifying ID token: {e}")
+            return jsonify({"error": "The token could not be verified right now, please retry."}), 503
 
         return f(*args, **kwargs)
 
-    return decorated_function
\ No newline at end of file
+    return decorated_function
+
+def authenticate(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        auth = request.authorization
+        if not auth or auth.username != ADMIN_USERNAME or auth.password != ADMIN_PASSWORD:
+            return jsonify({"error": "Unauthorized"}), 401
+        return func(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,240 @@
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from flask import g, has_request_context, request
+
+# Both can also be switched at runtime with set_enabled (POST /api/metrics).
+METRICS_ENABLED = os.getenv("FLASK_METRICS_ENABLED", "1") == "1"
+SERVER_TIMING = os.getenv("FLASK_SERVER_TIMING", "0") == "1"
+# File through which set_enabled reaches every process of the deployment;
+# gunicorn.conf.py sets one per master. Empty keeps the settings per process.
+METRICS_SETTINGS_FILE = os.getenv("FLASK_METRICS_SETTINGS_FILE", "")
+# Seconds between checks of that file for settings changed by another worker.
+METRICS_SETTINGS_POLL = float(os.getenv("FLASK_METRICS_SETTINGS_POLL", "1"))
+
+# Histogram bucket upper bounds in seconds, from a cache hit to a slow report upload.
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_settings = {"enabled": METRICS_ENABLED, "server_timing": SERVER_TIMING}
+_shared_state = {"checked_at": None, "mtime": None}
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labelnames, values):
+    if not labelnames:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)) + "}"
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+class Histogram:
+    def __init__(self, name, help_text, labelnames=(), buckets=DURATION_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # Per-bucket counts (not cumulative), then sum and count.
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labels):
+        with self._lock:
+            series = self._series.get(labels)
+            return series[2] if series else 0
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    bucket_labels = _format_labels(self.labelnames + ("le",), labels + (_format_value(bound),))
+                    lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+                label_text = _format_labels(self.labelnames, labels)
+                lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+                lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+stage_seconds = Histogram("ijob_stage_seconds", "Time spent in each CV pipeline stage.", ("stage",))
+stage_errors = Counter("ijob_stage_errors_total", "Pipeline stages that raised.", ("stage",))
+request_seconds = Histogram("ijob_request_seconds", "Request handling time by endpoint.", ("endpoint", "method", "status"))
+request_errors = Counter("ijob_request_errors_total", "Requests answered with a 5xx status.", ("endpoint",))
+
+METRICS = [stage_seconds, stage_errors, request_seconds, request_errors]
+
+def _load_shared_settings(force=False):
+    if not METRICS_SETTINGS_FILE:
+        return
+    now = time.monotonic()
+    checked_at = _shared_state["checked_at"]
+    if not force and checked_at is not None and now - checked_at < METRICS_SETTINGS_POLL:
+        return
+    _shared_state["checked_at"] = now
+    try:
+        mtime = os.stat(METRICS_SETTINGS_FILE).st_mtime_ns
+        if mtime == _shared_state["mtime"]:
+            return
+        with open(METRICS_SETTINGS_FILE) as file:
+            stored = json.load(file)
+    except (OSError, ValueError):
+        return
+    _shared_state["mtime"] = mtime
+    _settings.update({key: bool(stored[key]) for key in _settings if key in stored})
+
+def _save_shared_settings():
+    temporary = f"{METRICS_SETTINGS_FILE}.{os.getpid()}.tmp"
+    with open(temporary, "w") as file:
+        json.dump(_settings, file)
+    os.replace(temporary, METRICS_SETTINGS_FILE)
+
+def is_enabled():
+    _load_shared_settings()
+    return _settings["enabled"]
+
+def settings_are_shared():
+    return bool(METRICS_SETTINGS_FILE)
+
+def set_enabled(enabled=None, server_timing=None):
+    """
+    Switch metrics or the Server-Timing header on or off. With
+    METRICS_SETTINGS_FILE the change reaches the other workers within
+    METRICS_SETTINGS_POLL seconds; otherwise only this process.
+    """
+    _load_shared_settings(force=True)
+    if enabled is not None:
+        _settings["enabled"] = bool(enabled)
+    if server_timing is not None:
+        _settings["server_timing"] = bool(server_timing)
+    if METRICS_SETTINGS_FILE:
+        _save_shared_settings()
+    return dict(_settings)
+
+@contextmanager
+def stage(name):
+    """
+    Time a pipeline stage into ijob_stage_seconds and the request's
+    Server-Timing header. Does nothing while metrics are disabled.
+    """
+    if not _settings["enabled"]:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        stage_errors.inc(name)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        stage_seconds.observe(elapsed, name)
+        if has_request_context():
+            timings = g.get("server_timing")
+            if timings is not None:
+                timings.append((name, elapsed))
+
+def _before_request():
+    _load_shared_settings()
+    if _settings["enabled"]:
+        g.request_started = time.perf_counter()
+        g.server_timing = [] if _settings["server_timing"] else None
+
+def _after_request(response):
+    started = g.get("request_started")
+    if started is None:
+        return response
+
+    elapsed = time.perf_counter() - started
+    endpoint = request.endpoint or "unmatched"
+    request_seconds.observe(elapsed, endpoint, request.method, response.status_code)
+    if response.status_code >= 500:
+        request_errors.inc(endpoint)
+
+    timings = g.get("server_timing")
+    if timings is not None:
+        entries = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in timings]
+        entries.append(f"total;dur={elapsed * 1000:.2f}")
+        response.headers["Server-Timing"] = ", ".join(entries)
+    return response
+
+def process_stats():
+    """
+    The pid and the resident (RSS) and proportional (PSS) memory of this
+    process in bytes. Every gunicorn worker keeps its own metrics, so the pid
+    tells scrapes of different workers apart. PSS splits pages shared with
+    other processes, such as copy-on-write pages inherited from the gunicorn
+    master, between them; memory is only reported on Linux.
+    """
+    memory = {"pid": os.getpid()}
+    try:
+        with open("/proc/self/smaps_rollup") as file:
+            for line in file:
+                key, _, value = line.partition(":")
+                if key in ("Rss", "Pss"):
+                    memory[f"{key.lower()}_bytes"] = int(value.split()[0]) * 1024
+    except OSError:
+        pass
+    return memory
+
+def init_app(app):
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+
+def render_metrics(stats_sources=None):
+    """
+    All metrics in the Prometheus text exposition format. `stats_sources`
+    maps a name to a stats() dict whose numeric values are exported as
+    ijob_<name>_<key> gauges.
+    """
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    for source, stats in (stats_sources or {}).items():
+        for key, value in sorted(stats.items()):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            name = f"ijob_{source}_{key}"
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
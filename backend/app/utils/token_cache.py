@@ -0,0 +1,149 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from firebase_admin import auth, _token_gen
+from app.db.firebase_init import get_firebase_app
+
+TOKEN_CACHE_SIZE = int(os.getenv("FLASK_TOKEN_CACHE_SIZE", "10000"))
+# Seconds a verified token is trusted without verifying it again; never past its `exp`.
+TOKEN_CACHE_TTL = float(os.getenv("FLASK_TOKEN_CACHE_TTL", "300"))
+# Seconds between background fetches of Google's signing certificates; 0 disables them.
+CERT_REFRESH_INTERVAL = float(os.getenv("FLASK_CERT_REFRESH_INTERVAL", "600"))
+
+class TokenCache:
+    """
+    Bounded LRU of decoded Firebase ID tokens, keyed by the token's SHA-256.
+    An entry expires after `ttl` seconds or at the token's `exp`, whichever
+    comes first; tokens without `exp` are not cached.
+    """
+
+    def __init__(self, max_size, ttl, clock=time.time):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "verify_failures": 0, "verify_seconds_total": 0.0, "verify_seconds_max": 0.0}
+
+    @staticmethod
+    def _key(id_token):
+        return hashlib.sha256(id_token.encode("utf-8")).hexdigest()
+
+    def get(self, id_token):
+        key = self._key(id_token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self.clock():
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return dict(entry[1])
+            if entry is not None:
+                del self._entries[key]
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, id_token, decoded_token):
+        expires_at = decoded_token.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return
+        expires_at = min(expires_at, self.clock() + self.ttl)
+        if expires_at <= self.clock() or self.max_size <= 0:
+            return
+
+        key = self._key(id_token)
+        with self._lock:
+            self._entries[key] = (expires_at, dict(decoded_token))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def record_verification(self, seconds, failed=False):
+        with self._lock:
+            self._stats["verify_seconds_total"] += seconds
+            self._stats["verify_seconds_max"] = max(self._stats["verify_seconds_max"], seconds)
+            if failed:
+                self._stats["verify_failures"] += 1
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "size": len(self._entries), "max_size": self.max_size}
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL)
+
+def verify_id_token(id_token):
+    """
+    auth.verify_id_token behind token_cache. Failed verifications are not
+    cached, so an invalid token is rejected by Firebase every time.
+    """
+    decoded_token = token_cache.get(id_token)
+    if decoded_token is not None:
+        return decoded_token
+    return _verify_and_cache(id_token)
+
+def _verify_and_cache(id_token):
+    get_firebase_app()
+    start = time.perf_counter()
+    try:
+        decoded_token = auth.verify_id_token(id_token)
+    except Exception:
+        token_cache.record_verification(time.perf_counter() - start, failed=True)
+        raise
+    token_cache.record_verification(time.perf_counter() - start)
+    token_cache.set(id_token, decoded_token)
+    return decoded_token
+
+def fetch_signing_certificates():
+    """
+    Fetch the ID token certificates through the HTTP-caching session Firebase
+    verifies tokens with, so no request has to wait for the fetch. Relies on
+    firebase_admin internals; a change there is logged by the refresher.
+    """
+    request = auth._get_client(get_firebase_app())._token_verifier.request
+    response = request(_token_gen.ID_TOKEN_CERT_URI, method="GET")
+    if response.status != 200:
+        raise RuntimeError(f"Certificate fetch returned HTTP {response.status}")
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+def _refresh_certificates(interval, stop):
+    while True:
+        try:
+            fetch_signing_certificates()
+        except Exception as e:
+            print(f"Error refreshing token signing certificates: {e}")
+        if stop.wait(interval):
+            return
+
+def start_cert_refresher(interval=None):
+    """
+    Fetch the signing certificates now and every `interval` seconds on a daemon
+    thread. Only one refresher runs per process. Returns the event that stops it,
+    or None when refreshing is disabled.
+    """
+    global _refresher
+    interval = CERT_REFRESH_INTERVAL if interval is None else interval
+    if interval <= 0:
+        return None
+
+    with _refresher_lock:
+        if _refresher is None or not _refresher[0].is_alive():
+            stop = threading.Event()
+            thread = threading.Thread(target=_refresh_certificates, args=(interval, stop), name="cert-refresher", daemon=True)
+            thread.start()
+            _refresher = (thread, stop)
+        return _refresher[1]
+
+def stop_cert_refresher(timeout=5):
+    """
+    Stop the refresher thread, e.g. in the gunicorn master before forking.
+    """
+    global _refresher
+    with _refresher_lock:
+        refresher, _refresher = _refresher, None
+    if refresher is not None:
+        thread, stop = refresher
+        stop.set()
+        thread.join(timeout)
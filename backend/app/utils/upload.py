@@ -0,0 +1,15 @@
+import os
+from tempfile import SpooledTemporaryFile
+from flask import Request
+
+# Uploaded files larger than this are spooled to a temporary file on disk.
+UPLOAD_SPOOL_SIZE = int(os.getenv("FLASK_UPLOAD_SPOOL_SIZE", str(512 * 1024)))
+
+class SpooledUploadRequest(Request):
+    """
+    Keeps small uploads in memory and moves large ones to disk while the body
+    is being parsed, so concurrent large uploads do not pile up in RAM.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return SpooledTemporaryFile(max_size=UPLOAD_SPOOL_SIZE, mode="rb+")
@@ -0,0 +1,123 @@
+"""
+I/O concurrency benchmark with a simulated Firestore round-trip time.
+
+"sequential" issues the calls one after another, as the request threads did
+before the I/O loop; "io loop" issues them through async_io_service, where
+independent calls overlap. Firestore is the in-memory fake with every
+round-trip delayed by --rtt-ms, so the numbers show how many round-trips a
+request waits for, not Firestore's own speed.
+
+The second line follows a request through firebase_auth_required: the catalog
+prefetch starts on the loop, the request thread verifies the token itself,
+then the view's get_skill_catalog joins the prefetch. The request thread is
+blocked for the whole time either way; the loop shortens the wait, it does
+not free the thread.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_async_io --rtt-ms 20
+"""
+import argparse
+import asyncio
+import time
+from unittest.mock import patch
+
+from app.services import firestore_service
+from app.services.async_io_service import run_io
+from app.services.firestore_service import get_cv_features_async, get_skill_catalog, refresh_skill_catalog_async
+from app.utils import token_cache
+from app.utils.auth_decorator import start_prefetch
+from benchmarks.corpus import build_vocabulary
+from benchmarks.suite import seed_firestore
+from tests.fakes import FakeAsyncFirestoreClient
+
+class SlowAsyncFirestoreClient(FakeAsyncFirestoreClient):
+    def __init__(self, sync_client, rtt):
+        super().__init__(sync_client)
+        self.rtt = rtt
+
+    def collection(self, name):
+        collection = super().collection(name)
+        stream = collection.stream
+
+        async def slow_stream():
+            await asyncio.sleep(self.rtt)
+            async for snapshot in stream():
+                yield snapshot
+
+        collection.stream = slow_stream
+        return collection
+
+    async def get_all(self, refs):
+        await asyncio.sleep(self.rtt)
+        async for snapshot in super().get_all(refs):
+            yield snapshot
+
+def timed(fn, runs):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--rtt-ms", type=float, default=20)
+    arg_parser.add_argument("--cv-ids", type=int, default=20000)
+    arg_parser.add_argument("--runs", type=int, default=3)
+    args = arg_parser.parse_args()
+    rtt = args.rtt_ms / 1000
+
+    fake_db = seed_firestore(build_vocabulary(2000))
+    cv_ids = [f"cv{i}" for i in range(args.cv_ids)]
+    fake_db.data[firestore_service.FIRESTORE_CV_FEATURES_COLLECTION] = {cv_id: {"skills_version": "v"} for cv_id in cv_ids}
+
+    def verify_slowly(id_token):
+        # A token cache miss that also has to fetch the signing certificates.
+        time.sleep(rtt)
+        return {"uid": "bench", "exp": time.time() + 3600}
+
+    async def features_sequential():
+        # One chunk after another, as get_cv_features read them before.
+        for i in range(0, len(cv_ids), firestore_service.FIRESTORE_BATCH_SIZE):
+            await get_cv_features_async(cv_ids[i:i + firestore_service.FIRESTORE_BATCH_SIZE])
+
+    def request_sequential():
+        token_cache.verify_id_token("token")
+        get_skill_catalog()
+
+    def request_with_prefetch():
+        start_prefetch(refresh_skill_catalog_async)
+        token_cache.verify_id_token("token")
+        get_skill_catalog()
+
+    def cold(fn):
+        # Every run misses the token cache and finds the catalog stale.
+        def run():
+            token_cache.token_cache = token_cache.TokenCache(10, 300)
+            firestore_service.invalidate_skills_cache()
+            fn()
+        return run
+
+    with patch.object(firestore_service, "db", fake_db), \
+         patch.object(firestore_service, "async_db", SlowAsyncFirestoreClient(fake_db, rtt)), \
+         patch.object(token_cache, "_verify_and_cache", verify_slowly), \
+         patch.object(token_cache, "token_cache", token_cache.TokenCache(10, 300)):
+        sequential_ms = timed(lambda: run_io(features_sequential()), args.runs)
+        concurrent_ms = timed(lambda: run_io(get_cv_features_async(cv_ids)), args.runs)
+        print(
+            f"load {args.cv_ids} stored features (rtt={args.rtt_ms:g} ms): sequential={sequential_ms:7.1f} ms  "
+            f"io loop={concurrent_ms:7.1f} ms ({sequential_ms / concurrent_ms:.1f}x)"
+        )
+
+        sequential_ms = timed(cold(request_sequential), args.runs)
+        concurrent_ms = timed(cold(request_with_prefetch), args.runs)
+        print(
+            f"token + catalog for one request, cold:   sequential={sequential_ms:7.1f} ms  "
+            f"prefetch={concurrent_ms:7.1f} ms ({sequential_ms / concurrent_ms:.1f}x)"
+        )
+
+if __name__ == "__main__":
+    main()
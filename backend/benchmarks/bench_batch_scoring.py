@@ -0,0 +1,91 @@
+"""
+Throughput of the batch scoring endpoint against one-CV-per-call scoring.
+
+"single" scores each PDF the way /api/upload_cv does (text extraction, skill
+extraction, experience parsing and scoring, with the job re-parsed per CV).
+"batch" uses score_cv_batch. Reports are not generated in either path.
+The "text" rows skip PDF parsing to isolate skill extraction and scoring.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_batch_scoring --counts 100 1000
+"""
+import argparse
+import io
+import logging
+import time
+from unittest.mock import patch
+
+from app.services import cv_service
+from benchmarks.corpus import build_vocabulary, build_cv, render_pdf
+
+JOB_REQUIREMENTS = {
+    "programming_languages": ["progskill1", "progskill2", "progskill3"],
+    "frameworks": ["framskill1", "framskill2"],
+    "tools": ["toolskill1"],
+    "certifications": ["certskill1"],
+}
+
+def score_one_by_one(pdfs):
+    results = []
+    for pdf in pdfs:
+        text = cv_service.extract_text_from_pdf(io.BytesIO(pdf))
+        job_profile = cv_service.JobProfile(JOB_REQUIREMENTS, "2-5")
+        extracted_skills = cv_service.extract_skills(text)
+        years = cv_service.calculate_experience_years(cv_service.extract_experience(text))
+        results.append(cv_service.score_skills(extracted_skills, years, job_profile))
+    return results
+
+def score_batch(pdfs):
+    sources = [(str(i), lambda pdf=pdf: pdf) for i, pdf in enumerate(pdfs)]
+    return cv_service.score_cv_batch(sources, JOB_REQUIREMENTS, "2-5")
+
+def score_texts_one_by_one(texts):
+    results = []
+    for text in texts:
+        job_profile = cv_service.JobProfile(JOB_REQUIREMENTS, "2-5")
+        extracted_skills = cv_service.extract_skills(text)
+        years = cv_service.calculate_experience_years(cv_service.extract_experience(text))
+        results.append(cv_service.score_skills(extracted_skills, years, job_profile))
+    return results
+
+def score_texts_batch(texts):
+    job_profile = cv_service.JobProfile(JOB_REQUIREMENTS, "2-5")
+    results = []
+    for text, extracted_skills in zip(texts, cv_service.extract_skills_batch(texts)):
+        years = cv_service.calculate_experience_years(cv_service.extract_experience(text))
+        results.append(cv_service.score_skills(extracted_skills, years, job_profile))
+    return results
+
+def run(label, fn, inputs):
+    start = time.perf_counter()
+    fn(inputs)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} cvs={len(inputs):<5} total={elapsed:.2f}s throughput={len(inputs) / elapsed:.1f} cvs/s")
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000])
+    arg_parser.add_argument("--skills", type=int, default=400)
+    arg_parser.add_argument("--skip-pdf", action="store_true")
+    args = arg_parser.parse_args()
+
+    logging.getLogger("pdfminer").setLevel(logging.ERROR)
+    vocabulary = build_vocabulary(args.skills)
+    distinct_texts = [build_cv(vocabulary, seed=seed) for seed in range(50)]
+    distinct_pdfs = [render_pdf(text) for text in distinct_texts]
+
+    with patch.object(cv_service, "load_skill_vocabulary", return_value=vocabulary), \
+         patch.object(cv_service, "get_skills_version", return_value=0):
+        cv_service.extract_skills("warm up")
+        for count in args.counts:
+            texts = [distinct_texts[i % len(distinct_texts)] for i in range(count)]
+            run("text single", score_texts_one_by_one, texts)
+            run("text batch", score_texts_batch, texts)
+            if not args.skip_pdf:
+                pdfs = [distinct_pdfs[i % len(distinct_pdfs)] for i in range(count)]
+                run("pdf single", score_one_by_one, pdfs)
+                run("pdf batch", score_batch, pdfs)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Cold start: import time of the app, then the first /api/upload_cv request,
+with and without calling /api/ready first. Every sample runs in a fresh
+interpreter, the way a new Cloud Run instance starts. Firestore is the
+in-memory fake seeded with the benchmark vocabulary; reports are not
+generated.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_cold_start --runs 3
+"""
+import argparse
+import io
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+def child(call_ready):
+    start = time.perf_counter()
+    from app import create_app
+    app = create_app()
+    timings = {"import_and_create_app_ms": (time.perf_counter() - start) * 1000}
+
+    from unittest.mock import patch
+    from app.services import firestore_service
+    from benchmarks.corpus import build_vocabulary, build_cv, render_pdf
+    from benchmarks.suite import seed_firestore
+    from tests.fakes import FakeAsyncFirestoreClient
+
+    vocabulary = build_vocabulary(2000)
+    pdfs = [render_pdf(build_cv(vocabulary, words=800, seed=seed)) for seed in range(2)]
+    fake_db = seed_firestore(vocabulary)
+    with patch.object(firestore_service, "db", fake_db), \
+         patch.object(firestore_service, "async_db", FakeAsyncFirestoreClient(fake_db)), \
+         patch("app.utils.auth_decorator.auth.verify_id_token", return_value={"uid": "bench"}), \
+         patch("app.services.cv_service.submit_report_job", return_value=None):
+        firestore_service.invalidate_skills_cache()
+        client = app.test_client()
+        if call_ready:
+            start = time.perf_counter()
+            assert client.get("/api/ready").status_code == 200
+            timings["ready_ms"] = (time.perf_counter() - start) * 1000
+        for name, pdf in zip(("first_upload_ms", "second_upload_ms"), pdfs):
+            start = time.perf_counter()
+            response = client.post(
+                "/api/upload_cv",
+                data={"file": (io.BytesIO(pdf), "cv.pdf"), "job_title": "Developer"},
+                headers={"Authorization": "Bearer token"},
+                content_type="multipart/form-data",
+            )
+            assert response.status_code == 200, response.get_data()
+            timings[name] = (time.perf_counter() - start) * 1000
+    sys.__stdout__.write(json.dumps(timings) + "\n")
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--runs", type=int, default=3)
+    arg_parser.add_argument("--child", choices=["cold", "ready"], help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.child:
+        return child(args.child == "ready")
+
+    for mode in ("cold", "ready"):
+        samples = []
+        for _ in range(args.runs):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_cold_start", "--child", mode],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            samples.append(json.loads(output.strip().splitlines()[-1]))
+        medians = {key: round(statistics.median(sample[key] for sample in samples)) for key in samples[0]}
+        print(f"{mode:<6} " + "  ".join(f"{key}={value}" for key, value in medians.items()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Micro-benchmark for experience extraction.
+
+"legacy" is the original cv_service code (section scan with repeated
+.lower() calls, the date regex compiled per call and dateutil fuzzy parsing
+per date); "after" is app.services.experience_parser. Before timing, both
+are run over the corpus and a set of randomised CV snippets, and the
+extracted years must be identical.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_experience_parsing --runs 200
+"""
+import argparse
+import random
+import re
+import statistics
+import time
+from datetime import datetime
+
+from dateutil import parser
+
+from app.services.experience_parser import extract_experience, calculate_experience_years, extract_experience_periods, total_experience_years
+from benchmarks.corpus import MONTHS, build_vocabulary, build_corpus
+
+def legacy_extract_experience(text):
+    sections = re.split(r'\n(?=\w)', text)
+    work_experience_text = ""
+    capture = False
+    for section in sections:
+        if "work experience" in section.lower() or "experience" in section.lower() or "employment" in section.lower() or "work" in section.lower():
+            capture = True
+        elif capture and ("education" in section.lower() or "projects" in section.lower()):
+            break
+        elif capture:
+            work_experience_text += section + "\n"
+
+    month_regex = r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|" \
+                r"Jul(?:y)?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)"
+
+    date_range_pattern = re.compile(
+        fr"{month_regex}\.?\s+\d{{4}}\s+[–-]\s+(?:Present|{month_regex}\.?\s+\d{{4}})",
+        re.IGNORECASE
+    )
+
+    return date_range_pattern.findall(work_experience_text)
+
+def legacy_calculate_experience_years(date_ranges):
+    parsed_periods = []
+    for period in date_ranges:
+        parts = re.split(r"\s+[–-]\s+", period)
+        if len(parts) != 2:
+            continue
+        start_str, end_str = parts
+        try:
+            start_date = parser.parse(start_str, fuzzy=True)
+        except Exception:
+            continue
+        if "present" in end_str.lower():
+            end_date = datetime.today()
+        else:
+            try:
+                end_date = parser.parse(end_str, fuzzy=True)
+            except Exception:
+                continue
+        if end_date < start_date:
+            continue
+        parsed_periods.append((start_date, end_date))
+
+    parsed_periods.sort()
+    merged_periods = []
+    for start, end in parsed_periods:
+        if not merged_periods:
+            merged_periods.append((start, end))
+        else:
+            last_start, last_end = merged_periods[-1]
+            if start <= last_end:
+                merged_periods[-1] = (last_start, max(last_end, end))
+            else:
+                merged_periods.append((start, end))
+
+    total_months = 0
+    for start, end in merged_periods:
+        total_months += (end.year - start.year) * 12 + (end.month - start.month)
+    return round(total_months / 12, 2)
+
+LONG_MONTHS = ["January", "Sept.", "march", "JUNE", "Dec."]
+HEADINGS = ["Work Experience", "EMPLOYMENT HISTORY", "Experience", "Education", "Projects", "Skills", "Languages"]
+
+def random_cv(rng):
+    lines = [f"Candidate {rng.randint(0, 999)}"]
+    for _ in range(rng.randint(3, 12)):
+        roll = rng.random()
+        if roll < 0.25:
+            lines.append(rng.choice(HEADINGS))
+        elif roll < 0.7:
+            start = f"{rng.choice(MONTHS + LONG_MONTHS)} {rng.randint(1998, 2026)}"
+            end = "Present" if rng.random() < 0.2 else f"{rng.choice(MONTHS + LONG_MONTHS)} {rng.randint(1998, 2026)}"
+            indent = "  " if rng.random() < 0.3 else ""
+            lines.append(f"{indent}Engineer at Company {start} {rng.choice(['-', '–'])} {end}")
+        else:
+            lines.append(rng.choice(["Built services", "  worked on pipelines", "Led a team", "Python, Go"]))
+    return "\n".join(lines)
+
+def check_equivalence(texts):
+    for text in texts:
+        legacy = legacy_calculate_experience_years(legacy_extract_experience(text))
+        assert extract_experience(text) == legacy_extract_experience(text), text
+        assert calculate_experience_years(extract_experience(text)) == legacy, text
+        assert total_experience_years(extract_experience_periods(text)) == legacy, text
+
+def measure(fn, texts, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        timings.append((time.perf_counter() - start) * 1e6 / len(texts))
+    return {"p50_us_per_cv": round(statistics.median(timings), 1), "mean_us_per_cv": round(statistics.mean(timings), 1)}
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--runs", type=int, default=200)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(0)
+    corpus = [text for _, text in build_corpus(build_vocabulary(400))]
+    snippets = [random_cv(rng) for _ in range(2000)]
+    check_equivalence(corpus + snippets)
+    print(f"identical years on {len(corpus)} corpus CVs and {len(snippets)} random snippets")
+
+    for name, texts in (("corpus", corpus), ("snippets", snippets[:200])):
+        legacy = measure(lambda text: legacy_calculate_experience_years(legacy_extract_experience(text)), texts, args.runs)
+        after = measure(lambda text: total_experience_years(extract_experience_periods(text)), texts, args.runs)
+        print(f"{name}: legacy {legacy} after {after} speedup={legacy['p50_us_per_cv'] / after['p50_us_per_cv']:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Per-worker memory and startup time of gunicorn with and without preload.
+
+Starts gunicorn.conf.py with --workers N against benchmarks/gunicorn_app.py
+(fake Firestore), waits until every worker logged that it is warm, then
+reads RSS and PSS of each worker from /proc. PSS counts pages shared with
+the master or other workers proportionally, so it shows what copy-on-write
+saves. Linux only.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_gunicorn_workers --workers 4
+"""
+import argparse
+import os
+import re
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+WORKER_LINE = re.compile(r"Worker (\d+) started in (\d+) ms")
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def memory_kib(pid):
+    memory = {}
+    with open(f"/proc/{pid}/smaps_rollup") as file:
+        for line in file:
+            key, _, value = line.partition(":")
+            if key in ("Rss", "Pss"):
+                memory[key] = int(value.split()[0])
+    return memory
+
+def run(workers, preload, timeout=300):
+    env = {
+        **os.environ,
+        "GUNICORN_WORKERS": str(workers),
+        "GUNICORN_PRELOAD": "1" if preload else "0",
+        "PORT": str(free_port()),
+        "FLASK_CERT_REFRESH_INTERVAL": "0",
+    }
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "benchmarks.gunicorn_app:app"],
+        env=env, stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, text=True,
+    )
+    started = {}
+    try:
+        for line in process.stderr:
+            match = WORKER_LINE.search(line)
+            if match:
+                started[int(match.group(1))] = int(match.group(2))
+            if len(started) == workers or time.perf_counter() - start > timeout:
+                break
+        all_ready_ms = (time.perf_counter() - start) * 1000
+        memory = {pid: memory_kib(pid) for pid in started}
+        master = memory_kib(process.pid)
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(30)
+
+    total_pss = sum(m["Pss"] for m in memory.values()) + master["Pss"]
+    print(
+        f"preload={'on ' if preload else 'off'} workers={workers}  all warm after {all_ready_ms:.0f} ms  "
+        f"worker startup={sorted(started.values())} ms"
+    )
+    for pid, m in sorted(memory.items()):
+        print(f"    worker {pid}: rss={m['Rss'] / 1024:.1f} MiB  pss={m['Pss'] / 1024:.1f} MiB")
+    print(f"    master: rss={master['Rss'] / 1024:.1f} MiB  pss={master['Pss'] / 1024:.1f} MiB  total pss={total_pss / 1024:.1f} MiB")
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--workers", type=int, default=4)
+    args = arg_parser.parse_args()
+    for preload in (False, True):
+        run(args.workers, preload)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Skill matcher backends at growing vocabulary sizes: spaCy's PhraseMatcher
+(the "tokenizer" mode) against the marisa-trie matcher (the "trie" mode).
+
+For every size it reports the time to build the matcher, how much the
+build grew the process's resident memory (including C allocations of spaCy
+and marisa-trie; allocator reuse makes small figures noisy), CVs matched
+per second, and whether both backends extracted the same skills. A third of the skills have two
+tokens, so multi-token phrases are covered.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_matcher_backends --sizes 1000 10000 100000
+"""
+import argparse
+import gc
+import time
+
+from app.services.skill_matcher import SkillMatcher, match_skills
+from app.utils.metrics import process_stats
+from benchmarks.corpus import build_vocabulary, build_cv
+
+def with_phrases(vocabulary):
+    return {
+        category: [f"{skill} pro" if i % 3 == 0 else skill for i, skill in enumerate(names)]
+        for category, names in vocabulary.items()
+    }
+
+def run_backend(mode, vocabulary, texts):
+    SkillMatcher.configure(mode)
+    if SkillMatcher.uses_spacy():
+        SkillMatcher.get_nlp()
+    gc.collect()
+    rss_before = process_stats().get("rss_bytes", 0)
+    start = time.perf_counter()
+    SkillMatcher.get_matcher(mode, lambda: vocabulary)
+    build_s = time.perf_counter() - start
+    gc.collect()
+    build_bytes = process_stats().get("rss_bytes", 0) - rss_before
+
+    match_skills(texts[0], mode, lambda: vocabulary)
+    start = time.perf_counter()
+    extracted = [match_skills(text, mode, lambda: vocabulary) for text in texts]
+    match_s = time.perf_counter() - start
+    extracted = [{category: sorted(skills) for category, skills in skills.items()} for skills in extracted]
+    return build_s, build_bytes, len(texts) / match_s, extracted
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    arg_parser.add_argument("--cvs", type=int, default=50)
+    args = arg_parser.parse_args()
+
+    original_mode = SkillMatcher.get_mode()
+    try:
+        for size in args.sizes:
+            vocabulary = with_phrases(build_vocabulary(size))
+            texts = [build_cv(vocabulary, words=800, seed=seed) for seed in range(args.cvs)]
+            results = {mode: run_backend(mode, vocabulary, texts) for mode in ("tokenizer", "trie")}
+            for mode, (build_s, build_bytes, cvs_per_sec, _) in results.items():
+                print(
+                    f"skills={size:<7} {mode:<10} build={build_s * 1000:8.0f} ms  "
+                    f"memory={build_bytes / 2**20:7.1f} MiB  match={cvs_per_sec:7.1f} CVs/s"
+                )
+            print(f"skills={size:<7} same skills extracted: {results['tokenizer'][3] == results['trie'][3]}")
+    finally:
+        SkillMatcher.configure(original_mode)
+
+if __name__ == "__main__":
+    main()
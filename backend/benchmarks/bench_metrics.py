@@ -0,0 +1,57 @@
+"""
+Overhead of the pipeline metrics.
+
+Times the stage() context manager on its own, then the in-process CV analysis
+(PDF text, skill matching, experience parsing) over the synthetic corpus with
+metrics switched on and off. The runs alternate so both see the same cache
+and CPU state.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_metrics --runs 5
+"""
+import argparse
+import logging
+import statistics
+import time
+
+from app.services.cv_executor import _analyse
+from app.utils import metrics
+from benchmarks.corpus import build_vocabulary, build_corpus, render_pdf
+
+def stage_overhead_us(enabled, calls=200000):
+    metrics.set_enabled(enabled)
+    start = time.perf_counter()
+    for _ in range(calls):
+        with metrics.stage("bench"):
+            pass
+    return (time.perf_counter() - start) / calls * 1e6
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--runs", type=int, default=5)
+    arg_parser.add_argument("--skills", type=int, default=2000)
+    args = arg_parser.parse_args()
+
+    logging.getLogger("pdfminer").setLevel(logging.ERROR)
+    vocabulary = build_vocabulary(args.skills)
+    pdfs = [render_pdf(text) for _, text in build_corpus(vocabulary)]
+    _analyse(pdfs[0], "bench", lambda: vocabulary, 0)
+
+    print(f"stage() per call: enabled={stage_overhead_us(True):.2f} us  disabled={stage_overhead_us(False):.2f} us")
+
+    timings = {True: [], False: []}
+    for _ in range(args.runs):
+        for enabled in (False, True):
+            metrics.set_enabled(enabled)
+            start = time.perf_counter()
+            for pdf in pdfs:
+                _analyse(pdf, "bench", lambda: vocabulary, 0)
+            timings[enabled].append((time.perf_counter() - start) / len(pdfs) * 1000)
+
+    off, on = statistics.median(timings[False]), statistics.median(timings[True])
+    print(f"analysis per CV: metrics off={off:.2f} ms  on={on:.2f} ms  overhead={(on - off) / off * 100:+.2f}%")
+    metrics.set_enabled(metrics.METRICS_ENABLED)
+
+if __name__ == "__main__":
+    main()
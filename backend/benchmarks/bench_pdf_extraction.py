@@ -0,0 +1,74 @@
+"""
+PDF text extraction benchmark over the synthetic CV corpus.
+
+"legacy" is the original extractor (pdfplumber with `text +=` over every
+page); the others go through extract_text_from_pdf with each backend and the
+configured page/char caps. A 200-page document shows the effect of the caps.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_pdf_extraction --runs 3
+"""
+import argparse
+import io
+import logging
+import statistics
+import time
+
+import pdfplumber
+
+from app.services.pdf_service import PDF_BACKENDS, extract_text_from_pdf
+from benchmarks.corpus import build_vocabulary, build_corpus, build_cv, render_pdf
+
+def legacy_extract_text(file):
+    with pdfplumber.open(file) as pdf:
+        text = ""
+        for page in pdf.pages:
+            text += page.extract_text()
+    return text
+
+def measure(fn, pdfs, runs):
+    timings = []
+    for _ in range(runs):
+        for pdf in pdfs:
+            start = time.perf_counter()
+            fn(io.BytesIO(pdf))
+            timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "p50_ms": round(statistics.median(timings), 2),
+        "mean_ms": round(statistics.mean(timings), 2),
+        "max_ms": round(max(timings), 2),
+    }
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--runs", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    logging.getLogger("pdfminer").setLevel(logging.ERROR)
+    vocabulary = build_vocabulary(400)
+    corpus = [render_pdf(text) for _, text in build_corpus(vocabulary)]
+    long_document = [render_pdf(build_cv(vocabulary, words=60000, seed=1))]
+
+    extractors = {"legacy": legacy_extract_text}
+    for backend in PDF_BACKENDS:
+        extractors[backend] = lambda file, backend=backend: extract_text_from_pdf(file, backend=backend)
+
+    reference = [extract_text_from_pdf(io.BytesIO(pdf), max_pages=0, max_chars=0) for pdf in corpus]
+    for backend in PDF_BACKENDS:
+        same = all(
+            extract_text_from_pdf(io.BytesIO(pdf), backend=backend, max_pages=0, max_chars=0) == text
+            for pdf, text in zip(corpus, reference)
+        )
+        print(f"{backend}: same text as pdfplumber on the corpus: {same}")
+
+    print(f"corpus: {len(corpus)} CVs")
+    for name, fn in extractors.items():
+        print(f"  {name:<10} {measure(fn, corpus, args.runs)}")
+    with pdfplumber.open(io.BytesIO(long_document[0])) as pdf:
+        print(f"long document: {len(pdf.pages)} pages")
+    for name, fn in extractors.items():
+        print(f"  {name:<10} {measure(fn, long_document, 1)}")
+
+if __name__ == "__main__":
+    main()
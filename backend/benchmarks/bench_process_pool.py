@@ -0,0 +1,54 @@
+"""
+Load test for the CV executor: throughput of text + skill extraction with
+8 concurrent request threads (the gunicorn --threads setting) for several
+process pool sizes. Size 0 runs the work on the request threads.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_process_pool --processes 0 1 2 4 --cvs 200
+"""
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from app.services import cv_executor
+from benchmarks.corpus import build_vocabulary, build_cv, render_pdf
+
+REQUEST_THREADS = 8
+
+def run(processes, pdfs, vocabulary):
+    with patch.object(cv_executor, "CV_PROCESSES", processes):
+        cv_executor.start_cv_executor()
+        cv_executor.analyse_pdf(pdfs[0], "bench", lambda: vocabulary)
+        with ThreadPoolExecutor(max_workers=REQUEST_THREADS) as requests:
+            start = time.perf_counter()
+            list(requests.map(lambda pdf: cv_executor.analyse_pdf(pdf, "bench", lambda: vocabulary), pdfs))
+            elapsed = time.perf_counter() - start
+        cv_executor._reset_pool()
+    return elapsed
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--processes", type=int, nargs="+", default=[0, 1, 2, 4])
+    arg_parser.add_argument("--cvs", type=int, default=200)
+    args = arg_parser.parse_args()
+
+    logging.getLogger("pdfminer").setLevel(logging.ERROR)
+    vocabulary = build_vocabulary(400)
+    pdfs = [render_pdf(build_cv(vocabulary, seed=seed)) for seed in range(args.cvs)]
+
+    print(f"cpu_count={os.cpu_count()} request_threads={REQUEST_THREADS} cvs={args.cvs}")
+    baseline = None
+    for processes in args.processes:
+        elapsed = run(processes, pdfs, vocabulary)
+        throughput = args.cvs / elapsed
+        if processes == 1:
+            baseline = throughput
+        scaling = f" scaling_vs_1={throughput / baseline:.2f}x" if baseline and processes > 1 else ""
+        print(f"processes={processes:<3} throughput={throughput:.1f} cvs/s{scaling}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Re-ranking benchmark: scoring N stored candidates against a job.
+
+"loop" calls cv_service.score_skills per candidate, as score_cv_batch does
+after parsing; "matrix" uses the CandidateMatrix bitsets and returns every
+candidate or only the top 50. Both run on the same candidates, and their
+rankings must be identical.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_rerank --counts 1000 10000 50000
+"""
+import argparse
+import random
+import time
+
+from app.services.cv_analysis import CVAnalysis
+from app.services.cv_service import JobProfile, score_skills
+from app.services.ranking_service import CandidateMatrix
+from benchmarks.corpus import build_vocabulary
+
+JOB_REQUIREMENTS = {
+    "programming_languages": ["progskill1", "progskill2", "progskill3", "progskill40"],
+    "frameworks": ["framskill1", "framskill2"],
+    "tools": ["toolskill1", "toolskill7", "toolskill9"],
+    "certifications": ["certskill1"],
+}
+
+def build_candidates(count, vocabulary, seed=0):
+    rng = random.Random(seed)
+    return {
+        f"cv{i}": CVAnalysis(
+            "",
+            {category: rng.sample(names, rng.randint(0, 15)) for category, names in vocabulary.items()},
+            (),
+            round(rng.uniform(0, 12), 2),
+            f"Candidate {i}",
+        )
+        for i in range(count)
+    }
+
+def rank_loop(candidates, job_profile):
+    scored = [
+        (cv_id, *score_skills(analysis.skills, analysis.experience_years, job_profile))
+        for cv_id, analysis in candidates.items()
+    ]
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return scored
+
+def timed(fn, runs):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best * 1000
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--counts", type=int, nargs="+", default=[1000, 10000, 50000])
+    arg_parser.add_argument("--skills", type=int, default=400)
+    arg_parser.add_argument("--runs", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    vocabulary = build_vocabulary(args.skills)
+    job_profile = JobProfile(JOB_REQUIREMENTS, "3-6")
+    for count in args.counts:
+        candidates = build_candidates(count, vocabulary)
+        store = CandidateMatrix(max_size=count)
+        for cv_id, analysis in candidates.items():
+            store.add(cv_id, analysis)
+
+        expected, loop_ms = timed(lambda: rank_loop(candidates, job_profile), args.runs)
+        (results, _), matrix_ms = timed(lambda: store.rank(job_profile), args.runs)
+        (top, _), top_ms = timed(lambda: store.rank(job_profile, limit=50), args.runs)
+        assert [(result["cv_id"], result["score"], result["message"]) for result in results] == expected
+        assert top == results[:50]
+
+        print(
+            f"candidates={count:<7} loop={loop_ms:8.1f} ms  matrix={matrix_ms:7.1f} ms ({loop_ms / matrix_ms:.1f}x)  "
+            f"matrix top 50={top_ms:6.1f} ms ({loop_ms / top_ms:.1f}x)  identical ranking"
+        )
+
+if __name__ == "__main__":
+    main()
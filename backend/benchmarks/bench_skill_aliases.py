@@ -0,0 +1,80 @@
+"""
+Matching cost as aliases are added to the skill vocabulary.
+
+Every skill gets 0, 1, 3 or 10 aliases, and the CVs mention skills half by
+name and half by an alias. Aliases are compiled into the same single-pass
+matcher as the names, so CVs matched per second should stay flat while the
+build grows with the number of patterns. Both matcher modes must resolve
+every alias to its canonical skill.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_skill_aliases --skills 10000
+"""
+import argparse
+import random
+import time
+
+from app.services.skill_matcher import SkillMatcher, match_skills
+from benchmarks.corpus import build_vocabulary, build_cv
+
+def with_aliases(vocabulary, per_skill):
+    aliases = {
+        f"{skill}alias{k}": skill
+        for names in vocabulary.values()
+        for skill in names
+        for k in range(per_skill)
+    }
+    return {**vocabulary, "aliases": aliases}
+
+def alias_text(text, vocabulary, seed):
+    # Replace every other skill mention with one of its aliases.
+    rng = random.Random(seed)
+    by_skill = {}
+    for alias, skill in vocabulary["aliases"].items():
+        by_skill.setdefault(skill, []).append(alias)
+    words = text.split(" ")
+    return " ".join(
+        rng.choice(by_skill[word]) if word in by_skill and rng.random() < 0.5 else word
+        for word in words
+    )
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--skills", type=int, default=10000)
+    arg_parser.add_argument("--aliases", type=int, nargs="+", default=[0, 1, 3, 10])
+    arg_parser.add_argument("--cvs", type=int, default=50)
+    args = arg_parser.parse_args()
+
+    base = build_vocabulary(args.skills)
+    texts = [build_cv(base, words=800, seed=seed) for seed in range(args.cvs)]
+    expected = [match_skills(text, "names", lambda: base) for text in texts]
+    expected = [{category: sorted(skills) for category, skills in skills.items()} for skills in expected]
+
+    original_mode = SkillMatcher.get_mode()
+    try:
+        for mode in ("tokenizer", "trie"):
+            for per_skill in args.aliases:
+                SkillMatcher.configure(mode)
+                vocabulary = with_aliases(base, per_skill)
+                cvs = [alias_text(text, vocabulary, seed) for seed, text in enumerate(texts)] if per_skill else texts
+                version = f"{mode}-{per_skill}"
+
+                start = time.perf_counter()
+                SkillMatcher.get_matcher(version, lambda: vocabulary)
+                build_ms = (time.perf_counter() - start) * 1000
+                match_skills(cvs[0], version, lambda: vocabulary)
+                start = time.perf_counter()
+                extracted = [match_skills(text, version, lambda: vocabulary) for text in cvs]
+                cvs_per_sec = len(cvs) / (time.perf_counter() - start)
+                extracted = [{category: sorted(skills) for category, skills in skills.items()} for skills in extracted]
+
+                print(
+                    f"{mode:<10} skills={args.skills} aliases/skill={per_skill:<3} build={build_ms:7.0f} ms  "
+                    f"match={cvs_per_sec:7.1f} CVs/s  same skills as without aliases: {extracted == expected}"
+                )
+    finally:
+        SkillMatcher.configure(original_mode)
+
+if __name__ == "__main__":
+    main()
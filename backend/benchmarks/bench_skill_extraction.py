@@ -0,0 +1,95 @@
+"""
+Before/after latency benchmark for skill extraction.
+
+"before" reproduces the original per-request behaviour (spacy.load plus a
+freshly built PhraseMatcher on every call); "after" goes through
+SkillMatcher, which keeps the model and the compiled matcher warm.
+With --compare-modes it also reports throughput for every matcher mode and
+checks that they all extract the same skills.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_skill_extraction --runs 20 --compare-modes
+"""
+import argparse
+import statistics
+import time
+from unittest.mock import patch
+
+import spacy
+from spacy.matcher import PhraseMatcher
+
+from app.services import cv_service
+from app.services.skill_matcher import SkillMatcher, SKILL_LABELS, SPACY_MODEL, MATCHER_MODES
+from benchmarks.corpus import build_vocabulary, build_cv
+
+def legacy_extract_skills(text, vocabulary):
+    nlp = spacy.load(SPACY_MODEL)
+    doc = nlp(text.lower())
+    matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+    for category, label in SKILL_LABELS.items():
+        matcher.add(label, [nlp(skill) for skill in vocabulary[category]])
+    return matcher(doc)
+
+def measure(fn, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "p50_ms": round(statistics.median(timings), 2),
+        "mean_ms": round(statistics.mean(timings), 2),
+        "max_ms": round(max(timings), 2),
+    }
+
+def compare_modes(vocabulary, texts):
+    results = {}
+    baseline = None
+    for mode in MATCHER_MODES:
+        SkillMatcher.configure(mode)
+        with patch.object(cv_service, "load_skill_vocabulary", return_value=vocabulary), \
+             patch.object(cv_service, "get_skills_version", return_value=0):
+            cv_service.extract_skills(texts[0])
+            start = time.perf_counter()
+            extracted = [cv_service.extract_skills(text) for text in texts]
+            elapsed = time.perf_counter() - start
+        extracted = [{category: sorted(skills) for category, skills in skills.items()} for skills in extracted]
+        if baseline is None:
+            baseline = extracted
+        results[mode] = {
+            "cvs_per_sec": round(len(texts) / elapsed, 1),
+            "same_matches_as_pipeline": extracted == baseline,
+        }
+    return results
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--runs", type=int, default=20)
+    arg_parser.add_argument("--skills", type=int, default=400)
+    arg_parser.add_argument("--compare-modes", action="store_true")
+    args = arg_parser.parse_args()
+
+    vocabulary = build_vocabulary(args.skills)
+    text = build_cv(vocabulary)
+
+    before = measure(lambda: legacy_extract_skills(text, vocabulary), args.runs)
+
+    SkillMatcher.configure("pipeline")
+    with patch.object(cv_service, "load_skill_vocabulary", return_value=vocabulary), \
+         patch.object(cv_service, "get_skills_version", return_value=0):
+        cv_service.extract_skills(text)
+        after = measure(lambda: cv_service.extract_skills(text), args.runs)
+
+    print(f"model={SPACY_MODEL} mode=pipeline skills={args.skills} runs={args.runs}")
+    print(f"before (load + build per request): {before}")
+    print(f"after  (warm model + matcher):     {after}")
+    print(f"p50 speedup: {before['p50_ms'] / after['p50_ms']:.1f}x")
+
+    if args.compare_modes:
+        texts = [build_cv(vocabulary, seed=seed) for seed in range(args.runs * 5)]
+        for mode, result in compare_modes(vocabulary, texts).items():
+            print(f"{mode:<10} {result}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compare two benchmark suite results and flag regressions.
+
+A benchmark regresses when its p50 grew by more than --threshold (10% by
+default) and by more than --min-delta-ms (0.05 ms, so microsecond noise in
+the fastest stages is ignored) over the baseline. Exits with status 1 when anything regressed, so
+it can gate a CI job. Results are only comparable when the corpus and
+settings match; differences in the recorded metadata are printed first.
+
+    python -m benchmarks.compare baseline.json current.json --threshold 0.1
+"""
+import argparse
+import json
+import sys
+
+COMPARED_META = ("corpus_sha256", "runs", "skills", "spacy_model", "pdf_backend", "python", "cpu_count")
+
+def compare(baseline, current, threshold, min_delta_ms=0.0, metric="p50_ms"):
+    """
+    Returns (rows, regressions): one (name, baseline, current, ratio) row per
+    benchmark present in both results, and the names that regressed.
+    """
+    rows = []
+    regressions = []
+    for name in sorted(set(baseline["benchmarks"]) & set(current["benchmarks"])):
+        before = baseline["benchmarks"][name][metric]
+        after = current["benchmarks"][name][metric]
+        ratio = after / before if before else float("inf")
+        rows.append((name, before, after, ratio))
+        if ratio > 1 + threshold and after - before > min_delta_ms:
+            regressions.append(name)
+    return rows, regressions
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("baseline")
+    arg_parser.add_argument("current")
+    arg_parser.add_argument("--threshold", type=float, default=0.10)
+    arg_parser.add_argument("--min-delta-ms", type=float, default=0.05)
+    arg_parser.add_argument("--metric", default="p50_ms", choices=["p50_ms", "p95_ms", "mean_ms", "min_ms"])
+    args = arg_parser.parse_args()
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.current) as file:
+        current = json.load(file)
+
+    for key in COMPARED_META:
+        if baseline["meta"].get(key) != current["meta"].get(key):
+            print(f"warning: {key} differs: {baseline['meta'].get(key)} -> {current['meta'].get(key)}")
+    for name in sorted(set(baseline["benchmarks"]) ^ set(current["benchmarks"])):
+        print(f"warning: {name} is only in one of the results")
+
+    rows, regressions = compare(baseline, current, args.threshold, args.min_delta_ms, args.metric)
+    print(f"{'benchmark':<24} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, before, after, ratio in rows:
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"{name:<24} {before:>10.3f}ms {after:>10.3f}ms {(ratio - 1) * 100:>+8.1f}%{flag}")
+
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
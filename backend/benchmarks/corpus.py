@@ -0,0 +1,72 @@
+"""
+Deterministic synthetic CVs for the benchmarks.
+
+Every CV is generated from a seed, so the same corpus is produced on every
+machine and results can be compared across commits.
+"""
+import io
+import random
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from app.services.skill_matcher import SKILL_LABELS
+
+WORDS = ["developed", "maintained", "services", "team", "using", "and", "with",
+         "production", "scalable", "designed", "data", "pipelines", "for", "clients"]
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+def build_vocabulary(size):
+    per_category = max(1, size // len(SKILL_LABELS))
+    return {
+        category: [f"{category[:4]}skill{i}" for i in range(per_category)]
+        for category in SKILL_LABELS
+    }
+
+def build_cv(vocabulary, words=800, seed=0, skill_density=0.05, jobs=3):
+    """
+    Return the text of a CV with a name, a work experience section holding
+    `jobs` date ranges, and `words` words of which `skill_density` are skills.
+    """
+    rng = random.Random(seed)
+    skills = [skill for names in vocabulary.values() for skill in names]
+
+    lines = [f"Candidate {seed}", "Summary"]
+    body = [rng.choice(skills) if rng.random() < skill_density else rng.choice(WORDS) for _ in range(words)]
+    lines.extend(" ".join(body[i:i + 12]) for i in range(0, len(body), 12))
+
+    lines.append("Work Experience")
+    year = 2010 + rng.randint(0, 5)
+    for job in range(jobs):
+        start_month, end_month = rng.choice(MONTHS), rng.choice(MONTHS)
+        end = "Present" if job == jobs - 1 else f"{end_month} {year + 2}"
+        lines.append(f"Software Engineer {start_month} {year} - {end}")
+        year += 2
+    lines.append("Education")
+    lines.append("Computer Science")
+    return "\n".join(lines)
+
+def render_pdf(text, lines_per_page=45):
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+    for i, line in enumerate(text.split("\n")):
+        if i and i % lines_per_page == 0:
+            c.showPage()
+        c.drawString(40, height - 40 - (i % lines_per_page) * 16, line)
+    c.save()
+    return buffer.getvalue()
+
+def build_corpus(vocabulary, sizes=(200, 800, 3000), densities=(0.02, 0.05, 0.1), per_shape=2):
+    """
+    Return a list of (name, text) pairs covering every CV length / skill density combination.
+    """
+    corpus = []
+    seed = 0
+    for words in sizes:
+        for density in densities:
+            for _ in range(per_shape):
+                corpus.append((f"cv-{words}w-{density}d-{seed}", build_cv(vocabulary, words=words, seed=seed, skill_density=density)))
+                seed += 1
+    return corpus
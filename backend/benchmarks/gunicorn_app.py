@@ -0,0 +1,13 @@
+"""
+WSGI entry point for bench_gunicorn_workers: the real app with Firestore
+replaced by the in-memory fake seeded with the benchmark vocabulary.
+"""
+from app import create_app
+from app.services import firestore_service
+from benchmarks.corpus import build_vocabulary
+from benchmarks.suite import seed_firestore
+from tests.fakes import FakeAsyncFirestoreClient
+
+firestore_service.db = seed_firestore(build_vocabulary(2000))
+firestore_service.async_db = FakeAsyncFirestoreClient(firestore_service.db)
+app = create_app()
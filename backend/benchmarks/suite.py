@@ -0,0 +1,178 @@
+"""
+Benchmark suite for the CV analysis engine, with JSON output for comparing
+commits (see benchmarks/compare.py).
+
+Runs every stage of /api/upload_cv on its own over the synthetic corpus
+(text extraction, skill extraction, experience parsing, scoring, report
+rendering) and then end to end through score_cv_upload with the report
+rendered and uploaded inline. Firestore is the in-memory fake from
+tests/fakes.py, seeded with the benchmark vocabulary, and GCS is the local
+fake server, so nothing leaves the machine.
+
+Run from the backend directory:
+
+    python -m benchmarks.suite --runs 3 --output baseline.json
+"""
+import argparse
+import hashlib
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from concurrent.futures import Future
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from app.db.storage_init import StorageClient
+from app.services import cv_service, firestore_service
+from app.services.cache_service import CVResultCache
+from app.services.cv_analysis import CVAnalysis
+from app.services.firestore_service import SKILL_CATEGORIES
+from app.services.pdf_service import PDF_BACKEND, extract_text_from_pdf
+from app.services.skill_matcher import SPACY_MODEL
+from benchmarks.corpus import build_vocabulary, build_corpus, render_pdf
+from tests.fakes import FakeAsyncFirestoreClient, FakeFirestoreClient, FakeGCSServer
+
+JOB_TITLE = "Backend Developer"
+JOB_REQUIRED_EXPERIENCE = "2-5"
+
+def job_requirements(vocabulary):
+    return {category: names[:4] for category, names in vocabulary.items()}
+
+def seed_firestore(vocabulary):
+    category_names = {category: name for name, category in SKILL_CATEGORIES.items()}
+    skills = {
+        skill: {"name": skill, "category": category_names[category], "type": [category]}
+        for category, names in vocabulary.items()
+        for skill in names
+    }
+    return FakeFirestoreClient({firestore_service.FIRESTORE_SKILLS_COLLECTION: skills})
+
+def summarize(timings):
+    timings = sorted(timings)
+    return {
+        "n": len(timings),
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        "mean_ms": round(statistics.mean(timings), 3),
+        "min_ms": round(timings[0], 3),
+        "max_ms": round(timings[-1], 3),
+    }
+
+def measure(fn, items, runs):
+    fn(items[0])
+    timings = []
+    for _ in range(runs):
+        for item in items:
+            start = time.perf_counter()
+            fn(item)
+            timings.append((time.perf_counter() - start) * 1000)
+    return summarize(timings)
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(runs, skills, only=None):
+    vocabulary = build_vocabulary(skills)
+    corpus = build_corpus(vocabulary)
+    texts = [text for _, text in corpus]
+    pdfs = [render_pdf(text) for text in texts]
+    requirements = job_requirements(vocabulary)
+    analyses = [CVAnalysis.from_text(text, cv_service.extract_skills(text)) for text in texts]
+
+    def score(analysis):
+        cv_service.calculate_cv_score(analysis, requirements, JOB_REQUIRED_EXPERIENCE, JOB_TITLE)
+
+    def report(analysis):
+        cv_service.generate_cv_report(
+            42.0, JOB_TITLE, analysis.candidate_name, analysis.skills, requirements, analysis.experience_years, 2, 5
+        )
+
+    def end_to_end(pdf):
+        # Every call is a first upload: no cached result, no stored features.
+        firestore_service.db.data.pop(firestore_service.FIRESTORE_CV_FEATURES_COLLECTION, None)
+        with patch.object(cv_service, "cv_result_cache", CVResultCache(max_size=1)):
+            cv_service.score_cv_upload(pdf, requirements, JOB_REQUIRED_EXPERIENCE, JOB_TITLE)
+
+    def run_report_inline(task, *args):
+        job_id = str(uuid.uuid4())
+        upload = task(job_id, *args)
+        if isinstance(upload, Future):
+            upload.result()
+        return job_id
+
+    # Scoring alone must not render reports; end to end renders and uploads them inline.
+    skip_report = lambda task, *args: None
+    benchmarks = {
+        "extract_text_from_pdf": (lambda pdf: extract_text_from_pdf(io.BytesIO(pdf)), pdfs, skip_report),
+        "extract_skills": (cv_service.extract_skills, texts, skip_report),
+        "experience": (lambda text: cv_service.calculate_experience_years(cv_service.extract_experience(text)), texts, skip_report),
+        "calculate_cv_score": (score, analyses, skip_report),
+        "generate_cv_report": (report, analyses, skip_report),
+        "end_to_end": (end_to_end, pdfs, run_report_inline),
+    }
+
+    results = {}
+    for name, (fn, items, submit_report) in benchmarks.items():
+        if only and name not in only:
+            continue
+        with patch.object(cv_service, "submit_report_job", submit_report):
+            results[name] = measure(fn, items, runs)
+        print(f"{name:<24} p50={results[name]['p50_ms']:9.3f} ms  p95={results[name]['p95_ms']:9.3f} ms", file=sys.stderr)
+
+    meta = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "spacy_model": SPACY_MODEL,
+        "pdf_backend": PDF_BACKEND,
+        "runs": runs,
+        "skills": skills,
+        "corpus_cvs": len(texts),
+        "corpus_sha256": hashlib.sha256("\0".join(texts).encode("utf-8")).hexdigest(),
+    }
+    return {"meta": meta, "benchmarks": results}
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--runs", type=int, default=3)
+    arg_parser.add_argument("--skills", type=int, default=2000)
+    arg_parser.add_argument("--only", nargs="+", help="Run only these benchmarks.")
+    arg_parser.add_argument("--output", help="Write the JSON results to this file instead of stdout.")
+    args = arg_parser.parse_args()
+
+    logging.getLogger("pdfminer").setLevel(logging.ERROR)
+    with FakeGCSServer(buckets=["reports"]) as gcs_server:
+        os.environ["STORAGE_EMULATOR_HOST"] = gcs_server.endpoint
+        os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "ijob-bench")
+        os.environ["FLASK_FIREBASE_STORAGE_BUCKET"] = "reports"
+        StorageClient.reset()
+        # Services log with print; keep stdout for the JSON.
+        fake_db = seed_firestore(build_vocabulary(args.skills))
+        with patch.object(firestore_service, "db", fake_db), \
+             patch.object(firestore_service, "async_db", FakeAsyncFirestoreClient(fake_db)), \
+             redirect_stdout(sys.stderr):
+            firestore_service.invalidate_skills_cache()
+            results = run_suite(args.runs, args.skills, args.only)
+
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Gunicorn settings. With preload (the default) the app is imported and the
+model, matcher, skill catalog and PDF libraries are loaded once in the master;
+gc.freeze() then keeps those objects out of the collector so forked workers
+share their pages copy-on-write instead of each loading its own copy.
+
+    gunicorn -c gunicorn.conf.py flask_app:app
+"""
+import gc
+import os
+import tempfile
+import time
+
+# One metrics settings file per master, so POST /api/metrics reaches every worker.
+os.environ.setdefault("FLASK_METRICS_SETTINGS_FILE", os.path.join(tempfile.gettempdir(), f"ijob-metrics-{os.getpid()}.json"))
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+workers = int(os.getenv("GUNICORN_WORKERS", "1"))
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+# CV parsing and matching run on a process pool per worker instead of on the
+# request threads; by default the CPUs are split between the workers' pools.
+os.environ.setdefault("FLASK_CV_PROCESSES", str(max(1, (os.cpu_count() or 1) // workers)))
+
+_forked_at = {}
+
+def when_ready(server):
+    if not preload_app:
+        return
+    from app.db.firebase_init import reset_firebase_app
+    from app.services.async_io_service import stop_io_loop
+    from app.services.warmup_service import PRELOAD_STEPS, warm_up
+    from app.services.firestore_service import preload_skill_catalog, reset_db
+    from app.utils.token_cache import stop_cert_refresher
+
+    start = time.perf_counter()
+    # The master never calls Firestore over gRPC: gRPC threads and channels do
+    # not survive fork. The catalog is read over HTTP, and without it the
+    # matcher is left for the workers to build.
+    steps = PRELOAD_STEPS
+    try:
+        preload_skill_catalog()
+    except Exception as e:
+        server.log.warning(f"Skill catalog preload failed: {e}")
+        steps = tuple(step for step in PRELOAD_STEPS if step != "skill_matcher")
+    _, steps_ms, errors = warm_up(only=steps)
+    # Keep the loaded data, but no thread or connection may be inherited by workers.
+    stop_cert_refresher()
+    stop_io_loop()
+    reset_db()
+    reset_firebase_app()
+    gc.collect()
+    gc.freeze()
+    server.log.info(
+        f"Preloaded in {(time.perf_counter() - start) * 1000:.0f} ms: {steps_ms}"
+        + (f", failed: {errors}" if errors else "")
+    )
+
+def pre_fork(server, worker):
+    _forked_at[worker.age] = time.perf_counter()
+
+def post_fork(server, worker):
+    from app.db.firebase_init import reset_firebase_app
+    from app.db.storage_init import StorageClient
+    from app.services.firestore_service import reset_db
+    from app.utils.token_cache import start_cert_refresher
+
+    # Clients and threads from the master do not survive fork.
+    reset_db()
+    reset_firebase_app()
+    StorageClient.reset()
+    start_cert_refresher()
+
+def post_worker_init(worker):
+    from app.services.warmup_service import PRELOAD_STEPS, warm_up
+    from app.utils.metrics import process_stats
+
+    if not preload_app:
+        # Each worker loads its own copy before taking traffic.
+        warm_up(only=PRELOAD_STEPS)
+    # Pool processes cannot be inherited from the master; start them before taking traffic.
+    warm_up(only=("cv_executor",))
+    started = _forked_at.get(worker.age)
+    startup_ms = (time.perf_counter() - started) * 1000 if started is not None else float("nan")
+    stats = process_stats()
+    worker.log.info(
+        f"Worker {worker.pid} started in {startup_ms:.0f} ms, "
+        f"rss={stats.get('rss_bytes', 0) / 2**20:.1f} MiB pss={stats.get('pss_bytes', 0) / 2**20:.1f} MiB"
+    )
@@ -0,0 +1,24 @@
+import os
+# Tests never fetch Google's signing certificates.
+os.environ.setdefault("FLASK_CERT_REFRESH_INTERVAL", "0")
+
+import pytest
+from unittest.mock import patch
+from app.services import firestore_service
+from app.services.skill_matcher import SkillMatcher
+from tests.fakes import FakeAsyncFirestoreClient, FakeFirestoreClient
+
+@pytest.fixture(autouse=True)
+def reset_skill_matcher():
+    SkillMatcher.invalidate()
+    yield
+    SkillMatcher.invalidate()
+
+@pytest.fixture(autouse=True)
+def fake_firestore():
+    client = FakeFirestoreClient()
+    with patch.object(firestore_service, "db", client), \
+         patch.object(firestore_service, "async_db", FakeAsyncFirestoreClient(client)):
+        firestore_service.invalidate_skills_cache()
+        yield client
+        firestore_service.invalidate_skills_cache()
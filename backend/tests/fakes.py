@@ -0,0 +1,198 @@
+import copy
+import threading
+
+class FakeDocumentSnapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+class FakeDocumentReference:
+    def __init__(self, client, collection_name, doc_id):
+        self._client = client
+        self._collection_name = collection_name
+        self.id = doc_id
+
+    def get(self):
+        self._client.reads += 1
+        return FakeDocumentSnapshot(self.id, self._client.data[self._collection_name].get(self.id))
+
+    def set(self, data):
+        self._client.writes += 1
+        self._client.data[self._collection_name][self.id] = copy.deepcopy(data)
+
+class FakeCollectionReference:
+    def __init__(self, client, name):
+        self._client = client
+        self._name = name
+
+    def document(self, doc_id):
+        return FakeDocumentReference(self._client, self._name, doc_id)
+
+    def stream(self):
+        self._client.streams += 1
+        for doc_id, data in list(self._client.data[self._name].items()):
+            yield FakeDocumentSnapshot(doc_id, data)
+
+class FakeWriteBatch:
+    def __init__(self, client):
+        self._client = client
+        self._writes = []
+
+    def set(self, doc_ref, data, merge=False):
+        self._writes.append((doc_ref, data, merge))
+
+    def commit(self):
+        if len(self._writes) > 500:
+            raise ValueError("Maximum 500 writes allowed per request")
+        with self._client.lock:
+            self._client.commits += 1
+            for doc_ref, data, merge in self._writes:
+                docs = self._client.data[doc_ref._collection_name]
+                if merge and doc_ref.id in docs:
+                    docs[doc_ref.id] = {**docs[doc_ref.id], **copy.deepcopy(data)}
+                else:
+                    docs[doc_ref.id] = copy.deepcopy(data)
+        self._writes = []
+
+class FakeFirestoreClient:
+    """
+    In-memory stand-in for firestore.Client covering the calls the services make.
+    Counts round-trips so tests can assert on them.
+    """
+
+    def __init__(self, data=None):
+        self.data = {}
+        for collection_name, docs in (data or {}).items():
+            self.data[collection_name] = copy.deepcopy(docs)
+        self.reads = 0
+        self.writes = 0
+        self.streams = 0
+        self.batch_gets = 0
+        self.commits = 0
+        self.lock = threading.Lock()
+
+    def collection(self, name):
+        self.data.setdefault(name, {})
+        return FakeCollectionReference(self, name)
+
+    def get_all(self, refs):
+        self.batch_gets += 1
+        for ref in refs:
+            yield FakeDocumentSnapshot(ref.id, self.data[ref._collection_name].get(ref.id))
+
+    def batch(self):
+        return FakeWriteBatch(self)
+
+class FakeAsyncDocumentReference(FakeDocumentReference):
+    async def get(self):
+        return FakeDocumentReference.get(self)
+
+    async def set(self, data):
+        FakeDocumentReference.set(self, data)
+
+class FakeAsyncCollectionReference(FakeCollectionReference):
+    def document(self, doc_id):
+        return FakeAsyncDocumentReference(self._client, self._name, doc_id)
+
+    async def stream(self):
+        for snapshot in FakeCollectionReference.stream(self):
+            yield snapshot
+
+class FakeAsyncWriteBatch(FakeWriteBatch):
+    async def commit(self):
+        FakeWriteBatch.commit(self)
+
+class FakeAsyncFirestoreClient:
+    """
+    Stand-in for firestore.AsyncClient over the data and counters of a
+    FakeFirestoreClient, so sync and async code see the same documents.
+    """
+
+    def __init__(self, sync_client):
+        self.sync_client = sync_client
+
+    def collection(self, name):
+        self.sync_client.data.setdefault(name, {})
+        return FakeAsyncCollectionReference(self.sync_client, name)
+
+    async def get_all(self, refs):
+        for snapshot in self.sync_client.get_all(refs):
+            yield snapshot
+
+    def batch(self):
+        return FakeAsyncWriteBatch(self.sync_client)
+
+class FakeGCSServer:
+    """
+    Minimal local stand-in for the GCS JSON API, used through STORAGE_EMULATOR_HOST.
+    Supports bucket lookups, multipart uploads and object metadata reads, and
+    records every request it receives.
+    """
+
+    def __init__(self, buckets=("reports",)):
+        import http.server
+        import json
+        import re
+        from urllib.parse import urlparse, parse_qs, unquote
+
+        server = self
+        self.buckets = set(buckets)
+        self.objects = {}
+        self.requests = []
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body=None):
+                payload = json.dumps(body or {}).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                server.requests.append(("GET", url.path, parse_qs(url.query)))
+                bucket_match = re.fullmatch(r"/storage/v1/b/([^/]+)", url.path)
+                object_match = re.fullmatch(r"/storage/v1/b/([^/]+)/o/(.+)", url.path)
+                if bucket_match and bucket_match.group(1) in server.buckets:
+                    return self._reply(200, {"name": bucket_match.group(1)})
+                if object_match:
+                    key = (object_match.group(1), unquote(object_match.group(2)))
+                    if key in server.objects:
+                        return self._reply(200, {"bucket": key[0], "name": key[1]})
+                return self._reply(404, {"error": {"code": 404, "message": "Not Found"}})
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                server.requests.append(("POST", url.path, query))
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                upload_match = re.fullmatch(r"/upload/storage/v1/b/([^/]+)/o", url.path)
+                if not upload_match or upload_match.group(1) not in server.buckets:
+                    return self._reply(404, {"error": {"code": 404, "message": "Not Found"}})
+                metadata = json.loads(body.split(b"\r\n\r\n", 1)[1].split(b"\r\n", 1)[0])
+                data = body.split(b"\r\n\r\n", 2)[2].rsplit(b"\r\n--", 1)[0]
+                server.objects[(upload_match.group(1), metadata["name"])] = {
+                    "data": data,
+                    "predefinedAcl": query.get("predefinedAcl", [None])[0],
+                }
+                return self._reply(200, {"bucket": upload_match.group(1), "name": metadata["name"]})
+
+        self._httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.endpoint = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from app.services import async_io_service, firestore_service
+from app.services.async_io_service import run_io, submit_io
+
+def test_run_io_returns_results_and_raises_errors():
+    async def thread_name():
+        await asyncio.sleep(0)
+        return threading.current_thread().name
+
+    async def failing():
+        raise ValueError("boom")
+
+    assert run_io(thread_name()) == "io-loop"
+    with pytest.raises(ValueError, match="boom"):
+        run_io(failing())
+
+def test_requests_share_the_loop_concurrently():
+    # Ten requests each waiting 0.2s on I/O finish together, not one after another.
+    results = []
+
+    async def slow_io():
+        await asyncio.sleep(0.2)
+        return True
+
+    threads = [threading.Thread(target=lambda: results.append(run_io(slow_io()))) for _ in range(10)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [True] * 10
+    assert time.perf_counter() - start < 1.5
+
+def test_submit_io_does_not_wait():
+    release = threading.Event()
+
+    async def blocked():
+        await asyncio.to_thread(release.wait, 5)
+        return "done"
+
+    future = submit_io(blocked())
+    assert not future.done()
+    release.set()
+    assert future.result(5) == "done"
+
+def test_clients_are_reset_when_the_loop_is_replaced():
+    resets = []
+    with patch.object(async_io_service, "_reset_callbacks", [lambda: resets.append(1)]):
+        first = async_io_service.get_io_loop()
+        run_io(asyncio.sleep(0))
+        first.call_soon_threadsafe(first.stop)
+        async_io_service._thread.join(5)
+
+        second = async_io_service.get_io_loop()
+
+        assert second is not first
+        assert resets == [1]
+        assert run_io(asyncio.sleep(0, result="ok")) == "ok"
+
+def test_a_replaced_loop_gets_a_new_async_firestore_client():
+    with patch.object(firestore_service, "async_db", object()):
+        async_io_service._run_reset_callbacks()
+        assert firestore_service.async_db is None
@@ -0,0 +1,157 @@
+import asyncio
+import threading
+import time
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from firebase_admin import auth
+from flask import Flask, g, jsonify
+from unittest.mock import patch
+from app.services import async_io_service
+from app.utils import token_cache
+from app.utils.auth_decorator import firebase_auth_required
+from app.utils.token_cache import TokenCache, start_cert_refresher
+
+PRIVATE_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+def sign(uid, expires_in=3600):
+    now = int(time.time())
+    return jwt.encode({"uid": uid, "aud": "ijob", "iat": now, "exp": now + expires_in}, PRIVATE_KEY, algorithm="RS256")
+
+def verify_locally(id_token):
+    # Like auth.verify_id_token, which reports bad tokens as InvalidIdTokenError.
+    try:
+        return jwt.decode(id_token, PRIVATE_KEY.public_key(), algorithms=["RS256"], audience="ijob")
+    except jwt.InvalidTokenError as e:
+        raise auth.InvalidIdTokenError(str(e), cause=e)
+
+class Clock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+@pytest.fixture
+def client(clock):
+    app = Flask(__name__)
+
+    @app.route("/me")
+    @firebase_auth_required
+    def me():
+        return jsonify(g.firebase_user)
+
+    with patch.object(token_cache, "token_cache", TokenCache(max_size=2, ttl=300, clock=clock)), \
+         patch("app.utils.auth_decorator.auth.verify_id_token", side_effect=verify_locally) as mock_verify:
+        yield app.test_client(), mock_verify
+
+def get_me(client, id_token):
+    return client.get("/me", headers={"Authorization": f"Bearer {id_token}"})
+
+def test_repeated_token_is_verified_once(client):
+    client, mock_verify = client
+    id_token = sign("ana")
+
+    assert get_me(client, id_token).get_json()["uid"] == "ana"
+    assert get_me(client, id_token).get_json()["uid"] == "ana"
+
+    assert mock_verify.call_count == 1
+    stats = token_cache.token_cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+    assert stats["verify_seconds_total"] > 0
+
+def test_entries_expire_at_ttl_and_never_after_exp(client, clock):
+    client, mock_verify = client
+    short_lived = sign("ana", expires_in=60)
+    long_lived = sign("ion")
+    get_me(client, short_lived)
+    get_me(client, long_lived)
+
+    clock.now += 61
+    get_me(client, short_lived)
+    get_me(client, long_lived)
+    assert mock_verify.call_count == 3
+
+    clock.now += 300
+    get_me(client, long_lived)
+    assert mock_verify.call_count == 4
+
+def test_invalid_tokens_are_rejected_and_never_cached(client):
+    client, mock_verify = client
+    expired = sign("ana", expires_in=-10)
+
+    assert get_me(client, expired).status_code == 401
+    assert get_me(client, expired).status_code == 401
+    assert mock_verify.call_count == 2
+    assert token_cache.token_cache.stats()["verify_failures"] == 2
+    assert token_cache.token_cache.stats()["size"] == 0
+
+def test_cache_is_bounded(client):
+    client, _ = client
+    for uid in ["ana", "ion", "maria"]:
+        get_me(client, sign(uid))
+
+    assert token_cache.token_cache.stats()["size"] == 2
+
+def test_cert_refresher_prewarms_and_repeats():
+    fetched = threading.Semaphore(0)
+    with patch.object(token_cache, "fetch_signing_certificates", side_effect=fetched.release), \
+         patch.object(token_cache, "_refresher", None):
+        stop = start_cert_refresher(interval=0.01)
+        try:
+            assert start_cert_refresher(interval=0.01) is stop
+            assert fetched.acquire(timeout=5) and fetched.acquire(timeout=5)
+        finally:
+            stop.set()
+
+    assert start_cert_refresher(interval=0) is None
+
+def test_prefetch_runs_next_to_verification_and_never_fails_the_request(client):
+    _, mock_verify = client
+    app = Flask(__name__)
+    prefetched = threading.Event()
+    release = threading.Event()
+
+    async def slow_prefetch():
+        await asyncio.to_thread(release.wait, 5)
+        prefetched.set()
+
+    async def failing_prefetch():
+        raise RuntimeError("catalog unavailable")
+
+    @app.route("/prefetched")
+    @firebase_auth_required(prefetch=slow_prefetch)
+    def prefetched_view():
+        return jsonify(g.firebase_user)
+
+    @app.route("/failing")
+    @firebase_auth_required(prefetch=failing_prefetch)
+    def failing_view():
+        return jsonify(g.firebase_user)
+
+    test_client = app.test_client()
+    with patch.object(async_io_service, "IO_TIMEOUT", 0.1):
+        # The request does not wait for a prefetch slower than the I/O timeout.
+        assert get_me_at(test_client, "/prefetched", sign("ana")).get_json()["uid"] == "ana"
+        assert not prefetched.is_set()
+        release.set()
+        assert prefetched.wait(5)
+    assert get_me_at(test_client, "/failing", sign("ion")).get_json()["uid"] == "ion"
+    assert get_me_at(test_client, "/prefetched", sign("ana", expires_in=-10)).status_code == 401
+    assert mock_verify.call_count == 3
+
+def test_verification_outages_are_not_reported_as_bad_tokens(client):
+    client, mock_verify = client
+    mock_verify.side_effect = auth.CertificateFetchError("certificates unavailable", cause=None)
+
+    response = get_me(client, sign("ana"))
+
+    assert response.status_code == 503
+    assert token_cache.token_cache.stats()["size"] == 0
+
+def get_me_at(client, path, id_token):
+    return client.get(path, headers={"Authorization": f"Bearer {id_token}"})
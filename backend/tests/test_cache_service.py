@@ -0,0 +1,97 @@
+import hashlib
+from unittest.mock import patch
+from app.services.cache_service import CVResultCache, DiskCacheTier, FirestoreCacheTier, cv_cache_key
+from app.services.cv_analysis import CVAnalysis
+
+REQUIREMENTS = {"programming_languages": ["python", "go"], "frameworks": [], "tools": ["docker"], "certifications": []}
+RESULT = {"score": 80.0, "message": "Excellent match", "cv_report_url": None, "report_job_id": None}
+
+def test_cache_key_ignores_requirement_order_but_not_content():
+    key = cv_cache_key(b"%PDF-1 cv", REQUIREMENTS, "2-4", "Backend Developer", "v1")
+    reordered = {"tools": ["docker"], "programming_languages": ["go", "python"]}
+
+    assert cv_cache_key(b"%PDF-1 cv", reordered, " 2-4 ", "Backend Developer", "v1") == key
+    assert cv_cache_key(b"%PDF-1 other cv", REQUIREMENTS, "2-4", "Backend Developer", "v1") != key
+    assert cv_cache_key(b"%PDF-1 cv", {**REQUIREMENTS, "tools": []}, "2-4", "Backend Developer", "v1") != key
+    assert cv_cache_key(b"%PDF-1 cv", REQUIREMENTS, "3-5", "Backend Developer", "v1") != key
+    assert cv_cache_key(b"%PDF-1 cv", REQUIREMENTS, "2-4", "Backend Developer", "v2") != key
+
+def test_lru_evicts_oldest_and_counts_hits():
+    cache = CVResultCache(max_size=2)
+    cache.set("a", RESULT)
+    cache.set("b", RESULT)
+    assert cache.get("a") == RESULT
+    cache.set("c", RESULT)
+
+    assert cache.get("b") is None
+    assert cache.get("c") == RESULT
+    assert cache.stats() == {"hits": 2, "shared_hits": 0, "misses": 1, "size": 2, "max_size": 2}
+
+def test_disk_tier_is_shared_between_caches(tmp_path):
+    CVResultCache(max_size=2, shared_tier=DiskCacheTier(str(tmp_path))).set("key", RESULT)
+    other_worker = CVResultCache(max_size=2, shared_tier=DiskCacheTier(str(tmp_path)))
+
+    assert other_worker.get("key") == RESULT
+    assert other_worker.get("key") == RESULT
+    assert other_worker.stats()["shared_hits"] == 1
+    assert other_worker.stats()["hits"] == 1
+
+def test_firestore_tier_round_trip(fake_firestore):
+    CVResultCache(max_size=2, shared_tier=FirestoreCacheTier()).set("key", RESULT)
+
+    assert CVResultCache(max_size=2, shared_tier=FirestoreCacheTier()).get("key") == RESULT
+    assert fake_firestore.data["cv_analysis_cache"]["key"] == RESULT
+
+@patch('app.services.cv_service.calculate_cv_score', return_value=(90.0, "Excellent match", None))
+@patch('app.services.cv_service.analyse_pdf', return_value=CVAnalysis.from_text("cv text", {}))
+def test_repeated_upload_is_served_from_cache(mock_extract, mock_score):
+    from app.services.cv_service import score_cv_upload
+
+    with patch('app.services.cv_service.cv_result_cache', CVResultCache(max_size=4)):
+        first = score_cv_upload(b"%PDF-1 cv", REQUIREMENTS, "2-4", "Backend Developer")
+        second = score_cv_upload(b"%PDF-1 cv", REQUIREMENTS, "2-4", "Backend Developer")
+
+    cv_id = hashlib.sha256(b"%PDF-1 cv").hexdigest()
+    assert first == second == {"score": 90.0, "message": "Excellent match", "cv_report_url": None, "report_job_id": None, "cv_id": cv_id}
+    assert mock_extract.call_count == 1
+    assert mock_score.call_count == 1
+
+@patch('app.services.cv_service.calculate_cv_score', return_value=(40.0, "Weak match", "job-1"))
+@patch('app.services.cv_service.analyse_pdf', return_value=CVAnalysis.from_text("cv text", {}))
+def test_cached_report_url_is_resolved_and_lost_reports_are_rescored(mock_extract, mock_score):
+    from app.services.cv_service import score_cv_upload
+
+    cache = CVResultCache(max_size=4)
+    with patch('app.services.cv_service.cv_result_cache', cache):
+        with patch('app.services.cv_service.get_cv_report_status', return_value={"status": "pending", "cv_report_url": None}):
+            score_cv_upload(b"%PDF-1 cv", REQUIREMENTS, "2-4", "Backend Developer")
+            assert score_cv_upload(b"%PDF-1 cv", REQUIREMENTS, "2-4", "Backend Developer")["cv_report_url"] is None
+
+        with patch('app.services.cv_service.get_cv_report_status', return_value={"status": "ready", "cv_report_url": "https://reports/job-1.pdf"}):
+            assert score_cv_upload(b"%PDF-1 cv", REQUIREMENTS, "2-4", "Backend Developer")["cv_report_url"] == "https://reports/job-1.pdf"
+        # The URL is kept in the entry, so later hits need no lookup.
+        with patch('app.services.cv_service.get_cv_report_status') as mock_status:
+            assert score_cv_upload(b"%PDF-1 cv", REQUIREMENTS, "2-4", "Backend Developer")["cv_report_url"] == "https://reports/job-1.pdf"
+            mock_status.assert_not_called()
+        assert mock_score.call_count == 1
+
+        cache.set(cv_cache_key(b"%PDF-1 other", REQUIREMENTS, "2-4", "Backend Developer", "v1"), {**RESULT, "report_job_id": "lost"})
+        with patch('app.services.cv_service.get_cv_report_status', return_value=None), \
+             patch('app.services.cv_service.get_skills_version', return_value="v1"):
+            score_cv_upload(b"%PDF-1 other", REQUIREMENTS, "2-4", "Backend Developer")
+        assert mock_score.call_count == 2
+
+@patch('app.services.cv_service.get_cv_report_status', side_effect=ConnectionError("storage unavailable"))
+@patch('app.services.cv_service.calculate_cv_score', return_value=(40.0, "Weak match", "job-2"))
+@patch('app.services.cv_service.analyse_pdf', return_value=CVAnalysis.from_text("cv text", {}))
+def test_storage_outage_on_a_cache_hit_is_a_miss(mock_extract, mock_score, mock_status):
+    from app.services.cv_service import score_cv_upload
+
+    cache = CVResultCache(max_size=4)
+    cache.set(cv_cache_key(b"%PDF-1 cv", REQUIREMENTS, "2-4", "Backend Developer", "v1"), {**RESULT, "report_job_id": "job-1"})
+    with patch('app.services.cv_service.cv_result_cache', cache), \
+         patch('app.services.cv_service.get_skills_version', return_value="v1"):
+        result = score_cv_upload(b"%PDF-1 cv", REQUIREMENTS, "2-4", "Backend Developer")
+
+    assert result["report_job_id"] == "job-2"
+    mock_status.assert_called_once_with("job-1")
@@ -0,0 +1,73 @@
+import json
+import pickle
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from app.services.cv_analysis import CVAnalysis, extract_candidate_name, features_text
+
+TEXT = "\n  \n Ion Ionescu \nPython and Docker\nWork Experience\nEngineer\nJan 2020 - Present\nEducation"
+SKILLS = {"programming_languages": ["python"], "tools": ["docker", "docker"]}
+
+def test_from_text_parses_once_into_immutable_record():
+    analysis = CVAnalysis.from_text(TEXT, SKILLS, today=datetime(2025, 1, 10))
+
+    assert analysis.candidate_name == "Ion Ionescu"
+    assert analysis.periods == (((2020, 1), None),)
+    assert analysis.experience_years == 5.0
+    assert analysis.skills["tools"] == frozenset({"docker"})
+    assert analysis.skills["certifications"] == frozenset()
+    assert analysis.all_skills() == {"python", "docker"}
+
+    with pytest.raises(AttributeError):
+        analysis.experience_years = 10
+    with pytest.raises(TypeError):
+        analysis.skills["tools"] = frozenset()
+    with pytest.raises(AttributeError):
+        analysis.extra = 1
+
+def test_round_trips_through_pickle_and_json():
+    analysis = CVAnalysis.from_text(TEXT, SKILLS)
+
+    assert pickle.loads(pickle.dumps(analysis)) == analysis
+    assert CVAnalysis.from_dict(json.loads(json.dumps(analysis.to_dict()))) == analysis
+
+def test_candidate_name_skips_blank_lines():
+    assert extract_candidate_name("\r\n\t\nJane Roe\r\nRest") == "Jane Roe"
+    assert extract_candidate_name(" \n ") == "Unknown"
+
+@patch('app.services.cv_service.submit_report_job', return_value="job-1")
+def test_low_scores_hand_the_analysis_to_the_report_job(mock_submit):
+    from app.services.cv_service import calculate_cv_score, render_cv_report
+
+    analysis = CVAnalysis.from_text(TEXT, SKILLS)
+    job_requirements = {"programming_languages": ["python", "go"], "frameworks": [], "tools": [], "certifications": []}
+
+    score, _, report_job_id = calculate_cv_score(analysis, job_requirements, "1-3", "Backend Developer")
+
+    assert score == 50.0
+    assert report_job_id == "job-1"
+    task, *report_args = mock_submit.call_args.args
+    assert report_args == [50.0, "Backend Developer", analysis, job_requirements, 1, 3]
+
+    with patch('app.services.cv_service.suggest_career_paths', return_value=[]) as mock_suggest:
+        assert render_cv_report(*report_args).startswith(b"%PDF")
+    mock_suggest.assert_called_once_with(analysis)
+
+def test_features_are_firestore_safe_and_rebuild_the_analysis():
+    text = TEXT.replace("Education", "Mar 2018 - Feb 2021\nJun 2019 - Jan 2020\nJan 2020 - Present\nEducation")
+    analysis = CVAnalysis.from_text(text, SKILLS)
+    features = analysis.to_features("v1")
+
+    assert features["periods"] == [{"start": "2018-03", "end": "2021-02"}, {"start": "2020-01", "end": None}]
+    assert features["skills"]["tools"] == ["docker"]
+    assert not any(isinstance(item, list) for value in features["periods"] for item in value.values())
+    assert features_text(features) == text
+
+    rebuilt = CVAnalysis.from_features(features, today=datetime(2025, 1, 10))
+    assert rebuilt.skills == analysis.skills
+    assert rebuilt.candidate_name == "Ion Ionescu"
+    assert rebuilt.experience_years == CVAnalysis.from_text(text, SKILLS, today=datetime(2025, 1, 10)).experience_years
+    assert CVAnalysis.from_features(features, {"tools": ["git"]}).all_skills() == {"git"}
+
+    with patch('app.services.cv_analysis.CV_FEATURES_MAX_TEXT', 10):
+        assert features_text(analysis.to_features("v1")) is None
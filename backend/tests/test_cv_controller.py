@@ -0,0 +1,196 @@
+import io
+import pytest
+from unittest.mock import patch
+from reportlab.pdfgen import canvas
+from app import create_app
+from app.controllers import cv_controller
+from app.services.cv_executor import analyse_pdf
+from app.services.pdf_service import PDFParseTimeout
+
+def make_pdf(pages=1):
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer)
+    for i in range(pages):
+        c.drawString(40, 800, f"Python developer, page {i + 1}")
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config["MAX_CONTENT_LENGTH"] = 64 * 1024
+    with patch("app.utils.auth_decorator.auth.verify_id_token", return_value={"uid": "user"}):
+        yield app.test_client()
+
+def upload(client, data, filename="cv.pdf"):
+    return client.post(
+        "/api/upload_cv",
+        data={"file": (io.BytesIO(data), filename), "job_title": "Developer"},
+        headers={"Authorization": "Bearer token"},
+        content_type="multipart/form-data",
+    )
+
+@patch.object(cv_controller, "score_cv_upload")
+def test_upload_over_size_limit_is_rejected(score_cv_upload, client):
+    response = upload(client, b"%PDF-1.4" + b"0" * 128 * 1024)
+
+    assert response.status_code == 413
+    assert response.get_json()["max_bytes"] == 64 * 1024
+    score_cv_upload.assert_not_called()
+
+@patch.object(cv_controller, "score_cv_upload")
+def test_upload_without_pdf_header_is_rejected(score_cv_upload, client):
+    response = upload(client, b"MZ\x90\x00 definitely not a pdf")
+
+    assert response.status_code == 400
+    score_cv_upload.assert_not_called()
+
+@patch.object(cv_controller, "score_cv_upload")
+def test_upload_with_too_many_pages_is_rejected(score_cv_upload, client):
+    with patch.object(cv_controller, "CV_MAX_PAGES", 3):
+        response = upload(client, make_pdf(pages=4))
+
+    assert response.status_code == 413
+    score_cv_upload.assert_not_called()
+
+@patch.object(cv_controller, "score_cv_upload", side_effect=PDFParseTimeout("timed out"))
+def test_upload_parse_timeout_returns_422(score_cv_upload, client):
+    response = upload(client, make_pdf())
+
+    assert response.status_code == 422
+    score_cv_upload.assert_called_once()
+
+def test_valid_upload_is_scored(client):
+    pdf = make_pdf()
+    received = []
+
+    def score_cv_upload(file, *args):
+        received.append(file.read())
+        return {"score": 80, "message": "ok", "cv_report_url": None, "report_job_id": None}
+
+    with patch.object(cv_controller, "score_cv_upload", side_effect=score_cv_upload):
+        response = upload(client, pdf)
+
+    assert response.status_code == 200
+    assert received == [pdf]
+
+def test_analysis_past_its_deadline_raises():
+    with pytest.raises(PDFParseTimeout):
+        analyse_pdf(make_pdf(pages=3), "v1", lambda: {}, timeout=1e-9)
+
+def test_rerank_scores_stored_cvs_without_parsing(client, firm):
+    from app.services.cv_analysis import CVAnalysis
+    from app.services.ranking_service import CandidateMatrix
+
+    store = CandidateMatrix(max_size=10)
+    store.add("a" * 64, CVAnalysis("", {"programming_languages": ["python"]}, (), 3.0, "Ana Pop"))
+    store.add("b" * 64, CVAnalysis("", {"programming_languages": ["python", "go"]}, (), 3.0, "Ion Ionescu"))
+
+    with patch("app.services.cv_service.candidate_store", store), patch("app.services.cv_executor.analyse_pdf") as mock_analyse:
+        response = client.post(
+            "/api/rerank_cvs",
+            json={"cv_ids": ["a" * 64, "b" * 64, "c" * 64], "job_requirements": {"programming_languages": ["Python", "Go"]}, "job_required_experience": "2-5"},
+            headers={"Authorization": "Bearer token"},
+        )
+
+    body = response.get_json()
+    assert response.status_code == 200
+    assert [(result["candidate_name"], result["score"]) for result in body["results"]] == [("Ion Ionescu", 100.0), ("Ana Pop", 50.0)]
+    assert body["missing"] == ["c" * 64]
+    mock_analyse.assert_not_called()
+
+def test_rerank_rejects_malformed_requirements(client, firm):
+    response = client.post(
+        "/api/rerank_cvs",
+        json={"cv_ids": [], "job_requirements": {"programming_languages": "python"}},
+        headers={"Authorization": "Bearer token"},
+    )
+
+    assert response.status_code == 400
+
+def test_rerank_is_limited_to_firm_accounts(client, fake_firestore):
+    fake_firestore.data["firms"] = {"user": {"is_firm": False}}
+    with patch("app.controllers.cv_controller.rerank_cvs") as mock_rerank:
+        response = client.post("/api/rerank_cvs", json={"cv_ids": ["a" * 64]}, headers={"Authorization": "Bearer token"})
+
+    assert response.status_code == 403
+    mock_rerank.assert_not_called()
+
+def batch_score(client, data, authorized=True):
+    headers = {"Authorization": "Bearer token"} if authorized else {}
+    return client.post("/api/batch_score_cv", data=data, headers=headers, content_type="multipart/form-data")
+
+@pytest.fixture
+def firm(fake_firestore, monkeypatch):
+    monkeypatch.setenv("FLASK_FIREBASE_STORAGE_BUCKET", "cvs")
+    fake_firestore.data["firms"] = {"user": {"is_firm": True}}
+    fake_firestore.data["job_applications"] = {
+        "app1": {"firm_id": "user", "job_id": "job1"},
+        "app2": {"firm_id": "other-firm", "job_id": "job2"},
+    }
+    return fake_firestore
+
+@patch.object(cv_controller, "score_cv_batch", return_value=([], []))
+def test_batch_requires_a_signed_in_firm(score_cv_batch, client, fake_firestore):
+    fake_firestore.data["firms"] = {"user": {"is_firm": False}}
+
+    assert batch_score(client, {"gcs_paths": "[]"}, authorized=False).status_code == 401
+    assert batch_score(client, {"gcs_paths": '["job_applications_cvs/user_1.pdf"]'}).status_code == 403
+    score_cv_batch.assert_not_called()
+
+@pytest.mark.parametrize("data", [
+    {"gcs_paths": "not json"},
+    {"gcs_paths": '{"path": "a.pdf"}'},
+    {"gcs_paths": "[1, 2]"},
+    {"gcs_paths": '["job_applications_cvs/app1_1.pdf"]', "job_requirements": "not json"},
+    {"gcs_paths": '["job_applications_cvs/app1_1.pdf"]', "job_requirements": '["python"]'},
+    {},
+])
+@patch.object(cv_controller, "score_cv_batch", return_value=([], []))
+def test_batch_rejects_malformed_input(score_cv_batch, client, firm, data):
+    response = batch_score(client, data)
+
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+    score_cv_batch.assert_not_called()
+
+@patch.object(cv_controller, "score_cv_batch", return_value=([], []))
+def test_batch_only_reads_the_configured_bucket(score_cv_batch, client, firm):
+    response = batch_score(client, {"gcs_paths": '["gs://other-bucket/job_applications_cvs/app1_1.pdf"]'})
+
+    assert response.status_code == 400
+    score_cv_batch.assert_not_called()
+
+@patch.object(cv_controller, "score_cv_batch", return_value=([], []))
+def test_batch_is_limited(score_cv_batch, client, firm):
+    with patch.object(cv_controller, "BATCH_MAX_CVS", 2):
+        response = batch_score(client, {"gcs_paths": '["cvs/user_1.pdf", "cvs/user_2.pdf", "cvs/user_3.pdf"]'})
+
+    assert response.status_code == 400
+    score_cv_batch.assert_not_called()
+
+@pytest.mark.parametrize("path", [
+    "job_applications_cvs/app2_1700000000000.pdf",
+    "job_applications_cvs/someone-else_1700000000000.pdf",
+    "job_applications_cvs/app1.pdf",
+])
+@patch.object(cv_controller, "score_cv_batch", return_value=([], []))
+def test_batch_rejects_cvs_of_other_users(score_cv_batch, client, firm, path):
+    response = batch_score(client, {"gcs_paths": f'["gs://cvs/job_applications_cvs/app1_1.pdf", "{path}"]'})
+
+    assert response.status_code == 403
+    score_cv_batch.assert_not_called()
+
+@patch.object(cv_controller, "score_cv_batch", return_value=([], []))
+def test_batch_scores_own_cvs_and_applications_to_own_jobs(score_cv_batch, client, firm):
+    response = batch_score(client, {
+        "gcs_paths": '["gs://cvs/job_applications_cvs/app1_1700000000000.pdf", "uploads/user_1700000000001.pdf"]',
+        "job_requirements": '{"programming_languages": ["Python"]}',
+    })
+
+    assert response.status_code == 200
+    cv_sources, job_requirements, _ = score_cv_batch.call_args.args
+    assert [cv_id for cv_id, _ in cv_sources] == ["gs://cvs/job_applications_cvs/app1_1700000000000.pdf", "uploads/user_1700000000001.pdf"]
+    assert cv_sources[0][1].args == ("cvs", "job_applications_cvs/app1_1700000000000.pdf")
+    assert job_requirements == {"programming_languages": ["python"]}
@@ -0,0 +1,96 @@
+import io
+import time
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock, patch
+from reportlab.pdfgen import canvas
+from app.services import cv_executor
+from app.services.cv_executor import analyse_pdf, analyse_pdfs
+from app.services.pdf_service import PDFParseTimeout
+from app.services.skill_matcher import SkillMatcher
+
+VOCABULARY = {
+    "programming_languages": ["python", "go"],
+    "frameworks": ["flask"],
+    "tools": ["docker"],
+    "certifications": [],
+}
+
+def make_pdf(text):
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer)
+    c.drawString(40, 800, text)
+    c.save()
+    return buffer.getvalue()
+
+def test_process_pool_extracts_text_and_skills():
+    load_vocabulary = MagicMock(return_value=VOCABULARY)
+    original_mode = SkillMatcher.get_mode()
+    SkillMatcher.configure("blank")
+    try:
+        with patch.object(cv_executor, "CV_PROCESSES", 2):
+            analysis = analyse_pdf(make_pdf("Python and Flask developer"), "v1", load_vocabulary)
+            results = analyse_pdfs([make_pdf("Go and Docker"), b"not a pdf", make_pdf("Python")], "v1", load_vocabulary)
+            cv_executor._reset_pool()
+    finally:
+        SkillMatcher.configure(original_mode)
+
+    assert "Python and Flask developer" in analysis.text
+    assert analysis.candidate_name == "Python and Flask developer"
+    assert analysis.skills["programming_languages"] == {"python"}
+    assert analysis.skills["frameworks"] == {"flask"}
+
+    assert results[0].skills["programming_languages"] == {"go"}
+    assert results[0].skills["tools"] == {"docker"}
+    assert isinstance(results[1], Exception)
+    assert results[2].skills["programming_languages"] == {"python"}
+
+def test_long_texts_are_matched_in_chunks_against_the_deadline():
+    load_vocabulary = MagicMock(return_value=VOCABULARY)
+    text = "Python developer\n" + "filler line\n" * 20 + "Docker and Go"
+    original_mode = SkillMatcher.get_mode()
+    SkillMatcher.configure("trie")
+    try:
+        with patch.object(cv_executor, "MATCH_CHUNK_CHARS", 50):
+            assert len(list(cv_executor._text_chunks(text))) > 1
+            skills = cv_executor._match_skills(text, "v1", load_vocabulary, None)
+            with pytest.raises(PDFParseTimeout):
+                cv_executor._match_skills(text, "v1", load_vocabulary, time.monotonic() - 1)
+    finally:
+        SkillMatcher.configure(original_mode)
+
+    assert sorted(skills["programming_languages"]) == ["go", "python"]
+    assert skills["tools"] == ["docker"]
+
+def test_timed_out_analysis_kills_the_busy_worker():
+    with patch.object(cv_executor, "CV_PROCESSES", 1):
+        cv_executor.start_cv_executor()
+        pool = cv_executor._get_pool()
+        processes = list(pool._processes.values())
+        stuck = pool.submit(time.sleep, 60)
+
+        started = time.monotonic()
+        with pytest.raises(PDFParseTimeout):
+            analyse_pdf(make_pdf("Python"), "v1", lambda: VOCABULARY, timeout=0.5)
+
+        assert time.monotonic() - started < 5
+        for process in processes:
+            process.join(5)
+            assert not process.is_alive()
+        with pytest.raises(BrokenProcessPool):
+            stuck.result(5)
+        assert cv_executor._pool is not pool
+        cv_executor._reset_pool()
+
+def test_batch_survives_a_pool_killed_over_a_stuck_worker():
+    with patch.object(cv_executor, "CV_PROCESSES", 1), patch.object(cv_executor, "CV_PARSE_TIMEOUT", 2):
+        cv_executor.start_cv_executor()
+        stuck = cv_executor._get_pool().submit(time.sleep, 60)
+
+        results = analyse_pdfs([make_pdf("Go"), make_pdf("Python")], "v1", lambda: VOCABULARY)
+        cv_executor._reset_pool()
+
+    assert isinstance(results[0], PDFParseTimeout)
+    assert results[1].skills["programming_languages"] == {"python"}
+    with pytest.raises(BrokenProcessPool):
+        stuck.result(5)
@@ -1,5 +1,7 @@
 from app.services.cv_service import calculate_experience_years, extract_skills 
+from app.services.skill_matcher import SkillMatcher
 from unittest.mock import patch 
+import pytest
 
 def test_calculate_single_period():
     date_ranges = ["Jan 2022 - Jan 2024"]
@@ -42,3 +44,153 @@ def test_extract_skills_with_mocks(mock_get_langs, mock_get_frameworks, mock_get
     assert "aws certified developer" in extracted["certifications"]
 
     assert "java" not in extracted["programming_languages"]
+
+@pytest.mark.parametrize("mode", ["tokenizer", "blank", "trie"])
+@patch('app.services.cv_service.get_certifications')
+@patch('app.services.cv_service.get_tools')
+@patch('app.services.cv_service.get_frameworks')
+@patch('app.services.cv_service.get_programming_languages')
+def test_lightweight_modes_match_full_pipeline(mock_get_langs, mock_get_frameworks, mock_get_tools, mock_get_certs, mode):
+    mock_get_langs.return_value = ["python", "javascript", "c++", "c#"]
+    mock_get_frameworks.return_value = ["vue.js", "flask", "node.js"]
+    mock_get_tools.return_value = ["git", "docker", "google cloud"]
+    mock_get_certs.return_value = ["aws certified developer"]
+
+    sample_cv_text = """
+    Lucrez ca Python developer și am experiență cu JavaScript, C++ și C#.
+    Sunt familiar cu framework-urile Vue.js, Node.js și Flask.
+    Pentru versionare folosesc Git, pentru containere Docker și Google Cloud.
+    Dețin certificarea AWS Certified Developer. O altă competență este Java, dar nu e pe lista noastră.
+    """
+
+    original_mode = SkillMatcher.get_mode()
+    try:
+        SkillMatcher.configure("pipeline")
+        expected = {category: sorted(skills) for category, skills in extract_skills(sample_cv_text).items()}
+
+        SkillMatcher.configure(mode)
+        extracted = {category: sorted(skills) for category, skills in extract_skills(sample_cv_text).items()}
+    finally:
+        SkillMatcher.configure(original_mode)
+
+    assert extracted == expected
+
+@patch('app.services.cv_service.suggest_career_paths', return_value=["Backend Developer: keep going"])
+def test_reports_render_in_memory_without_cross_request_contamination(mock_suggest, tmp_path, monkeypatch):
+    import io
+    import threading
+    import pdfplumber
+    from concurrent.futures import ThreadPoolExecutor
+    from app.services.cv_service import generate_cv_report
+
+    monkeypatch.chdir(tmp_path)
+    job_requirements = {"programming_languages": ["python", "go"], "frameworks": ["flask"], "certifications": [], "tools": ["docker"]}
+    barrier = threading.Barrier(8)
+
+    def render(i):
+        extracted_skills = {"programming_languages": ["python"], "frameworks": [], "tools": [], "certifications": []}
+        barrier.wait()
+        return generate_cv_report(40 + i, f"Job {i}", f"Candidate {i}", extracted_skills, job_requirements, 1.5, 2, 4)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        reports = list(executor.map(render, range(8)))
+
+    for i, report in enumerate(reports):
+        assert report.startswith(b"%PDF")
+        with pdfplumber.open(io.BytesIO(report)) as pdf:
+            text = pdf.pages[0].extract_text()
+        assert f"Candidate Name: Candidate {i}" in text
+        assert f"CV Score: {40 + i} / 100" in text
+        assert f"Applied Job Title: Job {i}" in text
+        assert text.count("Candidate Name:") == 1
+
+    assert list(tmp_path.iterdir()) == []
+
+@patch('app.services.cv_service.get_certifications', return_value=[])
+@patch('app.services.cv_service.get_tools', return_value=["docker"])
+@patch('app.services.cv_service.get_frameworks', return_value=["flask"])
+@patch('app.services.cv_service.get_programming_languages', return_value=["python", "go"])
+def test_batch_scoring_ranks_cvs_and_reports_failures(mock_get_langs, mock_get_frameworks, mock_get_tools, mock_get_certs):
+    from app.services.cv_service import score_cv_batch
+
+    texts = {
+        b"weak": "Ana Pop\nI know Docker.",
+        b"strong": "Ion Ionescu\nPython, Go, Flask and Docker.\nWork Experience\nJan 2015 - Jan 2020",
+        b"medium": "Maria Ene\nPython and Flask.",
+    }
+
+    def load(key):
+        if key == b"broken":
+            raise ValueError("not a PDF")
+        return key
+
+    job_requirements = {"programming_languages": ["python", "go"], "frameworks": ["flask"], "tools": ["docker"], "certifications": []}
+    sources = [(key.decode(), lambda key=key: load(key)) for key in [b"weak", b"broken", b"strong", b"medium"]]
+
+    with patch('app.services.cv_executor.extract_text_from_pdf', side_effect=lambda file, **kwargs: texts[file.read()]):
+        results, errors = score_cv_batch(sources, job_requirements, "0-10")
+
+    assert [result["id"] for result in results] == ["strong", "medium", "weak"]
+    assert [result["rank"] for result in results] == [1, 2, 3]
+    assert results[0]["score"] == 100.0
+    assert results[0]["candidate_name"] == "Ion Ionescu"
+    assert results[0]["experience_years"] == 5.0
+    assert results[1]["score"] == round(5 / 9 * 100, 2)
+    assert errors == [{"id": "broken", "error": "not a PDF"}]
+
+def test_rerank_uses_stored_features_and_re_extracts_outdated_ones(fake_firestore):
+    from app.services.cache_service import CVResultCache, cv_content_id
+    from app.services.cv_analysis import CVAnalysis
+    from app.services.cv_service import rerank_cvs, score_cv_upload
+    from app.services.ranking_service import CandidateMatrix
+
+    text = "Ion Ionescu\nPython and Docker\nWork Experience\nJan 2015 - Jan 2020"
+    vocabulary = {"programming_languages": ["python"], "frameworks": [], "tools": [], "certifications": []}
+    job_requirements = {"programming_languages": ["python"], "tools": ["docker"]}
+    cv_id = cv_content_id(b"%PDF-1 cv")
+    store = CandidateMatrix(max_size=10)
+
+    with patch('app.services.cv_service.analyse_pdf', return_value=CVAnalysis.from_text(text, {"programming_languages": ["python"]})) as mock_analyse, \
+         patch('app.services.cv_service.calculate_cv_score', return_value=(90.0, "Excellent match", None)), \
+         patch('app.services.cv_service.cv_result_cache', CVResultCache(max_size=4)), \
+         patch('app.services.cv_service.load_skill_vocabulary', lambda: vocabulary), \
+         patch('app.services.cv_service.get_skills_version', return_value="v1"), \
+         patch('app.services.cv_service.candidate_store', store):
+        score_cv_upload(b"%PDF-1 cv", job_requirements, "2-4", "Backend Developer")
+        stored = fake_firestore.data["cv_features"][cv_id]
+        assert stored["skills_version"] == "v1"
+        assert stored["periods"] == [{"start": "2015-01", "end": "2020-01"}]
+
+        # A fresh worker has nothing in memory and scores from Firestore.
+        with patch('app.services.cv_service.candidate_store', CandidateMatrix(max_size=10)):
+            results, missing = rerank_cvs([cv_id, "f" * 64], job_requirements, "2-4")
+        assert [(result["score"], result["experience_years"]) for result in results] == [(75.0, 5.0)]
+        assert missing == ["f" * 64]
+
+        # The vocabulary gained Docker: the stored text is matched again, no PDF is parsed.
+        vocabulary["tools"] = ["docker"]
+        with patch('app.services.cv_service.get_skills_version', return_value="v2"):
+            results, _ = rerank_cvs([cv_id], job_requirements, "2-4")
+            assert [result["score"] for result in results] == [100.0]
+            assert fake_firestore.data["cv_features"][cv_id]["skills_version"] == "v2"
+            assert fake_firestore.data["cv_features"][cv_id]["skills"]["tools"] == ["docker"]
+
+            # Re-uploading the same PDF reuses the refreshed features.
+            with patch('app.services.cv_service.candidate_store', CandidateMatrix(max_size=10)):
+                score_cv_upload(b"%PDF-1 cv", {"tools": ["docker"]}, "2-4", "Backend Developer")
+
+    assert mock_analyse.call_count == 1
+
+def test_current_stored_analyses_are_not_matched_again(fake_firestore):
+    from app.services.cv_analysis import CVAnalysis
+    from app.services.cv_service import load_stored_analyses, save_cv_features
+
+    analysis = CVAnalysis.from_text("Ana Pop\nPython", {"programming_languages": ["python"]})
+    save_cv_features({"a" * 64: analysis.to_features("v1")})
+
+    with patch('app.services.cv_service.match_skills_batch') as mock_match:
+        analyses = load_stored_analyses(["a" * 64, "b" * 64], "v1")
+
+    assert analyses["a" * 64][0].skills == analysis.skills
+    assert "b" * 64 not in analyses
+    mock_match.assert_not_called()
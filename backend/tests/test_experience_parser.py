@@ -0,0 +1,38 @@
+from datetime import datetime
+from app.services.experience_parser import calculate_experience_years, extract_experience, extract_experience_periods, parse_date_range, total_experience_years
+
+TODAY = datetime(2025, 6, 15)
+
+CV = """Ion Ionescu
+Summary
+Backend developer.
+Work Experience
+Senior Engineer, Acme Sept. 2021 – Present
+Engineer, Initech
+  January 2018 - Dec 2021
+Intern Jun 2017 - Aug 2017
+Education
+BSc Jan 2013 - Jun 2017"""
+
+def test_extracts_date_ranges_from_experience_section_only():
+    assert extract_experience(CV) == ["Sept. 2021 – Present", "January 2018 - Dec 2021", "Jun 2017 - Aug 2017"]
+    assert extract_experience_periods(CV) == [((2021, 9), None), ((2018, 1), (2021, 12)), ((2017, 6), (2017, 8))]
+
+def test_heading_sections_are_not_captured():
+    # A section that mentions "work" counts as a heading, like in the original scanner.
+    text = "Experience\nWorked at Acme Jan 2020 - Present\nBuilt Feb 2015 - Feb 2016"
+    assert extract_experience(text) == ["Feb 2015 - Feb 2016"]
+
+def test_ongoing_period_uses_current_month():
+    assert parse_date_range("Sept. 2021 – Present") == ((2021, 9), None)
+    assert total_experience_years([((2023, 6), None)], today=TODAY) == 2.0
+
+def test_overlapping_periods_are_counted_once():
+    years = calculate_experience_years(["Jan 2018 - Dec 2021", "Jun 2020 - Jun 2022", "Jan 2023 - Jan 2024"], today=TODAY)
+    assert years == 5.42
+
+def test_invalid_and_reversed_ranges_are_ignored():
+    assert calculate_experience_years(["Jan 2022 - Jan 2020", "sometime - later", "Jan 2020"]) == 0.0
+
+def test_unusual_formats_fall_back_to_dateutil():
+    assert parse_date_range("03/2019 - 2020-05") == ((2019, 3), (2020, 5))
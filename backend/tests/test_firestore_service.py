@@ -0,0 +1,149 @@
+import asyncio
+from unittest.mock import patch
+from app.services import firestore_service
+from app.services.async_io_service import run_io
+from app.services.firestore_service import get_skill_catalog, get_frameworks, get_programming_languages, get_types_of_skill, get_skills_version, upload_skills, get_cv_features_async, set_cv_features_async, refresh_skill_catalog_async
+import json
+
+SKILLS = {
+    "Python": {"name": "Python", "category": "programming_language", "type": ["backend", "data"]},
+    "Flask": {"name": "Flask", "category": "framework", "type": ["backend"]},
+    "Docker": {"name": "Docker", "category": "tool", "type": ["devops"]},
+}
+
+def test_catalog_is_fetched_once_and_indexed(fake_firestore):
+    fake_firestore.data["skills"] = dict(SKILLS)
+
+    assert get_programming_languages() == ["python"]
+    assert get_frameworks() == ["flask"]
+    assert get_types_of_skill("docker") == ["devops"]
+    get_skills_version()
+
+    assert fake_firestore.streams == 1
+    assert fake_firestore.reads == 0
+
+def test_catalog_refreshes_after_ttl(fake_firestore):
+    fake_firestore.data["skills"] = dict(SKILLS)
+    get_skill_catalog()
+
+    with patch.object(firestore_service, "SKILLS_CACHE_TTL", 0):
+        get_skill_catalog()
+
+    assert fake_firestore.streams == 2
+
+def test_upload_invalidates_catalog_and_changes_version(fake_firestore):
+    fake_firestore.data["skills"] = dict(SKILLS)
+    version = get_skills_version()
+
+    upload_skills(json.dumps([{"name": "Vue.js", "category": "framework", "type": ["frontend"]}]))
+
+    assert get_frameworks() == ["flask", "vue.js"]
+    assert get_skills_version() != version
+
+def test_upload_skills_uses_bulk_reads_and_batched_writes(fake_firestore):
+    fake_firestore.data["skills"] = {"skill0": {"name": "skill0", "category": "tool"}}
+    skills = [{"name": f"skill{i}", "category": "tool"} for i in range(1200)]
+    skills.append({"name": "skill1", "category": "tool"})
+
+    summary = upload_skills(json.dumps(skills))
+
+    assert summary == {"inserted": 1199, "aliases_updated": 0, "skipped": 2}
+    assert len(fake_firestore.data["skills"]) == 1200
+    assert fake_firestore.batch_gets == 3
+    assert fake_firestore.commits == 3
+    assert fake_firestore.reads == 0
+    assert fake_firestore.writes == 0
+
+def test_cv_features_chunks_are_read_and_written_on_the_io_loop(fake_firestore):
+    features = {f"cv{i}": {"skills_version": "v1", "index": i} for i in range(1200)}
+
+    run_io(set_cv_features_async(features))
+    stored = run_io(get_cv_features_async([*features, "missing", "cv0"]))
+
+    assert stored == features
+    assert fake_firestore.commits == 3
+    assert fake_firestore.batch_gets == 3
+
+def test_concurrent_async_refreshes_load_the_catalog_once(fake_firestore):
+    fake_firestore.data["skills"] = dict(SKILLS)
+
+    async def refresh_many():
+        return await asyncio.gather(*(refresh_skill_catalog_async() for _ in range(5)))
+
+    catalogs = run_io(refresh_many())
+
+    assert len({id(catalog) for catalog in catalogs}) == 1
+    assert fake_firestore.streams == 1
+    assert get_skill_catalog() is catalogs[0]
+    assert fake_firestore.streams == 1
+
+def test_catalog_maps_aliases_to_canonical_names(fake_firestore):
+    fake_firestore.data["skills"] = {
+        "JavaScript": {"name": "JavaScript", "category": "programming_language", "aliases": ["JS", "ECMAScript"]},
+        "Java": {"name": "Java", "category": "programming_language", "aliases": ["JavaScript", "JS"]},
+    }
+
+    assert firestore_service.get_skill_aliases() == {"ecmascript": "javascript", "js": "java"}
+
+def test_upload_adds_new_aliases_to_stored_skills(fake_firestore):
+    fake_firestore.data["skills"] = {"Kubernetes": {"name": "Kubernetes", "category": "tool", "aliases": ["kube"]}}
+    version = get_skills_version()
+
+    summary = upload_skills(json.dumps([
+        {"name": "Kubernetes", "category": "tool", "aliases": ["kube", "k8s"]},
+        {"name": "PostgreSQL", "category": "tool", "aliases": ["Postgres"]},
+    ]))
+
+    assert summary == {"inserted": 1, "aliases_updated": 1, "skipped": 0}
+    assert fake_firestore.data["skills"]["Kubernetes"] == {"name": "Kubernetes", "category": "tool", "aliases": ["kube", "k8s"]}
+    assert firestore_service.get_skill_aliases() == {"kube": "kubernetes", "k8s": "kubernetes", "postgres": "postgresql"}
+    assert get_skills_version() != version
+
+def test_request_joins_the_reload_started_by_its_prefetch(fake_firestore):
+    from app.services.async_io_service import submit_io
+
+    fake_firestore.data["skills"] = dict(SKILLS)
+    stale = get_skill_catalog()
+    stale.loaded_at -= firestore_service.SKILLS_CACHE_TTL
+    load = firestore_service.load_skill_catalog_async
+
+    async def slow_load():
+        await asyncio.sleep(0.2)
+        return await load()
+
+    with patch.object(firestore_service, "load_skill_catalog_async", slow_load):
+        prefetch = submit_io(refresh_skill_catalog_async())
+        catalog = get_skill_catalog()
+
+    assert prefetch.result(5) is catalog is not stale
+    assert fake_firestore.streams == 2
+
+def test_master_preload_reads_the_catalog_over_http():
+    from unittest.mock import MagicMock
+
+    pages = [
+        {"documents": [{"name": "skills/Python", "fields": {
+            "name": {"stringValue": "Python"},
+            "category": {"stringValue": "programming_language"},
+            "type": {"arrayValue": {"values": [{"stringValue": "backend"}]}},
+            "aliases": {"arrayValue": {"values": [{"stringValue": "py"}]}},
+        }}], "nextPageToken": "next"},
+        {"documents": [{"name": "skills/Docker", "fields": {
+            "name": {"stringValue": "Docker"},
+            "category": {"stringValue": "tool"},
+            "type": {"arrayValue": {}},
+        }}]},
+    ]
+    session = MagicMock()
+    session.get.side_effect = [MagicMock(json=MagicMock(return_value=page)) for page in pages]
+    app = MagicMock(project_id="ijob")
+
+    with patch.object(firestore_service, "get_firebase_app", return_value=app), \
+         patch("google.auth.transport.requests.AuthorizedSession", return_value=session):
+        catalog = firestore_service.load_skill_catalog_over_http()
+
+    assert catalog.by_category["programming_languages"] == ["python"]
+    assert catalog.by_category["tools"] == ["docker"]
+    assert catalog.aliases == {"py": "python"}
+    assert session.get.call_args.kwargs["params"]["pageToken"] == "next"
+    session.close.assert_called_once()
@@ -0,0 +1,98 @@
+import io
+import pytest
+from unittest.mock import patch
+from reportlab.pdfgen import canvas
+from app import create_app
+from app.utils import metrics
+from app.utils.metrics import Histogram
+
+ADMIN = {"Authorization": "Basic YWRtaW46c2VjcmV0"}  # admin:secret
+
+def make_pdf():
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer)
+    c.drawString(40, 800, "Ana Pop, Python developer")
+    c.save()
+    return buffer.getvalue()
+
+@pytest.fixture
+def client():
+    app = create_app()
+    with patch.dict(metrics._settings, {"enabled": True, "server_timing": False}), \
+         patch("app.utils.auth_decorator.ADMIN_USERNAME", "admin"), \
+         patch("app.utils.auth_decorator.ADMIN_PASSWORD", "secret"), \
+         patch("app.utils.auth_decorator.auth.verify_id_token", return_value={"uid": "user"}), \
+         patch("app.services.cv_service.calculate_cv_score", return_value=(90.0, "Excellent match", None)):
+        yield app.test_client()
+
+def upload(client):
+    return client.post(
+        "/api/upload_cv",
+        data={"file": (io.BytesIO(make_pdf()), "cv.pdf"), "job_title": "Developer"},
+        headers={"Authorization": "Bearer token"},
+        content_type="multipart/form-data",
+    )
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency.", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, 'pdf "text"')
+
+    assert histogram.render()[2:] == [
+        'latency_seconds_bucket{stage="pdf \\"text\\"",le="0.1"} 2',
+        'latency_seconds_bucket{stage="pdf \\"text\\"",le="1.0"} 3',
+        'latency_seconds_bucket{stage="pdf \\"text\\"",le="+Inf"} 4',
+        'latency_seconds_sum{stage="pdf \\"text\\""} 3.65',
+        'latency_seconds_count{stage="pdf \\"text\\""} 4',
+    ]
+
+def test_metrics_require_admin(client):
+    assert client.get("/api/metrics").status_code == 401
+    assert client.post("/api/metrics", json={"enabled": False}).status_code == 401
+
+def test_upload_stages_are_timed_and_exported(client):
+    before = metrics.stage_seconds.count("pdf_text")
+    assert client.post("/api/metrics", json={"server_timing": True}, headers=ADMIN).get_json()["server_timing"] is True
+
+    response = upload(client)
+    assert response.status_code == 200
+    timing = response.headers["Server-Timing"]
+    for name in ("cv_analysis", "pdf_text", "skill_match", "experience", "total"):
+        assert f"{name};dur=" in timing
+    assert metrics.stage_seconds.count("pdf_text") == before + 1
+
+    body = client.get("/api/metrics", headers=ADMIN).get_data(as_text=True)
+    assert 'ijob_stage_seconds_count{stage="pdf_text"}' in body
+    assert 'ijob_request_seconds_count{endpoint="main.cv.upload_cv",method="POST",status="200"}' in body
+    assert "ijob_report_queue_rejected " in body
+    assert "ijob_token_cache_misses " in body
+
+def test_metrics_can_be_switched_off_at_runtime(client):
+    assert client.post("/api/metrics", json={"enabled": "no"}, headers=ADMIN).status_code == 400
+    client.post("/api/metrics", json={"enabled": False, "server_timing": True}, headers=ADMIN)
+    before = metrics.stage_seconds.count("pdf_text")
+
+    response = upload(client)
+
+    assert response.status_code == 200
+    assert "Server-Timing" not in response.headers
+    assert metrics.stage_seconds.count("pdf_text") == before
+
+def test_settings_file_carries_a_toggle_to_other_workers(client, tmp_path):
+    with patch.object(metrics, "METRICS_SETTINGS_FILE", str(tmp_path / "metrics.json")), \
+         patch.object(metrics, "METRICS_SETTINGS_POLL", 0), \
+         patch.dict(metrics._shared_state, {"checked_at": None, "mtime": None}):
+        body = client.post("/api/metrics", json={"enabled": False}, headers=ADMIN).get_json()
+        assert body["scope"] == "all_workers"
+        assert body["pid"] > 0
+
+        # Another worker still has the settings it started with.
+        metrics._settings["enabled"] = True
+        metrics._shared_state["mtime"] = None
+        assert metrics.is_enabled() is False
+
+def test_settings_without_a_file_are_per_worker(client):
+    body = client.post("/api/metrics", json={"server_timing": True}, headers=ADMIN).get_json()
+
+    assert body["scope"] == "worker"
+    assert body["server_timing"] is True
@@ -0,0 +1,38 @@
+import io
+import pytest
+from reportlab.pdfgen import canvas
+from app.services.pdf_service import PDF_BACKENDS, extract_text_from_pdf
+
+def make_pdf(pages):
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer)
+    for lines in pages:
+        for i, line in enumerate(lines):
+            c.drawString(40, 800 - i * 16, line)
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+@pytest.mark.parametrize("backend", PDF_BACKENDS)
+def test_extract_text_joins_pages_and_skips_empty_ones(backend):
+    pdf = make_pdf([["John Doe", "Python developer"], [], ["Work Experience", "Engineer Jan 2020 - Present"]])
+
+    text = extract_text_from_pdf(io.BytesIO(pdf), backend=backend, max_pages=0, max_chars=0)
+
+    assert text.split("\n") == ["John Doe", "Python developer", "", "Work Experience", "Engineer Jan 2020 - Present"]
+
+@pytest.mark.parametrize("backend", PDF_BACKENDS)
+def test_extract_text_stops_at_page_and_char_caps(backend):
+    pdf = make_pdf([[f"page {i}"] for i in range(1, 201)])
+
+    assert extract_text_from_pdf(io.BytesIO(pdf), backend=backend, max_pages=3, max_chars=0) == "page 1\npage 2\npage 3"
+    assert extract_text_from_pdf(io.BytesIO(pdf), backend=backend, max_pages=0, max_chars=10) == "page 1\npag"
+
+def test_backends_extract_the_same_text():
+    pdf = make_pdf([["Jane Roe", "Skills: Go, Docker, Kubernetes"], ["Education", "Computer Science"]])
+
+    assert extract_text_from_pdf(io.BytesIO(pdf), backend="pdfium") == extract_text_from_pdf(io.BytesIO(pdf), backend="pdfplumber")
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        extract_text_from_pdf(io.BytesIO(make_pdf([["x"]])), backend="ocr")
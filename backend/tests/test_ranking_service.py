@@ -0,0 +1,82 @@
+import random
+from app.services.cv_analysis import CVAnalysis
+from app.services.cv_service import JobProfile, score_skills
+from app.services.ranking_service import CandidateMatrix
+from app.services.skill_matcher import SKILL_LABELS
+
+VOCABULARY = {category: [f"{category[:4]}{i}" for i in range(40)] for category in SKILL_LABELS}
+
+def random_analysis(rng, name):
+    skills = {category: rng.sample(names, rng.randint(0, 12)) for category, names in VOCABULARY.items()}
+    years = rng.choice([0.0, 0.5, 1.25, 2.0, 3.33, 7.0, rng.uniform(0, 12)])
+    return CVAnalysis("", skills, (), round(years, 2), name)
+
+def random_requirements(rng):
+    # Duplicates and unknown skills are kept on purpose: both affect the total.
+    return {
+        category: rng.choices(names + ["unknown skill"], k=rng.randint(0, 6))
+        for category, names in VOCABULARY.items()
+    }
+
+def test_matrix_scores_match_score_skills():
+    rng = random.Random(7)
+    store = CandidateMatrix(max_size=500)
+    analyses = {f"cv{i}": random_analysis(rng, f"Candidate {i}") for i in range(300)}
+    for cv_id, analysis in analyses.items():
+        store.add(cv_id, analysis)
+
+    for _ in range(50):
+        job_profile = JobProfile(random_requirements(rng), rng.choice(["", "2", "1-3", "5-10", "12"]))
+        results, missing = store.rank(job_profile)
+
+        assert missing == []
+        expected = sorted(
+            ((cv_id, *score_skills(analysis.skills, analysis.experience_years, job_profile)) for cv_id, analysis in analyses.items()),
+            key=lambda item: item[1], reverse=True,
+        )
+        assert [(result["cv_id"], result["score"], result["message"]) for result in results] == expected
+        assert [result["rank"] for result in results] == list(range(1, len(analyses) + 1))
+
+def test_rank_subset_reports_missing_and_evicts_oldest():
+    rng = random.Random(1)
+    store = CandidateMatrix(max_size=3)
+    for i in range(4):
+        store.add(f"cv{i}", random_analysis(rng, f"Candidate {i}"))
+
+    assert len(store) == 3
+    assert "cv0" not in store
+
+    job_profile = JobProfile({"programming_languages": ["prog1"]}, "")
+    results, missing = store.rank(job_profile, ["cv3", "cv0", "cv1", "cv3"])
+    assert sorted(result["cv_id"] for result in results) == ["cv1", "cv3"]
+    assert missing == ["cv0"]
+
+def test_re_adding_a_cv_replaces_its_skills():
+    store = CandidateMatrix(max_size=10)
+    store.add("cv", CVAnalysis("", {"tools": ["tool1"]}, (), 3.0, "Ana"))
+    store.add("cv", CVAnalysis("", {"tools": ["tool2"]}, (), 3.0, "Ana"))
+
+    results, _ = store.rank(JobProfile({"tools": ["tool1", "tool2"]}, ""))
+    assert [(result["score"], result["message"]) for result in results] == [(50.0, "Average match")]
+
+def test_new_skills_widen_the_bitset_without_growing_rows():
+    store = CandidateMatrix(max_size=100)
+    for i in range(15):
+        store.add(f"cv{i}", CVAnalysis("", {"tools": [f"tool{i}-{j}" for j in range(64)]}, (), 1.0, "Ana"))
+
+    assert store._bits.shape == (64, 16)
+    results, _ = store.rank(JobProfile({"tools": ["tool14-63"]}, ""))
+    assert results[0]["cv_id"] == "cv14"
+
+def test_concurrent_adds_never_share_a_skill_bit():
+    from concurrent.futures import ThreadPoolExecutor
+
+    store = CandidateMatrix(max_size=1000)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(
+            lambda i: store.add(f"cv{i}", CVAnalysis("", {"tools": [f"tool{i}-{j}" for j in range(20)]}, (), 1.0, "Ana")),
+            range(200),
+        ))
+
+    assert sorted(store._skill_ids.values()) == list(range(4000))
+    assert store._bits.shape[0] == 256
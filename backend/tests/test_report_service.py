@@ -0,0 +1,52 @@
+import threading
+from concurrent.futures import Future
+import time
+from unittest.mock import patch
+from app.services import report_service
+from app.services.report_service import submit_report_job, get_report_job, get_report_queue_stats
+
+def wait_for(job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = get_report_job(job_id)
+        if job["status"] != "pending":
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Report job {job_id} did not finish")
+
+def test_report_job_completes_in_background():
+    job_id = submit_report_job(lambda job_id, score: f"https://reports/{job_id}-{score}.pdf", 42)
+
+    job = wait_for(job_id)
+
+    assert job == {"status": "ready", "cv_report_url": f"https://reports/{job_id}-42.pdf"}
+
+def test_failed_report_job_is_reported():
+    def failing_task(job_id):
+        raise RuntimeError("upload failed")
+
+    job = wait_for(submit_report_job(failing_task))
+
+    assert job == {"status": "failed", "cv_report_url": None}
+
+def test_full_queue_rejects_new_reports():
+    release = threading.Event()
+    rejected_before = get_report_queue_stats()["rejected"]
+
+    with patch.object(report_service, "_slots", threading.BoundedSemaphore(1)):
+        job_id = submit_report_job(lambda job_id: release.wait(5) and "url")
+        assert submit_report_job(lambda job_id: "url") is None
+        release.set()
+        assert wait_for(job_id)["status"] == "ready"
+
+    assert get_report_queue_stats()["rejected"] == rejected_before + 1
+
+def test_report_job_waits_for_a_handed_off_upload():
+    upload = Future()
+    job_id = submit_report_job(lambda job_id: upload)
+
+    time.sleep(0.05)
+    assert get_report_job(job_id)["status"] == "pending"
+    upload.set_result("https://reports/handed-off.pdf")
+
+    assert wait_for(job_id) == {"status": "ready", "cv_report_url": "https://reports/handed-off.pdf"}
@@ -0,0 +1,62 @@
+import pytest
+from unittest.mock import MagicMock
+from app.services.skill_matcher import SkillMatcher, match_skills
+
+VOCABULARY = {
+    "programming_languages": ["python", "javascript"],
+    "frameworks": ["flask"],
+    "tools": ["docker"],
+    "certifications": [],
+}
+
+def test_matcher_is_reused_until_version_changes():
+    load_vocabulary = MagicMock(return_value=VOCABULARY)
+
+    first = SkillMatcher.get_matcher(1, load_vocabulary)
+    second = SkillMatcher.get_matcher(1, load_vocabulary)
+    assert first is second
+    assert load_vocabulary.call_count == 1
+
+    third = SkillMatcher.get_matcher(2, load_vocabulary)
+    assert third is not first
+    assert load_vocabulary.call_count == 2
+
+def test_trie_matches_whole_tokens_only():
+    original_mode = SkillMatcher.get_mode()
+    SkillMatcher.configure("trie")
+    try:
+        vocabulary = {
+            "programming_languages": ["Java", "C", "C++", "C#", "SQL"],
+            "frameworks": [".NET", "Node.js"],
+            "tools": ["Google Cloud", "CI/CD", "Docker"],
+            "certifications": ["Google Cloud"],
+        }
+        extracted = match_skills(
+            "JavaScript and C++/C# on .NET, node.js (Docker); google cloud CI/CD. No sql-like NoSQL.",
+            1, lambda: vocabulary,
+        )
+    finally:
+        SkillMatcher.configure(original_mode)
+
+    assert sorted(extracted["programming_languages"]) == ["c#", "c++", "sql"]
+    assert sorted(extracted["frameworks"]) == [".net", "node.js"]
+    assert sorted(extracted["tools"]) == ["ci/cd", "docker", "google cloud"]
+    assert extracted["certifications"] == ["google cloud"]
+
+@pytest.mark.parametrize("mode", ["blank", "trie"])
+def test_aliases_resolve_to_the_canonical_skill(mode):
+    original_mode = SkillMatcher.get_mode()
+    SkillMatcher.configure(mode)
+    try:
+        vocabulary = {
+            **VOCABULARY,
+            "tools": ["docker", "kubernetes", "postgresql"],
+            "aliases": {"js": "javascript", "k8s": "kubernetes", "postgres": "postgresql", "py 3": "python"},
+        }
+        extracted = match_skills("Shipped JS and Py 3 services on K8s with Postgres and Docker.", 1, lambda: vocabulary)
+    finally:
+        SkillMatcher.configure(original_mode)
+
+    assert sorted(extracted["programming_languages"]) == ["javascript", "python"]
+    assert sorted(extracted["tools"]) == ["docker", "kubernetes", "postgresql"]
+    assert extracted["frameworks"] == []
@@ -0,0 +1,17 @@
+from app.controllers.skills_controller import validate_skills_structure
+
+def test_aliases_must_be_non_empty_strings():
+    assert validate_skills_structure([{"name": "Kubernetes", "category": "tool", "aliases": ["k8s"]}]) == (True, None)
+    assert validate_skills_structure([{"name": "Kubernetes", "category": "tool"}]) == (True, None)
+    assert validate_skills_structure([{"name": "Kubernetes", "category": "tool", "aliases": "k8s"}])[0] is False
+    assert validate_skills_structure([{"name": "Kubernetes", "category": "tool", "aliases": [" "]}])[0] is False
+
+def test_aliases_cannot_be_ambiguous():
+    assert validate_skills_structure([
+        {"name": "JavaScript", "category": "programming_language", "aliases": ["JS"]},
+        {"name": "Java", "category": "programming_language", "aliases": ["js"]},
+    ]) == (False, "Alias 'js' is used by both 'javascript' and 'java'.")
+    assert validate_skills_structure([
+        {"name": "JavaScript", "category": "programming_language", "aliases": ["Java"]},
+        {"name": "Java", "category": "programming_language"},
+    ]) == (False, "Alias 'java' is also the name of a skill.")
@@ -0,0 +1,36 @@
+import pytest
+from app.db.storage_init import StorageClient
+from app.services.storage_service import upload_to_google_storage, get_public_url_if_exists
+from tests.fakes import FakeGCSServer
+
+@pytest.fixture
+def gcs_server(monkeypatch):
+    with FakeGCSServer(buckets=["reports"]) as server:
+        monkeypatch.setenv("STORAGE_EMULATOR_HOST", server.endpoint)
+        monkeypatch.setenv("GOOGLE_CLOUD_PROJECT", "ijob-test")
+        StorageClient.reset()
+        yield server
+        StorageClient.reset()
+
+def test_upload_is_a_single_request_per_report(gcs_server):
+    first_url = upload_to_google_storage(b"%PDF-1 first", "reports", "cv_reports/first.pdf")
+    upload_to_google_storage(b"%PDF-1 second", "reports", "cv_reports/second.pdf")
+
+    assert StorageClient.get_instance() is StorageClient.get_instance()
+    assert first_url.endswith("/reports/cv_reports/first.pdf")
+    assert gcs_server.objects[("reports", "cv_reports/first.pdf")] == {"data": b"%PDF-1 first", "predefinedAcl": "publicRead"}
+
+    bucket_lookups = [r for r in gcs_server.requests if r[0] == "GET"]
+    uploads = [r for r in gcs_server.requests if r[0] == "POST"]
+    assert len(bucket_lookups) == 1
+    assert len(uploads) == 2
+
+def test_missing_bucket_is_rejected(gcs_server):
+    with pytest.raises(ValueError):
+        upload_to_google_storage(b"%PDF-1", "missing", "cv_reports/report.pdf")
+
+def test_public_url_only_for_uploaded_reports(gcs_server):
+    upload_to_google_storage(b"%PDF-1", "reports", "cv_reports/done.pdf")
+
+    assert get_public_url_if_exists("reports", "cv_reports/done.pdf").endswith("/reports/cv_reports/done.pdf")
+    assert get_public_url_if_exists("reports", "cv_reports/pending.pdf") is None
@@ -0,0 +1,55 @@
+import json
+import os
+import random
+import pytest
+from unittest.mock import patch
+from app.services import suggestion_service
+from app.services.suggestion_service import SuggestionIndex, get_suggestion_index
+
+@pytest.fixture
+def suggestions_dir(tmp_path):
+    with patch.object(suggestion_service, "SUGGESTIONS_DIR", str(tmp_path)), patch.dict(suggestion_service._indexes, clear=True):
+        yield tmp_path
+
+def write_suggestions(directory, data, mtime=None):
+    path = directory / "career_paths_suggestions.json"
+    path.write_text(json.dumps(data))
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+def scan_all(suggestions, type_counts, k):
+    # Reference: score every suggestion, then sort, like the original implementation.
+    scored = []
+    for title, info in suggestions.items():
+        required_types = info.get("types", [])
+        score = sum(type_counts.get(skill_type, 0) for skill_type in required_types)
+        if score > 0 or "any" in required_types:
+            scored.append((title, score, info.get("message", "")))
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return scored[:k]
+
+def test_index_matches_full_scan():
+    rng = random.Random(0)
+    types = [f"type{i}" for i in range(12)] + ["any"]
+    for _ in range(200):
+        suggestions = {
+            f"Suggestion {i}": {"types": rng.sample(types, rng.randint(0, 3)) * rng.randint(1, 2), "message": f"m{i}"}
+            for i in range(rng.randint(0, 30))
+        }
+        type_counts = {skill_type: rng.randint(1, 3) for skill_type in rng.sample(types[:-1], rng.randint(0, 5))}
+        assert SuggestionIndex(suggestions).top(type_counts, 3) == scan_all(suggestions, type_counts, 3)
+
+def test_index_is_reloaded_when_the_file_changes(suggestions_dir):
+    write_suggestions(suggestions_dir, {"Backend Developer": {"types": ["backend"], "message": "Build APIs."}}, mtime=1_000_000)
+    first = get_suggestion_index("career_paths")
+    assert get_suggestion_index("career_paths") is first
+    assert first.top({"backend": 2}, 3) == [("Backend Developer", 2, "Build APIs.")]
+
+    write_suggestions(suggestions_dir, {"Data Engineer": {"types": ["data"], "message": "Build pipelines."}}, mtime=2_000_000)
+    second = get_suggestion_index("career_paths")
+    assert second is not first
+    assert second.top({"backend": 2}, 3) == []
+    assert second.top({"data": 1}, 3) == [("Data Engineer", 1, "Build pipelines.")]
+
+def test_missing_file_gives_empty_suggestions(suggestions_dir):
+    assert get_suggestion_index("improvement").top({"backend": 1}, 3) == []
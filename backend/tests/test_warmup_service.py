@@ -0,0 +1,47 @@
+import pytest
+from unittest.mock import patch
+from app import create_app
+from app.services import warmup_service
+from app.services.skill_matcher import SkillMatcher
+
+@pytest.fixture
+def client(fake_firestore):
+    fake_firestore.data["skills"] = {"python": {"name": "python", "category": "programming_language", "type": ["backend"]}}
+    with patch.dict(warmup_service._completed, clear=True):
+        yield create_app().test_client()
+
+def test_ready_warms_up_the_matcher_and_catalog(client):
+    response = client.get("/api/ready")
+
+    assert response.status_code == 200
+    assert sorted(response.get_json()["steps_ms"]) == sorted(name for name, _ in warmup_service.WARMUP_STEPS)
+    assert SkillMatcher.get_version() is not None
+
+def test_failed_steps_report_503_and_are_retried(client):
+    calls = []
+    catalog_loads = []
+
+    def flaky_bucket():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ValueError("Bucket 'reports' does not exist.")
+
+    replaced = {"report_bucket": flaky_bucket, "skill_catalog": lambda: catalog_loads.append(1)}
+    steps = [(name, replaced.get(name, step)) for name, step in warmup_service.WARMUP_STEPS]
+    with patch.object(warmup_service, "WARMUP_STEPS", steps):
+        first = client.get("/api/ready")
+        second = client.get("/api/ready")
+
+    assert first.status_code == 503
+    assert first.get_json()["errors"] == {"report_bucket": "Bucket 'reports' does not exist."}
+    assert second.status_code == 200
+    assert len(calls) == 2
+    assert len(catalog_loads) == 1
+
+def test_preload_runs_only_the_shareable_steps(client):
+    ready, steps_ms, errors = warmup_service.warm_up(only=warmup_service.PRELOAD_STEPS)
+
+    assert ready
+    assert set(steps_ms) == set(warmup_service.PRELOAD_STEPS)
+    assert errors == {}
+    assert client.get("/api/ready").status_code == 200
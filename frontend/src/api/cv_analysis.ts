@@ -34,7 +34,7 @@ export const analyzeCV = async (
 
     if (!response.ok) {
       const error = await response.json();
-      throw new Error(error.message || "Failed to analyze CV");
+      throw new Error(error.error || error.message || "Failed to analyze CV");
     }
 
     return await response.json();
@@ -43,3 +43,44 @@ export const analyzeCV = async (
     throw error;
   }
 };
+
+export const waitForCVReport = async (
+  reportJobId: string,
+  intervalMs: number = 1500,
+  maxAttempts: number = 40
+): Promise<string | null> => {
+  const { user } = useAuth();
+  const currentUser = user.value;
+  if (!currentUser) {
+    throw new Error("User is not authenticated");
+  }
+
+  const idToken = await currentUser.getIdToken();
+
+  for (let attempt = 0; attempt < maxAttempts; attempt++) {
+    const response = await fetch(
+      `${import.meta.env.VITE_FLASK_API_URL}/cv_report/${reportJobId}`,
+      {
+        headers: {
+          Authorization: `Bearer ${idToken}`,
+        },
+      }
+    );
+
+    if (response.ok) {
+      const report = await response.json();
+      if (report.status === "ready") {
+        return report.cv_report_url;
+      }
+      if (report.status === "failed") {
+        return null;
+      }
+    } else if (response.status !== 404) {
+      return null;
+    }
+
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+
+  return null;
+};